@@ -1,6 +1,8 @@
 import 'package:flutter/material.dart';
 import 'theme_tokens.dart';
 
+part 'design_tokens.g.dart';
+
 /// Дизайн-токены для NutryFlow
 /// Создано для интеграции с дизайнером
 class DesignTokens {
@@ -12,14 +14,14 @@ class DesignTokens {
   /// `context.colors.primary` вместо `DesignTokens.colors.primary`
   static const _ColorTokens colors = _ColorTokens();
 
-  /// Типографика
-  static const _TypographyTokens typography = _TypographyTokens();
+  /// Типографика (готовые TextStyle - общие const-экземпляры из design_tokens.g.dart)
+  static const _TypographyTokens typography = _ConstTypographyTokensView();
 
   /// Отступы и размеры
   static const _SpacingTokens spacing = _SpacingTokens();
 
-  /// Тени
-  static const _ShadowTokens shadows = _ShadowTokens();
+  /// Тени (общие const-списки из design_tokens.g.dart)
+  static const _ShadowTokens shadows = _ConstShadowTokensView();
 
   /// Анимации
   static const _AnimationTokens animations = _AnimationTokens();
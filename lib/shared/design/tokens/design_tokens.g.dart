@@ -0,0 +1,592 @@
+// GENERATED CODE - DO NOT MODIFY BY HAND
+// Сгенерировано: python scripts/export_design_tokens.py dart
+// Источник: lib/shared/design/tokens/design_tokens.dart
+// Источник: lib/shared/design/tokens/theme_tokens.dart
+
+part of 'design_tokens.dart';
+
+/// Константные токены _ColorTokens без аллокаций при обращении
+abstract final class ConstColorTokens {
+  static const Color primary = Color(0xFF4CAF50);
+  static const Color primaryLight = Color(0xFF81C784);
+  static const Color primaryDark = Color(0xFF388E3C);
+  static const Color secondary = Color(0xFFC2E66E);
+  static const Color secondaryLight = Color(0xFFE8F5E8);
+  static const Color secondaryDark = Color(0xFF8BC34A);
+  static const Color accent = Color(0xFFFFCB65);
+  static const Color accentLight = Color(0xFFFFF3C4);
+  static const Color accentDark = Color(0xFFFFA000);
+  static const Color protein = Color(0xFFE91E63);
+  static const Color carbs = Color(0xFFFFC107);
+  static const Color fats = Color(0xFFFF9800);
+  static const Color water = Color(0xFF03A9F4);
+  static const Color fiber = Color(0xFF9C27B0);
+  static const Color background = Color(0xFFF9F4F2);
+  static const Color surface = Color(0xFFFFFFFF);
+  static const Color surfaceVariant = Color(0xFFF8F9FA);
+  static const Color outline = Color(0xFFE0E0E0);
+  static const Color outlineVariant = Color(0xFFF1F3F4);
+  static const Color onPrimary = Color(0xFFFFFFFF);
+  static const Color onSecondary = Color(0xFF1B5E20);
+  static const Color onSurface = Color(0xFF2D3748);
+  static const Color onSurfaceVariant = Color(0xFF718096);
+  static const Color onBackground = Color(0xFF1C1B1F);
+  static const Color success = Color(0xFF4CAF50);
+  static const Color warning = Color(0xFFFFA000);
+  static const Color error = Color(0xFFE53935);
+  static const Color info = Color(0xFF039BE5);
+  static const Color onError = Color(0xFFFFFFFF);
+  static const Color onSuccess = Color(0xFFFFFFFF);
+  static const Color onWarning = Color(0xFF1B5E20);
+  static const Color onInfo = Color(0xFFFFFFFF);
+  static const Color shadow = Color(0xFF000000);
+  static const Color nutritionProtein = protein;
+  static const Color nutritionCarbs = carbs;
+  static const Color nutritionFats = fats;
+  static const Color nutritionWater = water;
+  static const Color nutritionFiber = fiber;
+  static const LinearGradient primaryGradient = LinearGradient(
+    colors: [Color(0xFF4CAF50), Color(0xFF81C784)],
+    begin: Alignment.topLeft,
+    end: Alignment.bottomRight,
+  );
+  static const LinearGradient secondaryGradient = LinearGradient(
+    colors: [Color(0xFFC2E66E), Color(0xFFE8F5E8)],
+    begin: Alignment.topLeft,
+    end: Alignment.bottomRight,
+  );
+  static const LinearGradient accentGradient = LinearGradient(
+    colors: [Color(0xFFFFCB65), Color(0xFFFFF3C4)],
+    begin: Alignment.topLeft,
+    end: Alignment.bottomRight,
+  );
+}
+
+/// Константные токены _TypographyTokens без аллокаций при обращении
+abstract final class ConstTypographyTokens {
+  static const String fontFamily = 'Inter';
+  static const double displayLarge = 57.0;
+  static const double displayMedium = 45.0;
+  static const double displaySmall = 36.0;
+  static const double headlineLarge = 32.0;
+  static const double headlineMedium = 28.0;
+  static const double headlineSmall = 24.0;
+  static const double titleLarge = 22.0;
+  static const double titleMedium = 16.0;
+  static const double titleSmall = 14.0;
+  static const double bodyLarge = 16.0;
+  static const double bodyMedium = 14.0;
+  static const double bodySmall = 12.0;
+  static const double labelLarge = 14.0;
+  static const double labelMedium = 12.0;
+  static const double labelSmall = 11.0;
+  static const double lineHeightTight = 1.2;
+  static const double lineHeightNormal = 1.4;
+  static const double lineHeightLoose = 1.6;
+  static const double letterSpacingTight = -0.5;
+  static const double letterSpacingNormal = 0.0;
+  static const double letterSpacingWide = 0.5;
+  static const FontWeight light = FontWeight.w300;
+  static const FontWeight regular = FontWeight.w400;
+  static const FontWeight medium = FontWeight.w500;
+  static const FontWeight semiBold = FontWeight.w600;
+  static const FontWeight bold = FontWeight.w700;
+  static const TextStyle displayLargeStyle = TextStyle(
+    fontFamily: fontFamily,
+    fontSize: displayLarge,
+    fontWeight: bold,
+    height: lineHeightTight,
+  );
+  static const TextStyle displayMediumStyle = TextStyle(
+    fontFamily: fontFamily,
+    fontSize: displayMedium,
+    fontWeight: bold,
+    height: lineHeightTight,
+  );
+  static const TextStyle displaySmallStyle = TextStyle(
+    fontFamily: fontFamily,
+    fontSize: displaySmall,
+    fontWeight: bold,
+    height: lineHeightTight,
+  );
+  static const TextStyle headlineLargeStyle = TextStyle(
+    fontFamily: fontFamily,
+    fontSize: headlineLarge,
+    fontWeight: semiBold,
+    height: lineHeightNormal,
+  );
+  static const TextStyle headlineMediumStyle = TextStyle(
+    fontFamily: fontFamily,
+    fontSize: headlineMedium,
+    fontWeight: semiBold,
+    height: lineHeightNormal,
+  );
+  static const TextStyle headlineSmallStyle = TextStyle(
+    fontFamily: fontFamily,
+    fontSize: headlineSmall,
+    fontWeight: semiBold,
+    height: lineHeightNormal,
+  );
+  static const TextStyle titleLargeStyle = TextStyle(
+    fontFamily: fontFamily,
+    fontSize: titleLarge,
+    fontWeight: medium,
+    height: lineHeightNormal,
+  );
+  static const TextStyle titleMediumStyle = TextStyle(
+    fontFamily: fontFamily,
+    fontSize: titleMedium,
+    fontWeight: medium,
+    height: lineHeightNormal,
+  );
+  static const TextStyle titleSmallStyle = TextStyle(
+    fontFamily: fontFamily,
+    fontSize: titleSmall,
+    fontWeight: medium,
+    height: lineHeightNormal,
+  );
+  static const TextStyle bodyLargeStyle = TextStyle(
+    fontFamily: fontFamily,
+    fontSize: bodyLarge,
+    fontWeight: regular,
+    height: lineHeightNormal,
+  );
+  static const TextStyle bodyMediumStyle = TextStyle(
+    fontFamily: fontFamily,
+    fontSize: bodyMedium,
+    fontWeight: regular,
+    height: lineHeightNormal,
+  );
+  static const TextStyle bodySmallStyle = TextStyle(
+    fontFamily: fontFamily,
+    fontSize: bodySmall,
+    fontWeight: regular,
+    height: lineHeightNormal,
+  );
+  static const TextStyle labelLargeStyle = TextStyle(
+    fontFamily: fontFamily,
+    fontSize: labelLarge,
+    fontWeight: medium,
+    height: lineHeightNormal,
+    letterSpacing: letterSpacingWide,
+  );
+  static const TextStyle labelMediumStyle = TextStyle(
+    fontFamily: fontFamily,
+    fontSize: labelMedium,
+    fontWeight: medium,
+    height: lineHeightNormal,
+    letterSpacing: letterSpacingWide,
+  );
+  static const TextStyle labelSmallStyle = TextStyle(
+    fontFamily: fontFamily,
+    fontSize: labelSmall,
+    fontWeight: medium,
+    height: lineHeightNormal,
+    letterSpacing: letterSpacingWide,
+  );
+}
+
+/// _TypographyTokens на const-полях ConstTypographyTokens
+final class _ConstTypographyTokensView implements _TypographyTokens {
+  const _ConstTypographyTokensView();
+
+  @override
+  String get fontFamily => ConstTypographyTokens.fontFamily;
+
+  @override
+  double get displayLarge => ConstTypographyTokens.displayLarge;
+
+  @override
+  double get displayMedium => ConstTypographyTokens.displayMedium;
+
+  @override
+  double get displaySmall => ConstTypographyTokens.displaySmall;
+
+  @override
+  double get headlineLarge => ConstTypographyTokens.headlineLarge;
+
+  @override
+  double get headlineMedium => ConstTypographyTokens.headlineMedium;
+
+  @override
+  double get headlineSmall => ConstTypographyTokens.headlineSmall;
+
+  @override
+  double get titleLarge => ConstTypographyTokens.titleLarge;
+
+  @override
+  double get titleMedium => ConstTypographyTokens.titleMedium;
+
+  @override
+  double get titleSmall => ConstTypographyTokens.titleSmall;
+
+  @override
+  double get bodyLarge => ConstTypographyTokens.bodyLarge;
+
+  @override
+  double get bodyMedium => ConstTypographyTokens.bodyMedium;
+
+  @override
+  double get bodySmall => ConstTypographyTokens.bodySmall;
+
+  @override
+  double get labelLarge => ConstTypographyTokens.labelLarge;
+
+  @override
+  double get labelMedium => ConstTypographyTokens.labelMedium;
+
+  @override
+  double get labelSmall => ConstTypographyTokens.labelSmall;
+
+  @override
+  double get lineHeightTight => ConstTypographyTokens.lineHeightTight;
+
+  @override
+  double get lineHeightNormal => ConstTypographyTokens.lineHeightNormal;
+
+  @override
+  double get lineHeightLoose => ConstTypographyTokens.lineHeightLoose;
+
+  @override
+  double get letterSpacingTight => ConstTypographyTokens.letterSpacingTight;
+
+  @override
+  double get letterSpacingNormal => ConstTypographyTokens.letterSpacingNormal;
+
+  @override
+  double get letterSpacingWide => ConstTypographyTokens.letterSpacingWide;
+
+  @override
+  FontWeight get light => ConstTypographyTokens.light;
+
+  @override
+  FontWeight get regular => ConstTypographyTokens.regular;
+
+  @override
+  FontWeight get medium => ConstTypographyTokens.medium;
+
+  @override
+  FontWeight get semiBold => ConstTypographyTokens.semiBold;
+
+  @override
+  FontWeight get bold => ConstTypographyTokens.bold;
+
+  @override
+  TextStyle get displayLargeStyle => ConstTypographyTokens.displayLargeStyle;
+
+  @override
+  TextStyle get displayMediumStyle => ConstTypographyTokens.displayMediumStyle;
+
+  @override
+  TextStyle get displaySmallStyle => ConstTypographyTokens.displaySmallStyle;
+
+  @override
+  TextStyle get headlineLargeStyle => ConstTypographyTokens.headlineLargeStyle;
+
+  @override
+  TextStyle get headlineMediumStyle =>
+      ConstTypographyTokens.headlineMediumStyle;
+
+  @override
+  TextStyle get headlineSmallStyle => ConstTypographyTokens.headlineSmallStyle;
+
+  @override
+  TextStyle get titleLargeStyle => ConstTypographyTokens.titleLargeStyle;
+
+  @override
+  TextStyle get titleMediumStyle => ConstTypographyTokens.titleMediumStyle;
+
+  @override
+  TextStyle get titleSmallStyle => ConstTypographyTokens.titleSmallStyle;
+
+  @override
+  TextStyle get bodyLargeStyle => ConstTypographyTokens.bodyLargeStyle;
+
+  @override
+  TextStyle get bodyMediumStyle => ConstTypographyTokens.bodyMediumStyle;
+
+  @override
+  TextStyle get bodySmallStyle => ConstTypographyTokens.bodySmallStyle;
+
+  @override
+  TextStyle get labelLargeStyle => ConstTypographyTokens.labelLargeStyle;
+
+  @override
+  TextStyle get labelMediumStyle => ConstTypographyTokens.labelMediumStyle;
+
+  @override
+  TextStyle get labelSmallStyle => ConstTypographyTokens.labelSmallStyle;
+}
+
+/// Константные токены _SpacingTokens без аллокаций при обращении
+abstract final class ConstSpacingTokens {
+  static const double xs = 4.0;
+  static const double sm = 8.0;
+  static const double md = 16.0;
+  static const double lg = 24.0;
+  static const double xl = 32.0;
+  static const double xxl = 40.0;
+  static const double xxxl = 48.0;
+  static const double buttonHeight = 48.0;
+  static const double buttonHeightSmall = 36.0;
+  static const double buttonHeightLarge = 56.0;
+  static const double inputHeight = 48.0;
+  static const double appBarHeight = 56.0;
+  static const double bottomNavHeight = 80.0;
+  static const double cardPadding = 16.0;
+  static const double screenPadding = 24.0;
+  static const double sectionSpacing = 32.0;
+  static const double iconSmall = 16.0;
+  static const double iconMedium = 24.0;
+  static const double iconLarge = 32.0;
+  static const double iconXLarge = 48.0;
+  static const double avatarSmall = 32.0;
+  static const double avatarMedium = 48.0;
+  static const double avatarLarge = 64.0;
+  static const double avatarXLarge = 96.0;
+}
+
+/// Константные токены _ShadowTokens без аллокаций при обращении
+abstract final class ConstShadowTokens {
+  static const List<BoxShadow> none = [];
+  static const List<BoxShadow> xs = [
+    BoxShadow(
+      color: Color.from(alpha: 0.05, red: 0, green: 0, blue: 0),
+      blurRadius: 2,
+      offset: Offset(0, 1),
+    ),
+  ];
+  static const List<BoxShadow> sm = [
+    BoxShadow(
+      color: Color.from(alpha: 0.1, red: 0, green: 0, blue: 0),
+      blurRadius: 4,
+      offset: Offset(0, 2),
+    ),
+  ];
+  static const List<BoxShadow> md = [
+    BoxShadow(
+      color: Color.from(alpha: 0.15, red: 0, green: 0, blue: 0),
+      blurRadius: 8,
+      offset: Offset(0, 4),
+    ),
+  ];
+  static const List<BoxShadow> lg = [
+    BoxShadow(
+      color: Color.from(alpha: 0.2, red: 0, green: 0, blue: 0),
+      blurRadius: 16,
+      offset: Offset(0, 8),
+    ),
+  ];
+  static const List<BoxShadow> xl = [
+    BoxShadow(
+      color: Color.from(alpha: 0.25, red: 0, green: 0, blue: 0),
+      blurRadius: 24,
+      offset: Offset(0, 12),
+    ),
+  ];
+}
+
+/// _ShadowTokens на const-полях ConstShadowTokens
+final class _ConstShadowTokensView implements _ShadowTokens {
+  const _ConstShadowTokensView();
+
+  @override
+  List<BoxShadow> get none => ConstShadowTokens.none;
+
+  @override
+  List<BoxShadow> get xs => ConstShadowTokens.xs;
+
+  @override
+  List<BoxShadow> get sm => ConstShadowTokens.sm;
+
+  @override
+  List<BoxShadow> get md => ConstShadowTokens.md;
+
+  @override
+  List<BoxShadow> get lg => ConstShadowTokens.lg;
+
+  @override
+  List<BoxShadow> get xl => ConstShadowTokens.xl;
+}
+
+/// Константные токены _AnimationTokens без аллокаций при обращении
+abstract final class ConstAnimationTokens {
+  static const Duration fast = Duration(milliseconds: 150);
+  static const Duration normal = Duration(milliseconds: 300);
+  static const Duration slow = Duration(milliseconds: 500);
+  static const Duration slower = Duration(milliseconds: 1000);
+  static const Curve easeIn = Curves.easeIn;
+  static const Curve easeOut = Curves.easeOut;
+  static const Curve easeInOut = Curves.easeInOut;
+  static const Curve bounceIn = Curves.bounceIn;
+  static const Curve bounceOut = Curves.bounceOut;
+  static const Curve elasticIn = Curves.elasticIn;
+  static const Curve elasticOut = Curves.elasticOut;
+}
+
+/// Константные токены _BorderTokens без аллокаций при обращении
+abstract final class ConstBorderTokens {
+  static const double none = 0.0;
+  static const double xs = 4.0;
+  static const double sm = 8.0;
+  static const double md = 12.0;
+  static const double lg = 16.0;
+  static const double xl = 24.0;
+  static const double xxl = 32.0;
+  static const double full = 9999.0;
+  static const double thin = 1.0;
+  static const double medium = 2.0;
+  static const double thick = 4.0;
+  static const double buttonRadius = md;
+  static const double cardRadius = lg;
+  static const double inputRadius = sm;
+  static const double modalRadius = xl;
+}
+
+/// Константные токены _LightThemeTokens без аллокаций при обращении
+abstract final class ConstLightThemeTokens {
+  static const Color background = Color(0xFFF9F4F2);
+  static const Color surface = Color(0xFFFFFFFF);
+  static const Color surfaceVariant = Color(0xFFF8F9FA);
+  static const Color surfaceContainer = Color(0xFFF0F0F0);
+  static const Color onBackground = Color(0xFF1C1B1F);
+  static const Color onSurface = Color(0xFF2D3748);
+  static const Color onSurfaceVariant = Color(0xFF718096);
+  static const Color onSurfaceContainer = Color(0xFF4A5568);
+  static const Color outline = Color(0xFFE0E0E0);
+  static const Color outlineVariant = Color(0xFFF1F3F4);
+  static const Color primary = Color(0xFF4CAF50);
+  static const Color onPrimary = Color(0xFFFFFFFF);
+  static const Color primaryContainer = Color(0xFFE8F5E8);
+  static const Color onPrimaryContainer = Color(0xFF1B5E20);
+  static const Color secondary = Color(0xFFC2E66E);
+  static const Color onSecondary = Color(0xFF1B5E20);
+  static const Color secondaryContainer = Color(0xFFE8F5E8);
+  static const Color onSecondaryContainer = Color(0xFF2D3748);
+  static const Color tertiary = Color(0xFFFFCB65);
+  static const Color onTertiary = Color(0xFF1B5E20);
+  static const Color tertiaryContainer = Color(0xFFFFF3C4);
+  static const Color onTertiaryContainer = Color(0xFF2D3748);
+  static const Color error = Color(0xFFD32F2F);
+  static const Color onError = Color(0xFFFFFFFF);
+  static const Color errorContainer = Color(0xFFFFEBEE);
+  static const Color onErrorContainer = Color(0xFFC62828);
+  static const Color success = Color(0xFF4CAF50);
+  static const Color onSuccess = Color(0xFFFFFFFF);
+  static const Color successContainer = Color(0xFFE8F5E8);
+  static const Color onSuccessContainer = Color(0xFF1B5E20);
+  static const Color warning = Color(0xFFFFA000);
+  static const Color onWarning = Color(0xFF1B5E20);
+  static const Color warningContainer = Color(0xFFFFF3C4);
+  static const Color onWarningContainer = Color(0xFF2D3748);
+  static const Color info = Color(0xFF039BE5);
+  static const Color onInfo = Color(0xFFFFFFFF);
+  static const Color infoContainer = Color(0xFFE3F2FD);
+  static const Color onInfoContainer = Color(0xFF0277BD);
+  static const Color nutritionProtein = Color(0xFFE91E63);
+  static const Color nutritionCarbs = Color(0xFFFFC107);
+  static const Color nutritionFats = Color(0xFFFF9800);
+  static const Color nutritionWater = Color(0xFF03A9F4);
+  static const Color nutritionFiber = Color(0xFF9C27B0);
+  static const Color shadow = Color(0xFF000000);
+  static const Color shadowScrim = Color(0x80000000);
+  static const LinearGradient primaryGradient = LinearGradient(
+    colors: [Color(0xFF4CAF50), Color(0xFF81C784)],
+    begin: Alignment.topLeft,
+    end: Alignment.bottomRight,
+  );
+  static const LinearGradient secondaryGradient = LinearGradient(
+    colors: [Color(0xFFC2E66E), Color(0xFFE8F5E8)],
+    begin: Alignment.topLeft,
+    end: Alignment.bottomRight,
+  );
+  static const LinearGradient tertiaryGradient = LinearGradient(
+    colors: [Color(0xFFFFCB65), Color(0xFFFFF3C4)],
+    begin: Alignment.topLeft,
+    end: Alignment.bottomRight,
+  );
+  static const LinearGradient errorGradient = LinearGradient(
+    colors: [Color(0xFFE53935), Color(0xFFFFCDD2)],
+    begin: Alignment.topLeft,
+    end: Alignment.bottomRight,
+  );
+  static const LinearGradient successGradient = LinearGradient(
+    colors: [Color(0xFF4CAF50), Color(0xFFE8F5E8)],
+    begin: Alignment.topLeft,
+    end: Alignment.bottomRight,
+  );
+}
+
+/// Константные токены _DarkThemeTokens без аллокаций при обращении
+abstract final class ConstDarkThemeTokens {
+  static const Color background = Color(0xFF0F1419);
+  static const Color surface = Color(0xFF1A1F2E);
+  static const Color surfaceVariant = Color(0xFF2A3142);
+  static const Color surfaceContainer = Color(0xFF3A4152);
+  static const Color onBackground = Color(0xFFF8F9FA);
+  static const Color onSurface = Color(0xFFFFFFFF);
+  static const Color onSurfaceVariant = Color(0xFFB8C5D6);
+  static const Color onSurfaceContainer = Color(0xFFE8EDF7);
+  static const Color outline = Color(0xFF4A5568);
+  static const Color outlineVariant = Color(0xFF5A6478);
+  static const Color primary = Color(0xFF4ADE80);
+  static const Color onPrimary = Color(0xFF0F172A);
+  static const Color primaryContainer = Color(0xFF166534);
+  static const Color onPrimaryContainer = Color(0xFFDCFCE7);
+  static const Color secondary = Color(0xFF60A5FA);
+  static const Color onSecondary = Color(0xFF0F172A);
+  static const Color secondaryContainer = Color(0xFF1E40AF);
+  static const Color onSecondaryContainer = Color(0xFFDBEAFE);
+  static const Color tertiary = Color(0xFFFBBF24);
+  static const Color onTertiary = Color(0xFF0F172A);
+  static const Color tertiaryContainer = Color(0xFFD97706);
+  static const Color onTertiaryContainer = Color(0xFFFEF3C7);
+  static const Color error = Color(0xFFEF4444);
+  static const Color onError = Color(0xFFFFFFFF);
+  static const Color errorContainer = Color(0xFF7F1D1D);
+  static const Color onErrorContainer = Color(0xFFFEE2E2);
+  static const Color success = Color(0xFF22C55E);
+  static const Color onSuccess = Color(0xFF0F172A);
+  static const Color successContainer = Color(0xFF14532D);
+  static const Color onSuccessContainer = Color(0xFFDCFCE7);
+  static const Color warning = Color(0xFFF59E0B);
+  static const Color onWarning = Color(0xFF0F172A);
+  static const Color warningContainer = Color(0xFF92400E);
+  static const Color onWarningContainer = Color(0xFFFEF3C7);
+  static const Color info = Color(0xFF3B82F6);
+  static const Color onInfo = Color(0xFFFFFFFF);
+  static const Color infoContainer = Color(0xFF1E40AF);
+  static const Color onInfoContainer = Color(0xFFDBEAFE);
+  static const Color nutritionProtein = Color(0xFFEC4899);
+  static const Color nutritionCarbs = Color(0xFFF59E0B);
+  static const Color nutritionFats = Color(0xFFF97316);
+  static const Color nutritionWater = Color(0xFF06B6D4);
+  static const Color nutritionFiber = Color(0xFFA855F7);
+  static const Color shadow = Color(0xFF000000);
+  static const Color shadowScrim = Color(0x80000000);
+  static const LinearGradient primaryGradient = LinearGradient(
+    colors: [Color(0xFF4ADE80), Color(0xFF22C55E)],
+    begin: Alignment.topLeft,
+    end: Alignment.bottomRight,
+  );
+  static const LinearGradient secondaryGradient = LinearGradient(
+    colors: [Color(0xFF60A5FA), Color(0xFF3B82F6)],
+    begin: Alignment.topLeft,
+    end: Alignment.bottomRight,
+  );
+  static const LinearGradient tertiaryGradient = LinearGradient(
+    colors: [Color(0xFFFBBF24), Color(0xFFF59E0B)],
+    begin: Alignment.topLeft,
+    end: Alignment.bottomRight,
+  );
+  static const LinearGradient errorGradient = LinearGradient(
+    colors: [Color(0xFFEF4444), Color(0xFFDC2626)],
+    begin: Alignment.topLeft,
+    end: Alignment.bottomRight,
+  );
+  static const LinearGradient successGradient = LinearGradient(
+    colors: [Color(0xFF22C55E), Color(0xFF16A34A)],
+    begin: Alignment.topLeft,
+    end: Alignment.bottomRight,
+  );
+}
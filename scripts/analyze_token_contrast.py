@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Анализ контрастности цветовых токенов NutryFlow по WCAG 2.1
+
+Python-замена scripts/analyze_theme_contrast.dart, не требующая Flutter:
+берет все цветовые токены из DesignTokensExporter (включая светлую и темную
+темы), считает полную матрицу контрастности N×N векторно в NumPy и проверяет
+пары текст/фон (`onX` на `X`) на соответствие уровням AA и AAA.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from export_design_tokens import DesignTokensExporter
+
+# Пороги WCAG 2.1 для обычного и крупного текста
+AA_NORMAL = 4.5
+AA_LARGE = 3.0
+AAA_NORMAL = 7.0
+AAA_LARGE = 4.5
+
+# Число полупрозрачных цветов текста, смешиваемых с фонами за один шаг
+BLEND_BLOCK_ROWS = 256
+
+
+class TokenContrastAnalyzer:
+    """Векторный анализатор контрастности цветовых токенов"""
+
+    def __init__(self, colors: Dict[str, str]):
+        self.names = list(colors)
+        packed = np.array([self._pack_hex(value) for value in colors.values()], dtype=np.uint32)
+
+        # Считаем матрицу по уникальным цветам: одинаковые значения токенов не пересчитываются
+        self.unique_colors, self.inverse = np.unique(packed, return_inverse=True)
+        self.matrix = self.contrast_matrix(self.unique_colors)
+
+    @staticmethod
+    def _pack_hex(value: str) -> int:
+        """Переводит `#AARRGGBB` или `#RRGGBB` в 32-битное число ARGB"""
+        digits = value.lstrip('#')
+        if len(digits) == 6:
+            digits = 'FF' + digits
+        return int(digits, 16)
+
+    @staticmethod
+    def relative_luminance(rgb: np.ndarray) -> np.ndarray:
+        """Относительная яркость WCAG для массива RGB (..., 3) в диапазоне 0..1"""
+        linear = np.where(rgb <= 0.03928, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+        return linear @ np.array([0.2126, 0.7152, 0.0722], dtype=rgb.dtype)
+
+    def contrast_matrix(self, packed: np.ndarray) -> np.ndarray:
+        """Матрица контрастности: строки - цвет текста, столбцы - цвет фона
+
+        Полупрозрачный цвет текста накладывается на фон перед расчетом,
+        поэтому для таких строк матрица несимметрична.
+        """
+        channels = (packed[:, None] >> np.array([24, 16, 8, 0], dtype=np.uint32)) & 0xFF
+        channels = channels.astype(np.float32) / 255.0
+        alpha, rgb = channels[:, 0], channels[:, 1:]
+
+        luminance = self.relative_luminance(rgb)
+        lighter = np.maximum.outer(luminance, luminance)
+        darker = np.minimum.outer(luminance, luminance)
+        matrix = (lighter + 0.05) / (darker + 0.05)
+
+        # Полупрозрачные строки считаем блоками, чтобы (блок, N, 3) помещался в память
+        translucent = np.flatnonzero(alpha < 1.0)
+        for start in range(0, len(translucent), BLEND_BLOCK_ROWS):
+            rows = translucent[start:start + BLEND_BLOCK_ROWS]
+            row_alpha = alpha[rows, None, None]
+            blended = row_alpha * rgb[rows, None, :] + (1.0 - row_alpha) * rgb[None, :, :]
+            blended_luminance = self.relative_luminance(blended)
+            matrix[rows] = (
+                (np.maximum(blended_luminance, luminance) + 0.05)
+                / (np.minimum(blended_luminance, luminance) + 0.05)
+            )
+
+        return matrix
+
+    def full_matrix(self) -> np.ndarray:
+        """Матрица N×N для всех токенов (включая токены с одинаковыми значениями)"""
+        return self.matrix[np.ix_(self.inverse, self.inverse)]
+
+    def text_background_pairs(self) -> List[Tuple[int, int]]:
+        """Находит пары текст/фон по соглашению об именах: `onPrimary` на `primary`"""
+        index = {name: position for position, name in enumerate(self.names)}
+        pairs = []
+
+        for position, name in enumerate(self.names):
+            namespace, _, base = name.rpartition('.')
+            if len(base) < 3 or not base.startswith('on') or not base[2].isupper():
+                continue
+            background = base[2].lower() + base[3:]
+            background_name = f"{namespace}.{background}" if namespace else background
+            if background_name in index:
+                pairs.append((position, index[background_name]))
+
+        return pairs
+
+    def analyze_pairs(self) -> List[Dict]:
+        """Проверяет пары текст/фон на уровни AA и AAA"""
+        pairs = self.text_background_pairs()
+        if not pairs:
+            return []
+
+        text_index, background_index = (np.array(column) for column in zip(*pairs))
+        ratios = self.matrix[self.inverse[text_index], self.inverse[background_index]]
+
+        results = []
+        for (text, background), ratio in zip(pairs, ratios.tolist()):
+            results.append({
+                "text": self.names[text],
+                "background": self.names[background],
+                "ratio": round(ratio, 2),
+                "aa": ratio >= AA_NORMAL,
+                "aa_large": ratio >= AA_LARGE,
+                "aaa": ratio >= AAA_NORMAL,
+                "aaa_large": ratio >= AAA_LARGE,
+            })
+        return results
+
+    def build_report(self) -> Dict:
+        """Формирует отчет по парам текст/фон"""
+        pairs = self.analyze_pairs()
+        return {
+            "generated": datetime.now().isoformat(timespec='seconds'),
+            "colors": len(self.names),
+            "unique_colors": int(len(self.unique_colors)),
+            "summary": {
+                "pairs": len(pairs),
+                "fail_aa": sum(not pair["aa"] for pair in pairs),
+                "fail_aaa": sum(not pair["aaa"] for pair in pairs),
+            },
+            "pairs": pairs,
+        }
+
+    def write_matrix_csv(self, output_file: Path):
+        """Сохраняет полную матрицу контрастности N×N в CSV"""
+        matrix = self.full_matrix()
+        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["text \\ background", *self.names])
+            for name, row in zip(self.names, np.round(matrix.astype(np.float64), 2).tolist()):
+                writer.writerow([name, *row])
+
+
+def write_report(report: Dict, output_file: Path, report_format: str):
+    """Сохраняет отчет в JSON или CSV"""
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    if report_format == 'json':
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return
+
+    with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(
+            f, fieldnames=["text", "background", "ratio", "aa", "aa_large", "aaa", "aaa_large"]
+        )
+        writer.writeheader()
+        writer.writerows(report["pairs"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WCAG contrast analysis for design token colours')
+    parser.add_argument('--format', choices=['json', 'csv'], default='json', help='Report format')
+    parser.add_argument('--output', help='Report path (default: docs/token-contrast-report.<format>)')
+    parser.add_argument('--matrix', help='Also write the full N×N contrast matrix to this CSV file')
+    parser.add_argument('--fail-on', choices=['none', 'aa', 'aaa'], default='none',
+                        help='Exit with code 1 when a text/background pair fails this level')
+
+    args = parser.parse_args()
+
+    print('🔍 Анализ контрастности цветовых токенов NutryFlow...')
+    exporter = DesignTokensExporter()
+    colors = {
+        name: value for name, value in exporter.tokens.get("colors", {}).items()
+        if isinstance(value, str) and value.startswith('#')
+    }
+
+    if not colors:
+        print("❌ Цветовые токены не найдены")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    analyzer = TokenContrastAnalyzer(colors)
+    report = analyzer.build_report()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    summary = report["summary"]
+    print(f"📊 Цветов: {report['colors']} (уникальных: {report['unique_colors']}), "
+          f"пар текст/фон: {summary['pairs']}, расчет: {elapsed_ms:.1f} мс")
+    print(f"   Не проходят AA: {summary['fail_aa']}, не проходят AAA: {summary['fail_aaa']}")
+
+    for pair in report["pairs"]:
+        if not pair["aa"]:
+            print(f"🔴 {pair['text']} на {pair['background']}: {pair['ratio']:.2f}")
+
+    output_file = Path(args.output or f"docs/token-contrast-report.{args.format}")
+    write_report(report, output_file, args.format)
+    print(f"📄 Отчет сохранен в: {output_file}")
+
+    if args.matrix:
+        analyzer.write_matrix_csv(Path(args.matrix))
+        print(f"📄 Матрица контрастности сохранена в: {args.matrix}")
+
+    if (args.fail_on == 'aa' and summary['fail_aa']) or (args.fail_on == 'aaa' and summary['fail_aaa']):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Анализ использования дизайн-токенов NutryFlow в коде приложения
+
+Один раз параллельно сканирует все Dart файлы в lib/ и находит обращения
+к классам и геттерам токенов (`DesignTokens.spacing.md`, `context.colors.primary`,
+`context.onSurface`, `ThemeTokens.current.primary`, `ConstColorTokens.primary`).
+Поле вроде `colors` разрешается по получателю: `DesignTokens.colors` - это
+статическое поле класса, `context.colors` - геттер расширения BuildContext.
+Если получатель неизвестен и кандидатов несколько, обращение попадает в
+отдельный список неоднозначных, а не засчитывается каждому классу.
+Отчет показывает неиспользуемые и самые популярные токены и статистику по
+фичам; флаг --prune перегенерирует экспорт без неиспользуемых токенов.
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+from export_design_tokens import (
+    CONST_TYPES, GENERATED_SUFFIX, DartTokenParser, DesignTokensExporter,
+)
+
+LIB_DIR = Path("lib")
+
+# Суффиксы, которые экспортер добавляет к именам геттеров в модели токенов
+MODEL_SUFFIXES = ("_gradient", "_duration", "_curve", "_fontWeight", "_fontSize")
+
+# Окончания имен переменных-получателей для типов, которые расширяют токены
+# (extension on ...): `context`, `effectiveContext`, `parentContext`
+RECEIVER_TYPES = {"context": "BuildContext"}
+
+TokenKey = Tuple[str, str]
+
+
+def _scan_file(path: str, accessor_pattern: str, flat_pattern: str) -> Dict[str, int]:
+    """Считает обращения к токенам в одном файле (выполняется в пуле процессов)"""
+    content = Path(path).read_text(encoding='utf-8', errors='ignore')
+    refs: Counter = Counter()
+
+    if accessor_pattern:
+        for receiver, accessor, getter in re.findall(accessor_pattern, content):
+            refs[f"acc:{receiver}.{accessor}.{getter}"] += 1
+    if flat_pattern:
+        for getter in re.findall(flat_pattern, content):
+            refs[f"flat:{getter}"] += 1
+    for class_name, getter in re.findall(r'\bConst(\w+)\.(\w+)', content):
+        refs[f"const:{class_name}.{getter}"] += 1
+
+    return dict(refs)
+
+
+class TokenUsageAnalyzer:
+    """Индекс использования токенов по классам и геттерам"""
+
+    def __init__(self, exporter: DesignTokensExporter, jobs: int = None):
+        self.exporter = exporter
+        self.jobs = jobs
+        self.parser = DartTokenParser()
+        self.sources = {
+            path: Path(path).read_text(encoding='utf-8') for path in exporter.source_files
+        }
+        self.classes = exporter.token_classes
+        self.class_info = exporter.class_info
+        # Ключи классов по имени в Dart (у одноименных классов разных файлов ключи с префиксом файла)
+        self.keys_by_name: Dict[str, Set[str]] = {}
+        for key, info in self.class_info.items():
+            self.keys_by_name.setdefault(info["name"], set()).add(key)
+        self.const_classes = {exporter.const_class_name(key): key for key in self.classes}
+        self.accessors, self.flat_getters = self._build_accessors()
+
+    def _build_accessors(self) -> Tuple[Dict[str, Dict[str, Set[str]]], Dict[str, Tuple[str, str]]]:
+        """Строит карту обращений: имя поля/геттера -> {владелец: классы токенов}
+
+        Владелец - класс, где объявлено поле, или тип расширения. Например,
+        `colors` -> {DesignTokens: {_ColorTokens}, BuildContext: {_DynamicColorTokens}},
+        `current` -> {ThemeTokens: {_LightThemeTokens, _DarkThemeTokens}}.
+        Плоские геттеры расширений (`context.primary` => `theme.primary`)
+        возвращаются отдельно.
+        """
+        subclasses: Dict[str, Set[str]] = {}
+        for content in self.sources.values():
+            for child, base in re.findall(r'\bclass (\w+)\s+extends\s+(\w+)', content):
+                subclasses.setdefault(base, set()).add(child)
+
+        def resolve(dart_type: str) -> Set[str]:
+            if dart_type in self.keys_by_name:
+                return set(self.keys_by_name[dart_type])
+            return {key for child in subclasses.get(dart_type, ()) for key in self.keys_by_name.get(child, ())}
+
+        accessors: Dict[str, Dict[str, Set[str]]] = {}
+        for content in self.sources.values():
+            for owner_match in re.finditer(r'\b(?:class (\w+)[^{;]*|extension \w+ on (\w+)\s*)\{', content):
+                owner = owner_match.group(1) or owner_match.group(2)
+                end = DartTokenParser._find_closing(content, owner_match.end() - 1)
+                body = content[owner_match.end():end]
+                declarations = re.findall(r'static const (\w+) (\w+)\s*=', body)
+                declarations += re.findall(r'(\w+) get (\w+)\s*=>', body)
+                for dart_type, name in declarations:
+                    classes = resolve(dart_type)
+                    if classes:
+                        accessors.setdefault(name, {}).setdefault(owner, set()).update(classes)
+
+        flat_getters = {}
+        for content in self.sources.values():
+            for extension in re.finditer(r'\bextension \w+ on BuildContext\s*\{', content):
+                end = DartTokenParser._find_closing(content, extension.end() - 1)
+                body = content[extension.end():end]
+                for name, accessor, getter in re.findall(r'\w+ get (\w+)\s*=>\s*(\w+)\.(\w+)\s*;', body):
+                    if accessor in accessors:
+                        flat_getters[name] = (accessor, getter)
+
+        return accessors, flat_getters
+
+    def _dart_files(self) -> List[str]:
+        """Файлы приложения для поиска обращений (без исходников токенов и сгенерированных)"""
+        excluded = set(self.sources)
+        return sorted(
+            path.as_posix() for path in LIB_DIR.rglob('*.dart')
+            if path.as_posix() not in excluded and not path.name.endswith(GENERATED_SUFFIX)
+        )
+
+    def scan(self) -> Dict[str, Dict[str, int]]:
+        """Сканирует lib/ параллельно: {файл: {ссылка: количество}}"""
+        files = self._dart_files()
+        accessor_names = "|".join(sorted(map(re.escape, self.accessors), key=len, reverse=True))
+        flat_names = "|".join(sorted(map(re.escape, self.flat_getters), key=len, reverse=True))
+        accessor_pattern = rf'(\w*)\.({accessor_names})\.(\w+)' if accessor_names else ''
+        flat_pattern = rf'\bcontext\.({flat_names})\b' if flat_names else ''
+
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            results = executor.map(
+                _scan_file, files,
+                [accessor_pattern] * len(files), [flat_pattern] * len(files),
+                chunksize=16,
+            )
+            return dict(zip(files, results))
+
+    def _accessor_classes(self, accessor: str, receiver: str = '') -> Tuple[Set[str], bool]:
+        """Классы токенов за `receiver.accessor` и признак неоднозначности
+
+        Получатель - имя класса (`DesignTokens`) или переменной расширяемого
+        типа (`context`). Если владелец не определен, а разные владельцы дают
+        разные классы, обращение неоднозначно.
+        """
+        owners = self.accessors.get(accessor, {})
+        owner = next(
+            (dart_type for suffix, dart_type in RECEIVER_TYPES.items() if receiver.lower().endswith(suffix)),
+            receiver,
+        )
+        if owner in owners:
+            return owners[owner], False
+        candidates = {frozenset(classes) for classes in owners.values()}
+        return set().union(*candidates), len(candidates) > 1
+
+    def _resolve_ref(self, ref: str) -> Tuple[List[TokenKey], bool]:
+        """Переводит ссылку из сканера в список (класс, геттер) и признак неоднозначности"""
+        kind, _, target = ref.partition(':')
+        ambiguous = False
+        if kind == 'const':
+            accessor, _, getter = target.partition('.')
+            classes = {self.const_classes[f"Const{accessor}"]} if f"Const{accessor}" in self.const_classes else set()
+        else:
+            if kind == 'flat':
+                receiver = 'context'
+                accessor, getter = self.flat_getters[target]
+            else:
+                receiver, accessor, getter = target.split('.')
+            classes, ambiguous = self._accessor_classes(accessor, receiver)
+
+        keys = [(class_name, getter) for class_name in sorted(classes) if getter in self.classes[class_name]]
+        return keys, ambiguous and len(keys) > 1
+
+    def _propagate(self, used: Set[TokenKey]) -> Set[TokenKey]:
+        """Помечает токены, на которые ссылаются используемые токены (алиасы, стили, темы)"""
+        alive = set(used)
+        queue = list(used)
+
+        while queue:
+            class_name, getter = queue.pop()
+            expr = self.classes[class_name][getter]["expr"]
+            targets = [
+                (class_name, ref) for ref in re.findall(r'(?<![.\w])([a-z_]\w*)(?!\s*:)', expr)
+                if ref in self.classes[class_name]
+            ]
+            for receiver, accessor, ref in re.findall(r'\b(?:(\w+)\.)?(\w+)\.(\w+)', expr):
+                target_classes, _ = self._accessor_classes(accessor, receiver)
+                targets += [
+                    (target_class, ref) for target_class in target_classes
+                    if ref in self.classes[target_class]
+                ]
+            for target in targets:
+                if target not in alive:
+                    alive.add(target)
+                    queue.append(target)
+
+        return alive
+
+    @staticmethod
+    def _feature(path: str) -> str:
+        """Определяет фичу по пути файла: lib/features/<name>/... или верхний каталог lib/"""
+        parts = Path(path).relative_to(LIB_DIR).parts
+        if parts[0] == 'features' and len(parts) > 2:
+            return f"features/{parts[1]}"
+        return parts[0] if len(parts) > 1 else Path(parts[0]).stem
+
+    def token_id(self, key: TokenKey) -> str:
+        """Читаемый идентификатор токена: `color.primary`, `darkTheme.surface`"""
+        return f"{self.class_info[key[0]]['namespace']}.{key[1]}"
+
+    def analyze(self, top: int = 20) -> Dict[str, Any]:
+        """Строит отчет об использовании токенов"""
+        scanned = self.scan()
+
+        counts: Counter = Counter()
+        ambiguous: Counter = Counter()
+        candidates: Set[TokenKey] = set()
+        features: Dict[str, Counter] = {}
+        for path, refs in scanned.items():
+            feature = features.setdefault(self._feature(path), Counter())
+            for ref, count in refs.items():
+                keys, is_ambiguous = self._resolve_ref(ref)
+                if is_ambiguous:
+                    # Не засчитываем обращение ни одному классу, но и не считаем их токены неиспользуемыми
+                    ambiguous[" | ".join(self.token_id(key) for key in keys)] += count
+                    candidates.update(keys)
+                    continue
+                for key in keys:
+                    counts[key] += count
+                    feature[self.token_id(key)] += count
+
+        self.used = self._propagate(set(counts) | candidates)
+        tokens = [
+            (class_name, getter)
+            for class_name, getters in self.classes.items()
+            for getter, info in getters.items()
+            if info["type"] in CONST_TYPES and not getter.startswith('_')
+        ]
+        unused = [key for key in tokens if key not in self.used]
+
+        return {
+            "generated": datetime.now().isoformat(timespec='seconds'),
+            "files_scanned": len(scanned),
+            "summary": {
+                "tokens": len(tokens),
+                "used": len(tokens) - len(unused),
+                "unused": len(unused),
+                "ambiguous_references": sum(ambiguous.values()),
+            },
+            "unused": [self.token_id(key) for key in unused],
+            "most_used": [
+                {"token": self.token_id(key), "count": count}
+                for key, count in counts.most_common(top)
+            ],
+            "ambiguous": [
+                {"candidates": candidates_id, "count": count}
+                for candidates_id, count in ambiguous.most_common()
+            ],
+            "features": {
+                name: {"references": sum(refs.values()), "tokens": dict(refs.most_common())}
+                for name, refs in sorted(features.items()) if refs
+            },
+        }
+
+    def prune(self, tokens: Dict[str, Any]) -> Dict[str, Any]:
+        """Убирает из модели экспорта токены, геттеры которых нигде не используются"""
+        main_file = self.exporter.tokens_file.as_posix()
+        namespaces = {info["namespace"]: key for key, info in self.class_info.items()}
+        root_classes = [key for key, info in self.class_info.items() if info["file"] == main_file]
+
+        def is_used(key: str) -> bool:
+            namespace, _, name = key.rpartition('.')
+            for suffix in MODEL_SUFFIXES:
+                if name.endswith(suffix):
+                    name = name[:-len(suffix)]
+                    break
+            candidates = [namespaces[namespace]] if namespace in namespaces else root_classes
+            defining = [class_name for class_name in candidates if name in self.classes[class_name]]
+            return not defining or any((class_name, name) in self.used for class_name in defining)
+
+        return {
+            category: {key: value for key, value in values.items() if is_used(key)}
+            for category, values in tokens.items()
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find unused and heavily used design tokens in lib/')
+    parser.add_argument('--output', default='docs/token-usage-report.json', help='JSON report path')
+    parser.add_argument('--top', type=int, default=20, help='Number of most used tokens to report')
+    parser.add_argument('--jobs', type=int, help='Number of scanner processes (default: CPU count)')
+    parser.add_argument('--prune', action='store_true',
+                        help='Regenerate design-tokens/ exports without unused tokens')
+
+    args = parser.parse_args()
+
+    print('🔍 Анализ использования дизайн-токенов NutryFlow...')
+    exporter = DesignTokensExporter(jobs=args.jobs)
+    if not exporter.tokens:
+        sys.exit(1)
+
+    analyzer = TokenUsageAnalyzer(exporter, jobs=args.jobs)
+    report = analyzer.analyze(args.top)
+
+    summary = report["summary"]
+    print(f"📊 Файлов: {report['files_scanned']}, токенов: {summary['tokens']}, "
+          f"используется: {summary['used']}, не используется: {summary['unused']}")
+    if summary['ambiguous_references']:
+        print(f"⚠️  Неоднозначных обращений: {summary['ambiguous_references']} "
+              f"(получатель не определен, см. \"ambiguous\" в отчете)")
+    print("\n🔥 Самые используемые:")
+    for item in report["most_used"][:10]:
+        print(f"  {item['token']}: {item['count']}")
+    print("\n📁 По фичам:")
+    for name, feature in report["features"].items():
+        print(f"  {name}: {feature['references']} обращений, {len(feature['tokens'])} токенов")
+
+    output_file = Path(args.output)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n📄 Отчет сохранен в: {output_file}")
+
+    if args.prune:
+        exporter.tokens = analyzer.prune(exporter.tokens)
+        exporter.export_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк и golden-тесты экспортера дизайн-токенов NutryFlow
+
+- generate: создает синтетический design_tokens.dart с заданным числом токенов
+  всех видов (цвета, градиенты, размеры, TextStyle, тени, длительности, кривые)
+- bench: измеряет время парсинга и экспорта в каждый формат для набора размеров
+- golden: сравнивает побайтно JSON, CSS, минифицированный CSS и Figma экспорт
+  реальных токенов с эталонами в test/goldens/design_tokens (--update обновляет
+  эталоны) и проверяет, что в минифицированном CSS есть все переменные полного
+  с теми же значениями
+"""
+
+import argparse
+import difflib
+import io
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from export_design_tokens import DesignTokensExporter
+
+GOLDEN_DIR = Path("test/goldens/design_tokens")
+GOLDEN_FILES = ["design-tokens.json", "design-tokens.css", "design-tokens.min.css", "figma-tokens.json"]
+
+DEFAULT_SIZES = [100, 1000, 10000, 50000]
+
+# Доли видов токенов в синтетическом файле
+KIND_WEIGHTS = {
+    "color": 0.30,
+    "gradient": 0.05,
+    "spacing": 0.20,
+    "radius": 0.10,
+    "text_style": 0.15,
+    "shadow": 0.05,
+    "duration": 0.10,
+    "curve": 0.05,
+}
+
+FONT_SIZES = [57.0, 45.0, 36.0, 32.0, 28.0, 24.0, 22.0, 16.0, 14.0, 12.0, 11.0]
+FONT_WEIGHTS = {"light": 300, "regular": 400, "medium": 500, "semiBold": 600, "bold": 700}
+CURVES = ["easeIn", "easeOut", "easeInOut", "bounceIn", "bounceOut", "elasticIn", "elasticOut", "linear"]
+
+# Методы экспорта, время которых измеряется отдельно
+EXPORT_METHODS = [
+    "export_json", "export_css", "export_css_optimized", "export_figma",
+    "export_sketch", "export_adobe_xd", "export_dart_const",
+]
+
+
+def generate_tokens_source(count: int, seed: int = 0) -> str:
+    """Генерирует исходный текст design_tokens.dart примерно с `count` токенами"""
+    rng = random.Random(seed)
+    per_kind = {kind: max(1, int(count * weight)) for kind, weight in KIND_WEIGHTS.items()}
+
+    def color() -> str:
+        return f"0xFF{rng.randrange(0x1000000):06X}"
+
+    lines = ["import 'package:flutter/material.dart';", ""]
+
+    lines += ["class _ColorTokens {", "  const _ColorTokens();", ""]
+    lines += [f"  Color get color{i} => const Color({color()});" for i in range(per_kind["color"])]
+    for i in range(per_kind["gradient"]):
+        lines += [
+            "",
+            f"  LinearGradient get gradient{i} => const LinearGradient(",
+            f"        colors: [Color({color()}), Color({color()})],",
+            "        begin: Alignment.topLeft,",
+            "        end: Alignment.bottomRight,",
+            "      );",
+        ]
+    lines += ["}", ""]
+
+    lines += ["class _TypographyTokens {", "  const _TypographyTokens();", ""]
+    lines.append("  String get fontFamily => 'Inter';")
+    lines += [f"  double get fontSize{i} => {size};" for i, size in enumerate(FONT_SIZES)]
+    lines += [f"  FontWeight get {name} => FontWeight.w{weight};" for name, weight in FONT_WEIGHTS.items()]
+    for i in range(per_kind["text_style"]):
+        lines += [
+            "",
+            f"  TextStyle get style{i} => TextStyle(",
+            "        fontFamily: fontFamily,",
+            f"        fontSize: fontSize{rng.randrange(len(FONT_SIZES))},",
+            f"        fontWeight: {rng.choice(list(FONT_WEIGHTS))},",
+            f"        height: {rng.choice([1.2, 1.4, 1.6])},",
+            "      );",
+        ]
+    lines += ["}", ""]
+
+    lines += ["class _SpacingTokens {", "  const _SpacingTokens();", ""]
+    lines += [f"  double get space{i} => {rng.randrange(1, 200)}.0;" for i in range(per_kind["spacing"])]
+    lines += ["}", ""]
+
+    lines += ["class _ShadowTokens {", "  const _ShadowTokens();", ""]
+    for i in range(per_kind["shadow"]):
+        blur = rng.randrange(1, 32)
+        lines += [
+            f"  List<BoxShadow> get shadow{i} => [",
+            "        BoxShadow(",
+            f"          color: Colors.black.withValues(alpha: {rng.randrange(1, 50) / 100}),",
+            f"          blurRadius: {blur},",
+            f"          offset: const Offset(0, {blur // 2}),",
+            "        ),",
+            "      ];",
+            "",
+        ]
+    lines += ["}", ""]
+
+    lines += ["class _AnimationTokens {", "  const _AnimationTokens();", ""]
+    lines += [
+        f"  Duration get duration{i} => const Duration(milliseconds: {rng.randrange(50, 2000)});"
+        for i in range(per_kind["duration"])
+    ]
+    lines += [f"  Curve get curve{i} => Curves.{rng.choice(CURVES)};" for i in range(per_kind["curve"])]
+    lines += ["}", ""]
+
+    lines += ["class _BorderTokens {", "  const _BorderTokens();", ""]
+    lines += [f"  double get radius{i} => {rng.randrange(0, 64)}.0;" for i in range(per_kind["radius"])]
+    lines += ["}", ""]
+
+    return "\n".join(lines)
+
+
+def _timed(func) -> float:
+    """Выполняет функцию без вывода в консоль и возвращает время в секундах"""
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        func()
+    return time.perf_counter() - started
+
+
+def benchmark(sizes: List[int], repeat: int) -> List[Dict[str, float]]:
+    """Измеряет лучшее из `repeat` время парсинга и экспорта для каждого размера"""
+    results = []
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            tokens_file = Path(tmp) / "design_tokens.dart"
+            tokens_file.write_text(generate_tokens_source(size), encoding='utf-8')
+            output_dir = Path(tmp) / "out"
+
+            def parse():
+                return DesignTokensExporter(
+                    tokens_file=tokens_file, output_dir=output_dir, roots=[], use_cache=False
+                )
+
+            timings = {"tokens": size, "parse": min(_timed(parse) for _ in range(repeat))}
+            with redirect_stdout(io.StringIO()):
+                exporter = parse()
+
+            for method in EXPORT_METHODS:
+                export = getattr(exporter, method)
+                if method == "export_dart_const":
+                    target = output_dir / "design_tokens.g.dart"
+                    timings[method] = min(_timed(lambda: export(target)) for _ in range(repeat))
+                else:
+                    timings[method] = min(_timed(export) for _ in range(repeat))
+
+            results.append(timings)
+
+    return results
+
+
+def print_benchmark(results: List[Dict[str, float]]):
+    """Выводит таблицу результатов в миллисекундах"""
+    columns = ["parse", *EXPORT_METHODS]
+    print("| Tokens | " + " | ".join(columns) + " |")
+    print("|" + "---|" * (len(columns) + 1))
+    for timings in results:
+        cells = " | ".join(f"{timings[column] * 1000:.1f}" for column in columns)
+        print(f"| {timings['tokens']} | {cells} |")
+
+
+def _css_root_variables(css: str) -> Dict[str, str]:
+    """Переменные первого блока :root{...} (без @media) в виде {имя: значение}"""
+    body = css[css.index('{') + 1:css.index('}')]
+    variables = {}
+    for declaration in body.split(';'):
+        name, _, value = declaration.partition(':')
+        if name.strip():
+            variables[name.strip()] = value.strip()
+    return variables
+
+
+def _css_rgba(value: str) -> Tuple[int, int, int, int]:
+    """Цвет CSS `#rgb[a]`/`#rrggbb[aa]` как (r, g, b, a) - альфа в конце"""
+    digits = value[1:]
+    if len(digits) in (3, 4):
+        digits = ''.join(digit * 2 for digit in digits)
+    if len(digits) == 6:
+        digits += 'ff'
+    return tuple(int(digits[i:i + 2], 16) for i in range(0, 8, 2))
+
+
+def _dart_rgba(value: str) -> Tuple[int, int, int, int]:
+    """Цвет Dart `#AARRGGBB` как (r, g, b, a) - альфа в начале"""
+    digits = value[1:]
+    if len(digits) == 6:
+        digits = 'ff' + digits
+    alpha, red, green, blue = (int(digits[i:i + 2], 16) for i in range(0, 8, 2))
+    return red, green, blue, alpha
+
+
+def _normalize_css_value(value: str) -> str:
+    """Каноническая запись значения: цвет -> (r, g, b, a) по правилам CSS, 16.0px -> 16px"""
+    if value.startswith('#'):
+        return str(_css_rgba(value))
+    if value.endswith('px'):
+        return f"{float(value[:-2]):g}px"
+    return value
+
+
+def compare_css_variables(full_css: str, min_css: str) -> List[str]:
+    """Расхождения переменных полного и минифицированного CSS (пустой список - совпадают)"""
+    full = _css_root_variables(full_css)
+    minified = _css_root_variables(min_css)
+    mismatches = [f"нет {name}" for name in full if name not in minified]
+    mismatches += [
+        f"{name}: {full[name]} != {minified[name]}" for name in full
+        if name in minified and _normalize_css_value(full[name]) != _normalize_css_value(minified[name])
+    ]
+    mismatches += [f"лишняя {name}" for name in minified if name not in full]
+    return mismatches
+
+
+def compare_css_colors(css: str, colors: Dict[str, Any]) -> List[str]:
+    """Расхождения цветов CSS с цветами токенов Dart (`#AARRGGBB` из design-tokens.json)"""
+    variables = _css_root_variables(css)
+    mismatches = []
+    for name, value in colors.items():
+        if not (isinstance(value, str) and value.startswith('#')):
+            continue
+        prop = f"--color-{name.replace('.', '-')}"
+        if prop not in variables:
+            mismatches.append(f"нет {prop}")
+        elif _css_rgba(variables[prop]) != _dart_rgba(value):
+            mismatches.append(f"{prop}: {variables[prop]} не равен {value} (Dart ARGB)")
+    return mismatches
+
+
+def check_golden(update: bool) -> bool:
+    """Сравнивает экспорт реальных токенов с эталонами; возвращает True, если совпадает"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with redirect_stdout(io.StringIO()):
+            exporter = DesignTokensExporter(output_dir=Path(tmp), use_cache=False)
+            exporter.export_json()
+            exporter.export_css()
+            exporter.export_css_optimized()
+            exporter.export_figma()
+
+        if update:
+            GOLDEN_DIR.mkdir(parents=True, exist_ok=True)
+            for name in GOLDEN_FILES:
+                shutil.copyfile(Path(tmp) / name, GOLDEN_DIR / name)
+            print(f"✅ Эталоны обновлены: {GOLDEN_DIR}")
+            return True
+
+        passed = True
+        colors = json.loads((Path(tmp) / "design-tokens.json").read_text(encoding='utf-8')).get("colors", {})
+        for name in ("design-tokens.css", "design-tokens.min.css"):
+            mismatches = compare_css_colors((Path(tmp) / name).read_text(encoding='utf-8'), colors)
+            if mismatches:
+                passed = False
+                print(f"❌ Цвета {name} не совпадают с токенами")
+                for line in mismatches[:40]:
+                    print(f"   {line}")
+            else:
+                print(f"✅ {name}: цвета совпадают с токенами")
+
+        mismatches = compare_css_variables(
+            (Path(tmp) / "design-tokens.css").read_text(encoding='utf-8'),
+            (Path(tmp) / "design-tokens.min.css").read_text(encoding='utf-8'),
+        )
+        if mismatches:
+            passed = False
+            print("❌ Переменные design-tokens.min.css расходятся с design-tokens.css")
+            for line in mismatches[:40]:
+                print(f"   {line}")
+        else:
+            print("✅ design-tokens.min.css: все переменные design-tokens.css на месте")
+
+        for name in GOLDEN_FILES:
+            golden_file = GOLDEN_DIR / name
+            actual = (Path(tmp) / name).read_bytes()
+            expected = golden_file.read_bytes() if golden_file.exists() else b""
+
+            if actual == expected:
+                print(f"✅ {name}")
+                continue
+
+            passed = False
+            print(f"❌ {name} отличается от эталона {golden_file}")
+            diff = difflib.unified_diff(
+                expected.decode('utf-8').splitlines(), actual.decode('utf-8').splitlines(),
+                fromfile=str(golden_file), tofile=name, lineterm='',
+            )
+            for line in list(diff)[:40]:
+                print(f"   {line}")
+
+        return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Design token exporter benchmark and golden tests')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    generate_parser = subparsers.add_parser('generate', help='Write a synthetic design_tokens.dart')
+    generate_parser.add_argument('--tokens', type=int, default=1000, help='Approximate number of tokens')
+    generate_parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    generate_parser.add_argument('--output', required=True, help='Output Dart file')
+
+    bench_parser = subparsers.add_parser('bench', help='Measure parse and per-format export time')
+    bench_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Token counts')
+    bench_parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is kept)')
+    bench_parser.add_argument('--json', help='Also write results to this JSON file')
+
+    golden_parser = subparsers.add_parser('golden', help='Check JSON, CSS, minified CSS and Figma output against goldens')
+    golden_parser.add_argument('--update', action='store_true', help='Overwrite the golden files')
+
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        Path(args.output).write_text(generate_tokens_source(args.tokens, args.seed), encoding='utf-8')
+        print(f"✅ Синтетические токены сохранены: {args.output}")
+
+    elif args.command == 'bench':
+        results = benchmark(args.sizes, args.repeat)
+        print_benchmark(results)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+
+    elif args.command == 'golden':
+        if not check_golden(args.update):
+            print("\nЕсли изменения ожидаемы, обновите эталоны: "
+                  "python scripts/benchmark_design_tokens.py golden --update")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк времени старта скриптов аналитики спринта NutryFlow
+
+Для каждого CLI запускается `python -X importtime -c "import <модуль>"` и
+разбирается отчет интерпретатора: суммарное время импорта модуля и самые
+тяжелые зависимости верхнего уровня. С флагом --check скрипт завершается с
+ошибкой, если время импорта превышает бюджет или на пути импорта появился
+запрещенный модуль (например, matplotlib в текстовом режиме).
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Бюджет времени импорта (мс) и модули, которые не должны загружаться при старте
+STARTUP_BUDGETS = {
+    'scrum_automation': {'budget_ms': 400, 'forbidden': ['matplotlib', 'pandas', 'numpy']},
+    'generate_burndown_chart': {'budget_ms': 400, 'forbidden': ['matplotlib', 'pandas', 'numpy']},
+    # pandas нужен движку метрик SprintFrame при любом запуске
+    'generate_sprint_metrics': {'budget_ms': 1200, 'forbidden': ['matplotlib']},
+    'sprint_portfolio': {'budget_ms': 1200, 'forbidden': ['matplotlib']},
+    'sprint_report': {'budget_ms': 1200, 'forbidden': ['matplotlib']},
+}
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def measure_import(module: str) -> Dict:
+    """Время импорта модуля в новом интерпретаторе по отчету -X importtime"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True,
+    )
+
+    total_us = 0
+    top_level: Dict[str, int] = {}
+    loaded = set()
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, name = int(match[2]), len(match[3]), match[4]
+        loaded.add(name.split('.')[0])
+        if name == module:
+            total_us = cumulative
+        elif depth == 3:
+            top_level[name] = cumulative
+
+    heaviest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:5]
+    return {
+        'module': module,
+        'total_ms': total_us / 1000,
+        'heaviest': [{'module': name, 'ms': us / 1000} for name, us in heaviest],
+        'loaded': sorted(loaded),
+    }
+
+
+def benchmark(modules: List[str], repeat: int) -> List[Dict]:
+    """Лучший из `repeat` замеров для каждого модуля (первый прогон прогревает кэш .pyc)"""
+    results = []
+    for module in modules:
+        runs = [measure_import(module) for _ in range(repeat)]
+        results.append(min(runs, key=lambda run: run['total_ms']))
+    return results
+
+
+def print_benchmark(results: List[Dict]):
+    print(f"{'Module':<28} {'Import':>10}  Heaviest imports")
+    for result in results:
+        heaviest = ', '.join(f"{item['module']} {item['ms']:.0f}ms" for item in result['heaviest'][:3])
+        print(f"{result['module']:<28} {result['total_ms']:>8.0f}ms  {heaviest}")
+
+
+def check_budgets(results: List[Dict]) -> bool:
+    ok = True
+    for result in results:
+        limits = STARTUP_BUDGETS[result['module']]
+        if result['total_ms'] > limits['budget_ms']:
+            print(f"❌ {result['module']}: import {result['total_ms']:.0f}ms > budget {limits['budget_ms']}ms")
+            ok = False
+        for forbidden in limits['forbidden']:
+            if forbidden in result['loaded']:
+                print(f"❌ {result['module']}: imports {forbidden} at startup")
+                ok = False
+    if ok:
+        print("✅ Время старта в пределах бюджета")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure start-up import time of the sprint analytics CLIs')
+    parser.add_argument('--modules', nargs='+', default=list(STARTUP_BUDGETS), choices=list(STARTUP_BUDGETS),
+                        help='Modules to measure')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per module (best is kept)')
+    parser.add_argument('--check', action='store_true', help='Fail on budget overruns or forbidden imports')
+    parser.add_argument('--json', help='Also write results to this JSON file')
+
+    args = parser.parse_args()
+
+    results = benchmark(args.modules, args.repeat)
+    print_benchmark(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.check and not check_budgets(results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Burndown Engine
+Событийный расчет фактического burndown для спринтов NutryFlow
+
+Каждая задача превращается в события: добавлена в спринт, убрана из спринта,
+закрыта, переоткрыта, изменились story points. События сортируются один раз
+и проходятся одной «заметающей прямой» с накоплением оставшихся points и
+объема спринта, поэтому весь расчет занимает O(n log n). Границы дней
+считаются в заданном часовом поясе.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from itertools import chain
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from issue_records import IssueRecord, parse_datetime
+
+# Порядок событий с одинаковым временем: сначала задача появляется в спринте
+# и получает оценку, затем меняет состояние, и только потом убирается
+EVENT_ORDER = {'added': 0, 'points': 1, 'reopened': 2, 'closed': 3, 'removed': 4}
+
+
+class BurndownEvent(NamedTuple):
+    at: datetime
+    kind: str
+    number: int
+    points: int = 0
+
+
+class BurndownPoint(NamedTuple):
+    day: datetime
+    remaining: int
+    scope: int
+
+    @property
+    def completed(self) -> int:
+        return self.scope - self.remaining
+
+
+def _story_points_label(name: str) -> Optional[int]:
+    if 'story-points' not in name.lower():
+        return None
+    try:
+        return int(name.split('-')[-1])
+    except ValueError:
+        return None
+
+
+def issue_events(record: IssueRecord, sprint_label: str = 'sprint-active') -> List[BurndownEvent]:
+    """События задачи для burndown
+
+    Если есть история (`timeline` из GraphQL), добавление в спринт, закрытия,
+    переоткрытия и смена оценки берутся из нее. Без истории задача считается
+    добавленной при создании и закрытой в `closed_at`.
+    """
+    number = record.number
+
+    if record.timeline is None:
+        events = [
+            BurndownEvent(record.created_at, 'added', number),
+            BurndownEvent(record.created_at, 'points', number, record.points),
+        ]
+        if record.is_closed and record.closed_at:
+            events.append(BurndownEvent(record.closed_at, 'closed', number))
+        return events
+
+    events = []
+    has_sprint_event = has_points_event = False
+    for event in record.timeline:
+        at = parse_datetime(event['created_at'])
+        label = event.get('label', {}).get('name', '')
+
+        if event['event'] in ('closed', 'reopened'):
+            events.append(BurndownEvent(at, event['event'], number))
+        elif label == sprint_label:
+            has_sprint_event = True
+            events.append(BurndownEvent(at, 'added' if event['event'] == 'labeled' else 'removed', number))
+        elif event['event'] == 'labeled' and _story_points_label(label) is not None:
+            has_points_event = True
+            events.append(BurndownEvent(at, 'points', number, _story_points_label(label)))
+
+    if not has_sprint_event and sprint_label in record.labels:
+        events.append(BurndownEvent(record.created_at, 'added', number))
+    if not has_points_event:
+        events.append(BurndownEvent(record.created_at, 'points', number, record.points))
+
+    return events
+
+
+class BurndownEngine:
+    def __init__(self, records: List[IssueRecord], sprint_label: str = 'sprint-active'):
+        self.events = sorted(
+            chain.from_iterable(issue_events(record, sprint_label) for record in records),
+            key=lambda event: (event.at, EVENT_ORDER[event.kind]),
+        )
+
+    def sweep(self, start: date, end: date, timezone: str = 'UTC',
+              now: Optional[datetime] = None) -> List[BurndownPoint]:
+        """Оставшиеся points и объем спринта на конец каждого дня окна [start, end]
+
+        Дни, которые еще не начались к моменту `now`, не возвращаются.
+        """
+        zone = ZoneInfo(timezone)
+        now = now or datetime.now(dt_timezone.utc)
+
+        # Состояние задачи: [в спринте, закрыта, points]
+        issues: Dict[int, list] = {}
+        remaining = scope = 0
+        position = 0
+        points = []
+
+        for offset in range((end - start).days + 1):
+            day = datetime.combine(start + timedelta(days=offset), time(), tzinfo=zone)
+            if day > now:
+                break
+            boundary = min(day + timedelta(days=1), now)
+
+            while position < len(self.events) and self.events[position].at < boundary:
+                event = self.events[position]
+                position += 1
+
+                state = issues.setdefault(event.number, [False, False, 0])
+                in_scope, closed, issue_points = state
+                scope -= issue_points if in_scope else 0
+                remaining -= issue_points if in_scope and not closed else 0
+
+                if event.kind == 'added':
+                    state[0] = True
+                elif event.kind == 'removed':
+                    state[0] = False
+                elif event.kind == 'closed':
+                    state[1] = True
+                elif event.kind == 'reopened':
+                    state[1] = False
+                elif event.kind == 'points':
+                    state[2] = event.points
+
+                in_scope, closed, issue_points = state
+                scope += issue_points if in_scope else 0
+                remaining += issue_points if in_scope and not closed else 0
+
+            points.append(BurndownPoint(day, remaining, scope))
+
+        return points
+
+
+def sprint_window(sprint_duration: int, timezone: str = 'UTC', end: Optional[date] = None) -> Tuple[date, date]:
+    """Начало и конец спринта, заканчивающегося `end` (по умолчанию сегодня в часовом поясе команды)"""
+    end = end or datetime.now(ZoneInfo(timezone)).date()
+    return end - timedelta(days=sprint_duration), end
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Charts
+Общий конвейер построения графиков для скриптов аналитики спринта NutryFlow
+
+matplotlib импортируется только когда график действительно строится: его
+загрузка занимает большую часть времени старта скриптов, а текстовым
+отчетам он не нужен. Бэкенд принудительно неинтерактивный (Agg) - скрипты
+работают в cron и CI без дисплея.
+
+Графики не рисуются сразу, а добавляются в `ChartRenderer`: для каждого
+считается хэш отображаемых данных, параметров вывода и кода функции
+рисования. Если файл с таким хэшем уже есть, отрисовка пропускается;
+остальные графики строятся параллельно в пуле процессов. Кроме основного
+экспорта можно получить превью (SVG или PNG с низким DPI) для комментариев в CI.
+
+Формат `vega` вообще не использует matplotlib: данные графика сохраняются
+компактным JSON (`<name>.data.json`) вместе со спецификацией Vega-Lite
+(`<name>.vl.json`), которую дашборд или комментарий отрисовывает на клиенте.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+CHART_FORMATS = ('png', 'svg', 'pdf', 'vega')
+VEGA_LITE_SCHEMA = 'https://vega.github.io/schema/vega-lite/v5.json'
+DEFAULT_DPI = 300
+DEFAULT_PREVIEW_DPI = 100
+DEFAULT_CHART_CACHE = Path('.cache/charts.json')
+
+
+def pyplot():
+    """Модуль matplotlib.pyplot с бэкендом Agg"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+class ChartJob(NamedTuple):
+    label: str
+    draw: Callable[[Dict, Path, int], None]
+    data: Dict
+    path: Path
+    dpi: int
+    spec: Optional[Callable[[Dict], Dict]] = None
+
+
+def _json_value(value):
+    """Даты графиков в JSON - ISO 8601"""
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def write_vega(job: ChartJob) -> Path:
+    """Сохранить данные графика и спецификацию Vega-Lite (данные встроены в спецификацию)"""
+    data = json.dumps(job.data, separators=(',', ':'), default=_json_value)
+    job.path.with_name(job.path.name.replace('.vl.json', '.data.json')).write_text(data, encoding='utf-8')
+
+    spec = {'$schema': VEGA_LITE_SCHEMA, **job.spec(json.loads(data))}
+    job.path.write_text(json.dumps(spec, separators=(',', ':')), encoding='utf-8')
+    return job.path
+
+
+def _draw_source(draw: Callable) -> str:
+    try:
+        return inspect.getsource(draw)
+    except (OSError, TypeError):
+        return f'{draw.__module__}.{draw.__qualname__}'
+
+
+def chart_fingerprint(job: ChartJob) -> str:
+    """Хэш данных, формата, DPI и кода рисования графика"""
+    payload = json.dumps(
+        {'data': job.data, 'format': job.path.suffix, 'dpi': job.dpi, 'draw': _draw_source(job.draw)},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _render(job: ChartJob) -> Path:
+    job.draw(job.data, job.path, job.dpi)
+    return job.path
+
+
+class ChartRenderer:
+    def __init__(self, chart_format: str = 'png', dpi: int = DEFAULT_DPI, preview_format: Optional[str] = None,
+                 preview_dpi: int = DEFAULT_PREVIEW_DPI, workers: Optional[int] = None,
+                 cache_path: Optional[Path] = DEFAULT_CHART_CACHE, batch: bool = False):
+        """`batch=True` - графики копятся до явного вызова `render()` (для нескольких генераторов сразу)"""
+        self.chart_format = chart_format
+        self.dpi = dpi
+        self.preview_format = preview_format
+        self.preview_dpi = preview_dpi
+        self.workers = workers or min(os.cpu_count() or 1, 4)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.batch = batch
+        self.jobs: List[ChartJob] = []
+
+    @staticmethod
+    def _path(name: str, chart_format: str) -> Path:
+        return Path(f'{name}.vl.json' if chart_format == 'vega' else f'{name}.{chart_format}')
+
+    def add(self, label: str, draw: Callable[[Dict, Path, int], None], data: Dict, name: str,
+            spec: Optional[Callable[[Dict], Dict]] = None) -> Path:
+        """Добавить график `name` (без расширения) и его превью; вернуть путь основного файла
+
+        `spec` строит спецификацию Vega-Lite из тех же данных для формата `vega`.
+        """
+        path = self._path(name, self.chart_format)
+        self.jobs.append(ChartJob(label, draw, data, path, self.dpi, spec))
+        if self.preview_format:
+            self.jobs.append(ChartJob(f'{label} preview', draw, data,
+                                      self._path(f'{name}_preview', self.preview_format), self.preview_dpi, spec))
+        if not self.batch:
+            self.render()
+        return path
+
+    def _load_cache(self) -> Dict[str, str]:
+        if not self.cache_path or not self.cache_path.exists():
+            return {}
+        try:
+            return json.loads(self.cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def render(self) -> List[Path]:
+        """Построить накопленные графики, пропуская те, что уже есть с тем же хэшем"""
+        jobs, self.jobs = self.jobs, []
+        if not jobs:
+            return []
+
+        # Спецификации Vega-Lite пишутся сразу: это миллисекунды и без matplotlib
+        written = []
+        for job in jobs:
+            if job.path.name.endswith('.vl.json'):
+                written.append(write_vega(job))
+                print(f"{job.label} saved: {job.path}")
+        jobs = [job for job in jobs if not job.path.name.endswith('.vl.json')]
+        if not jobs:
+            return written
+
+        cache = self._load_cache()
+        fingerprints = {job.path: chart_fingerprint(job) for job in jobs}
+        pending = []
+        for job in jobs:
+            if job.path.exists() and cache.get(str(job.path.resolve())) == fingerprints[job.path]:
+                print(f"{job.label} unchanged, rendering skipped: {job.path}")
+            else:
+                pending.append(job)
+
+        if len(pending) > 1 and self.workers > 1:
+            # Импорт в родительском процессе: при fork дочерние процессы получают matplotlib готовым
+            pyplot()
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(pending))) as executor:
+                list(executor.map(_render, pending))
+        else:
+            for job in pending:
+                _render(job)
+
+        for job in pending:
+            cache[str(job.path.resolve())] = fingerprints[job.path]
+            print(f"{job.label} saved: {job.path}")
+
+        if self.cache_path and pending:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_path.write_text(json.dumps(cache, indent=2), encoding='utf-8')
+        if pending:
+            print(f"Charts: {len(pending)} rendered, {len(jobs) - len(pending)} unchanged", file=sys.stderr)
+
+        return written + [job.path for job in jobs]
+
+
+def add_chart_arguments(parser):
+    """Общие параметры вывода графиков для CLI"""
+    parser.add_argument('--chart-format', choices=CHART_FORMATS, default='png',
+                        help='Chart file format (vega writes JSON data and Vega-Lite specs without matplotlib)')
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI, help='Resolution of raster charts')
+    parser.add_argument('--preview-format', choices=CHART_FORMATS,
+                        help='Also write a *_preview chart in this format (e.g. svg for CI comments)')
+    parser.add_argument('--preview-dpi', type=int, default=DEFAULT_PREVIEW_DPI, help='Resolution of preview charts')
+    parser.add_argument('--chart-workers', type=int, help='Processes used to render charts in parallel')
+
+
+def renderer_from_args(args, batch: bool = False) -> ChartRenderer:
+    return ChartRenderer(args.chart_format, args.dpi, args.preview_format, args.preview_dpi,
+                         workers=args.chart_workers, batch=batch)
@@ -2,32 +2,62 @@
 """
 Скрипт для экспорта дизайн-токенов NutryFlow в различные форматы
 для интеграции с дизайнерскими инструментами (Figma, Sketch, Adobe XD)
+
+Токены собираются из всех Dart файлов под корнями поиска (по умолчанию
+lib/shared/design): файлы разбираются параллельно, неизмененные берутся из кэша.
+
+Режим `diff` сравнивает токены двух git-ревизий без checkout.
+
+Режим `dart` выполняет обратную генерацию: строит design_tokens.g.dart
+со `static const` полями, чтобы приложение не создавало новые объекты
+(TextStyle, List<BoxShadow>) при каждом обращении к токену.
 """
 
+import argparse
+import hashlib
 import json
 import os
 import re
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
-class DesignTokensExporter:
-    """Экспортер дизайн-токенов в различные форматы"""
-    
-    def __init__(self):
-        self.tokens = self._parse_dart_tokens()
-        self.output_dir = Path("design-tokens")
-        self.output_dir.mkdir(exist_ok=True)
+TOKENS_FILE = Path("lib/shared/design/tokens/design_tokens.dart")
+DART_CONST_FILE = Path("lib/shared/design/tokens/design_tokens.g.dart")
+DEFAULT_ROOTS = [Path("lib/shared/design")]
+PARSE_CACHE_FILE = Path(".dart_tool/design_tokens/parse_cache.json")
+GENERATED_SUFFIX = ".g.dart"
+
+# Минимальное число измененных файлов, с которого разбор идет в пуле процессов
+PARALLEL_THRESHOLD = 4
+
+# Геттер токена с литеральным значением (цвет, число, длительность, кривая, стиль)
+TOKEN_GETTER_PATTERN = re.compile(
+    r'\b(?:Color|double|Duration|Curve|LinearGradient|TextStyle|List<BoxShadow>) get \w+\s*=>\s*'
+    r'(?:const\s+)?(?:Color\(0x|Duration\(|Curves\.|LinearGradient\(|TextStyle\(|\[|-?[\d.]+\s*;)'
+)
+
+# Типы токенов, которые можно объявить как static const
+CONST_TYPES = {
+    "Color", "LinearGradient", "TextStyle", "List<BoxShadow>", "Duration",
+    "Curve", "FontWeight", "double", "int", "String",
+}
+
+# Типы, геттеры которых без `const` создают новый объект при каждом обращении
+ALLOCATING_TYPES = {"TextStyle", "List<BoxShadow>", "LinearGradient"}
+
+# Именованные цвета Flutter, которые встречаются в токенах (RGB в диапазоне 0..1)
+NAMED_COLORS = {
+    "Colors.black": (0.0, 0.0, 0.0),
+    "Colors.white": (1.0, 1.0, 1.0),
+}
+
+class DartTokenParser:
+    """Парсер дизайн-токенов из исходного текста Dart"""
     
-    def _parse_dart_tokens(self) -> Dict[str, Any]:
-        """Парсит токены из Dart файла"""
-        tokens_file = Path("lib/shared/design/tokens/design_tokens.dart")
-        
-        if not tokens_file.exists():
-            print(f"❌ Файл токенов не найден: {tokens_file}")
-            return {}
-        
-        content = tokens_file.read_text(encoding='utf-8')
-        
+    def parse_content(self, content: str) -> Dict[str, Any]:
+        """Строит модель токенов из исходного текста Dart файла"""
         # Извлекаем цвета
         colors = self._extract_colors(content)
         
@@ -55,14 +85,115 @@ class DesignTokensExporter:
             "borders": borders
         }
     
+    def parse_file(self, content: str, namespaced: bool) -> Dict[str, Any]:
+        """Парсит Dart файл: модель токенов и таблицу геттеров по классам
+        
+        Токены основного файла остаются без префикса, токены остальных файлов
+        получают пространство имен своего класса (например, `darkTheme.primary`).
+        """
+        if not namespaced:
+            tokens = self.parse_content(content)
+        else:
+            tokens = {}
+            for class_name, body in self._split_classes(content).items():
+                namespace = self.class_namespace(class_name)
+                for category, values in self.parse_content(body).items():
+                    bucket = tokens.setdefault(category, {})
+                    for name, value in values.items():
+                        bucket[f"{namespace}.{name}"] = value
+        
+        return {"tokens": tokens, "classes": self.parse_token_classes(content)}
+    
+    def is_token_file(self, content: str) -> bool:
+        """Проверяет, объявляет ли файл токены с литеральными значениями"""
+        return TOKEN_GETTER_PATTERN.search(content) is not None
+    
+    @staticmethod
+    def class_namespace(class_name: str) -> str:
+        """Строит пространство имен из имени класса: `_DarkThemeTokens` -> `darkTheme`"""
+        name = class_name.lstrip('_')
+        if name.endswith('Tokens') and name != 'Tokens':
+            name = name[:-len('Tokens')]
+        return name[:1].lower() + name[1:]
+    
+    def _split_classes(self, content: str) -> Dict[str, str]:
+        """Возвращает тела классов файла без комментариев: {класс: тело}"""
+        content = re.sub(r'//[^\n]*', '', content)
+        classes = {}
+        
+        for class_match in re.finditer(r'\bclass (\w+)[^{;]*\{', content):
+            body_start = class_match.end()
+            body_end = self._find_closing(content, body_start - 1)
+            classes[class_match.group(1)] = content[body_start:body_end]
+        
+        return classes
+    
+    def parse_token_classes(self, content: str) -> Dict[str, Dict[str, Dict[str, str]]]:
+        """Разбирает геттеры токенов по классам: {класс: {геттер: {type, expr}}}"""
+        classes = {}
+        
+        for class_name, body in self._split_classes(content).items():
+            getters = {}
+            for getter in re.finditer(r'([\w<>]+) get (\w+)\s*=>\s*', body):
+                expr_end = self._find_expression_end(body, getter.end())
+                expr = self._normalize_expression(body[getter.end():expr_end])
+                getters[getter.group(2)] = {"type": getter.group(1), "expr": expr}
+            
+            if getters:
+                classes[class_name] = getters
+        
+        return classes
+    
+    @staticmethod
+    def _find_closing(content: str, open_index: int) -> int:
+        """Возвращает индекс скобки, закрывающей скобку на позиции open_index"""
+        depth = 0
+        for index in range(open_index, len(content)):
+            char = content[index]
+            if char in '([{':
+                depth += 1
+            elif char in ')]}':
+                depth -= 1
+                if depth == 0:
+                    return index
+        return len(content)
+    
+    @staticmethod
+    def _find_expression_end(content: str, start: int) -> int:
+        """Возвращает индекс `;`, завершающей выражение геттера"""
+        depth = 0
+        quote = None
+        for index in range(start, len(content)):
+            char = content[index]
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in '\'"':
+                quote = char
+            elif char in '([{':
+                depth += 1
+            elif char in ')]}':
+                depth -= 1
+            elif char == ';' and depth == 0:
+                return index
+        return len(content)
+    
+    @staticmethod
+    def _normalize_expression(expr: str) -> str:
+        """Приводит выражение к однострочному виду без лишних пробелов и запятых"""
+        expr = re.sub(r'\s+', ' ', expr).strip()
+        expr = re.sub(r'([(\[]) ', r'\1', expr)
+        expr = re.sub(r',?\s*([)\]])', r'\1', expr)
+        return expr
+    
     def _extract_colors(self, content: str) -> Dict[str, Any]:
         """Извлекает цветовые токены"""
         colors = {}
         
         # Основные цвета
         color_patterns = [
-            (r'Color get (\w+) => const Color\(0x([A-F0-9]{8})\)', 'hex'),
-            (r'Color get (\w+) => const Color\(0x([A-F0-9]{6})\)', 'hex'),
+            (r'Color get (\w+)\s*=>\s*const Color\(0x([A-F0-9]{8})\)', 'hex'),
+            (r'Color get (\w+)\s*=>\s*const Color\(0x([A-F0-9]{6})\)', 'hex'),
         ]
         
         for pattern, format_type in color_patterns:
@@ -181,6 +312,231 @@ class DesignTokensExporter:
             borders[name] = float(value)
         
         return borders
+
+def _parse_token_file(path: str, namespaced: bool) -> Dict[str, Any]:
+    """Парсит один Dart файл (выполняется в пуле процессов)"""
+    content = Path(path).read_text(encoding='utf-8')
+    parser = DartTokenParser()
+    
+    if namespaced and not parser.is_token_file(content):
+        return {"is_token": False}
+    
+    return {"is_token": True, **parser.parse_file(content, namespaced)}
+
+
+class DesignTokensExporter:
+    """Экспортер дизайн-токенов в различные форматы"""
+    
+    def __init__(self, tokens_file: Path = TOKENS_FILE, output_dir: Path = Path("design-tokens"),
+                 roots: Optional[List[Path]] = None, jobs: Optional[int] = None,
+                 use_cache: bool = True):
+        self.tokens_file = Path(tokens_file)
+        self.roots = [Path(root) for root in (DEFAULT_ROOTS if roots is None else roots)]
+        self.jobs = jobs
+        self.use_cache = use_cache
+        self.parser = DartTokenParser()
+        self.source_files: List[str] = []
+        self.token_classes: Dict[str, Dict[str, Dict[str, str]]] = {}
+        self.class_info: Dict[str, Dict[str, str]] = {}
+        self.merge_report: Dict[str, List[Dict[str, Any]]] = {"duplicates": [], "conflicts": []}
+        self.tokens = self._parse_dart_tokens()
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(exist_ok=True)
+    
+    def _parse_dart_tokens(self) -> Dict[str, Any]:
+        """Парсит токены из всех Dart файлов с токенами под корнями поиска"""
+        tokens_file = self.tokens_file
+        
+        if not tokens_file.exists():
+            print(f"❌ Файл токенов не найден: {tokens_file}")
+            return {}
+        
+        parsed = self._parse_files(self.discover_dart_files())
+        models = [(path, model) for path, model in parsed.items() if model["is_token"]]
+        
+        tokens, self.token_classes, self.class_info, self.merge_report = self._merge_models(
+            models, self.tokens_file.as_posix()
+        )
+        self.source_files = [path for path, _ in models]
+        self._print_merge_report()
+        
+        return tokens
+    
+    def discover_dart_files(self) -> List[str]:
+        """Находит Dart файлы под корнями поиска; основной файл токенов идет первым"""
+        main_file = self.tokens_file.as_posix()
+        files = {main_file}
+        
+        for root in self.roots:
+            if root.is_file():
+                files.add(root.as_posix())
+                continue
+            for path in root.rglob('*.dart'):
+                if not path.name.endswith(GENERATED_SUFFIX):
+                    files.add(path.as_posix())
+        
+        return [main_file] + sorted(files - {main_file})
+    
+    def _parse_files(self, files: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Парсит файлы параллельно, переиспользуя кэш для неизмененных файлов"""
+        main_file = self.tokens_file.as_posix()
+        cache = self._load_cache() if self.use_cache else {}
+        results, stale, stats = {}, [], {}
+        
+        for path in files:
+            stat = os.stat(path)
+            stats[path] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            entry = cache.get(path)
+            if entry and all(entry.get(key) == value for key, value in stats[path].items()):
+                results[path] = entry
+            else:
+                stale.append(path)
+        
+        namespaced = [path != main_file for path in stale]
+        if len(stale) >= PARALLEL_THRESHOLD and self.jobs != 1:
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                parsed = list(executor.map(_parse_token_file, stale, namespaced))
+        else:
+            parsed = [_parse_token_file(path, flag) for path, flag in zip(stale, namespaced)]
+        
+        for path, model in zip(stale, parsed):
+            results[path] = {**stats[path], **model}
+        
+        if self.use_cache and stale:
+            self._save_cache(results)
+        
+        if stale:
+            print(f"🔍 Разобрано файлов: {len(stale)}, из кэша: {len(files) - len(stale)}")
+        
+        return {path: results[path] for path in files}
+    
+    @staticmethod
+    def _parser_version() -> str:
+        """Версия парсера: кэш сбрасывается при любом изменении скрипта"""
+        return hashlib.blake2b(Path(__file__).read_bytes(), digest_size=8).hexdigest()
+    
+    def _load_cache(self) -> Dict[str, Any]:
+        """Загружает кэш разбора файлов"""
+        try:
+            with open(PARSE_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        if cache.get("version") != self._parser_version():
+            return {}
+        return cache.get("files", {})
+    
+    def _save_cache(self, results: Dict[str, Dict[str, Any]]):
+        """Сохраняет кэш разбора файлов"""
+        PARSE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(PARSE_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({"version": self._parser_version(), "files": results}, f, ensure_ascii=False)
+    
+    @staticmethod
+    def _file_namespaces(paths: List[str]) -> Dict[str, str]:
+        """Пространства имен файлов: `button_tokens.dart` -> `buttonTokens`
+        
+        Если имена файлов совпадают, добавляются каталоги, пока имена не станут
+        различаться: `a/tokens.dart` -> `aTokens`, `b/tokens.dart` -> `bTokens`.
+        """
+        parts = {path: [part for part in Path(path).with_suffix('').parts] for path in paths}
+        depth = {path: 1 for path in paths}
+        while True:
+            names: Dict[str, List[str]] = {}
+            for path in paths:
+                names.setdefault('_'.join(parts[path][-depth[path]:]), []).append(path)
+            clashes = [path for same in names.values() if len(same) > 1 for path in same
+                       if depth[path] < len(parts[path])]
+            if not clashes:
+                break
+            for path in clashes:
+                depth[path] += 1
+        
+        namespaces = {}
+        for path in paths:
+            words = [word for word in '_'.join(parts[path][-depth[path]:]).split('_') if word]
+            namespaces[path] = words[0] + ''.join(word[:1].upper() + word[1:] for word in words[1:])
+        return namespaces
+    
+    @classmethod
+    def _merge_models(cls, models: List[Tuple[str, Dict[str, Any]]], main_file: str
+                      ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Dict[str, str]], Dict[str, Any]]:
+        """Объединяет модели файлов, отмечая дубликаты и конфликты
+        
+        Класс неосновного файла, пространство имен которого объявлено еще в
+        каком-то файле (например, два `_ColorTokens`), получает префикс файла:
+        `buttonTokens.color.primary`, ключ класса `buttonTokens._ColorTokens`.
+        Дубликат - токен с тем же именем и значением в нескольких файлах,
+        конфликт - то же имя с другим значением (побеждает первый файл).
+        Возвращает токены, геттеры по ключам классов, сведения о классах
+        (`file`, `name`, `namespace`) и отчет.
+        """
+        parser = DartTokenParser()
+        declared: Dict[str, set] = {}
+        for path, model in models:
+            for class_name in model["classes"]:
+                declared.setdefault(parser.class_namespace(class_name), set()).add(path)
+        qualified = {
+            (path, class_name)
+            for path, model in models if path != main_file
+            for class_name in model["classes"]
+            if len(declared[parser.class_namespace(class_name)]) > 1
+        }
+        file_namespaces = cls._file_namespaces(sorted({path for path, _ in qualified}))
+        
+        tokens: Dict[str, Dict[str, Any]] = {}
+        classes: Dict[str, Dict[str, Any]] = {}
+        class_info: Dict[str, Dict[str, str]] = {}
+        origins: Dict[Tuple[str, str], str] = {}
+        report: Dict[str, List[Dict[str, Any]]] = {"duplicates": [], "conflicts": []}
+        
+        for path, model in models:
+            prefixes = {
+                f"{parser.class_namespace(class_name)}.": f"{file_namespaces[path]}.{parser.class_namespace(class_name)}."
+                for class_name in model["classes"] if (path, class_name) in qualified
+            }
+            for category, values in model["tokens"].items():
+                bucket = tokens.setdefault(category, {})
+                for name, value in values.items():
+                    prefix = next((prefix for prefix in prefixes if name.startswith(prefix)), None)
+                    if prefix:
+                        name = prefixes[prefix] + name[len(prefix):]
+                    origin = origins.get((category, name))
+                    if origin is None:
+                        bucket[name] = value
+                        origins[(category, name)] = path
+                    elif bucket[name] == value:
+                        report["duplicates"].append(
+                            {"token": f"{category}.{name}", "files": [origin, path]}
+                        )
+                    else:
+                        report["conflicts"].append({
+                            "token": f"{category}.{name}",
+                            "files": [origin, path],
+                            "values": [bucket[name], value],
+                        })
+            
+            for class_name, getters in model["classes"].items():
+                namespace = parser.class_namespace(class_name)
+                key = class_name
+                if (path, class_name) in qualified:
+                    key = f"{file_namespaces[path]}.{class_name}"
+                    namespace = f"{file_namespaces[path]}.{namespace}"
+                if key in classes:
+                    report["conflicts"].append({"token": f"class {key}", "files": [class_info[key]["file"], path]})
+                    continue
+                classes[key] = getters
+                class_info[key] = {"file": path, "name": class_name, "namespace": namespace}
+        
+        return tokens, classes, class_info, report
+    
+    def _print_merge_report(self):
+        """Выводит предупреждения о дубликатах и конфликтах токенов"""
+        for duplicate in self.merge_report["duplicates"]:
+            print(f"⚠️ Дубликат токена {duplicate['token']}: {', '.join(duplicate['files'])}")
+        for conflict in self.merge_report["conflicts"]:
+            print(f"❌ Конфликт токена {conflict['token']}: {', '.join(conflict['files'])}")
     
     def export_json(self):
         """Экспортирует токены в JSON формат"""
@@ -200,16 +556,16 @@ class DesignTokensExporter:
         # Цвета
         for name, value in self.tokens.get("colors", {}).items():
             if isinstance(value, str) and value.startswith('#'):
-                css_content += f"  --color-{name}: {value};\n"
+                css_content += f"  --color-{self._css_name(name)}: {self._css_color(value)};\n"
         
         # Отступы
         for name, value in self.tokens.get("spacing", {}).items():
-            css_content += f"  --spacing-{name}: {value}px;\n"
+            css_content += f"  --spacing-{self._css_name(name)}: {value}px;\n"
         
         # Типографика
         for name, value in self.tokens.get("typography", {}).items():
             if "fontSize" in name:
-                css_content += f"  --font-size-{name.replace('_fontSize', '')}: {value}px;\n"
+                css_content += f"  --font-size-{self._css_name(name.replace('_fontSize', ''))}: {value}px;\n"
         
         css_content += "}\n"
         
@@ -218,6 +574,93 @@ class DesignTokensExporter:
         
         print(f"✅ Экспортировано в CSS: {output_file}")
     
+    def export_css_optimized(self):
+        """Экспортирует минифицированный CSS для продакшн-сборки веба
+        
+        В :root остаются все переменные из export_css с теми же именами и
+        значениями в кратчайшей эквивалентной записи; отбрасываются только
+        повторные одинаковые объявления. Блок prefers-color-scheme
+        переопределяет базовые `--color-*`, совпадающие со светлой темой,
+        значениями темной темы - и только там, где темы отличаются.
+        """
+        output_file = self.output_dir / "design-tokens.min.css"
+        
+        base, dark = self._collect_css_declarations()
+        
+        def block(declarations: Dict[str, str]) -> str:
+            return ";".join(f"{prop}:{value}" for prop, value in declarations.items())
+        
+        css_content = f":root{{{block(base)}}}"
+        if dark:
+            css_content += f"@media (prefers-color-scheme:dark){{:root{{{block(dark)}}}}}"
+        
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(css_content)
+        
+        full_size = (self.output_dir / "design-tokens.css")
+        saved = f" (полный CSS: {full_size.stat().st_size} байт)" if full_size.exists() else ""
+        print(f"✅ Экспортировано в минифицированный CSS: {output_file}, "
+              f"{len(css_content.encode('utf-8'))} байт{saved}")
+    
+    def _collect_css_declarations(self) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Собирает объявления :root (те же, что в export_css) и отличия темной темы"""
+        base: Dict[str, str] = {}
+        themes: Dict[str, Dict[str, str]] = {}
+        
+        # Как и в каскаде CSS, из повторных объявлений действует последнее
+        for name, value in self.tokens.get("colors", {}).items():
+            if not (isinstance(value, str) and value.startswith('#')):
+                continue
+            color = self._css_color(value, minify=True)
+            base[f"--color-{self._css_name(name)}"] = color
+            namespace, _, token = name.rpartition('.')
+            if namespace in ('lightTheme', 'darkTheme'):
+                themes.setdefault(namespace, {})[f"--color-{token}"] = color
+        
+        for name, value in self.tokens.get("spacing", {}).items():
+            base[f"--spacing-{self._css_name(name)}"] = self._css_dimension(value)
+        
+        for name, value in self.tokens.get("typography", {}).items():
+            if "fontSize" in name:
+                base[f"--font-size-{self._css_name(name.replace('_fontSize', ''))}"] = self._css_dimension(value)
+        
+        # Базовая переменная относится к светлой теме, только если равна ее значению
+        # (например, --color-error и lightTheme.error - разные цвета)
+        light = themes.get('lightTheme', {})
+        dark = {
+            prop: value for prop, value in themes.get('darkTheme', {}).items()
+            if prop in light and base.get(prop) == light[prop] != value
+        }
+        return base, dark
+    
+    @staticmethod
+    def _css_color(value: str, minify: bool = False) -> str:
+        """Переводит цвет Dart `#AARRGGBB` в CSS `#RRGGBB[AA]` (альфа переносится в конец)
+        
+        При minify - кратчайшая запись `#rgb[a]`/`#rrggbb[aa]` в нижнем регистре.
+        """
+        digits = value.lstrip('#')
+        if len(digits) == 8:
+            alpha, rgb = digits[:2], digits[2:]
+            digits = rgb if alpha.lower() == 'ff' else rgb + alpha
+        if minify:
+            digits = digits.lower()
+            if all(digits[i] == digits[i + 1] for i in range(0, len(digits), 2)):
+                digits = digits[::2]
+        return f"#{digits}"
+    
+    @staticmethod
+    def _css_dimension(value: float) -> str:
+        """Размер в пикселях без лишних нулей: 16.0 -> 16px (единица остается для calc())"""
+        if float(value).is_integer():
+            value = int(value)
+        return f"{value}px"
+    
+    @staticmethod
+    def _css_name(name: str) -> str:
+        """Переводит имя токена с пространством имен в имя CSS переменной"""
+        return name.replace('.', '-')
+    
     def export_figma(self):
         """Экспортирует токены в формат для Figma"""
         figma_tokens = {
@@ -309,6 +752,293 @@ class DesignTokensExporter:
         
         print(f"✅ Экспортировано для Adobe XD: {output_file}")
     
+    def export_dart_const(self, output_file: Path = DART_CONST_FILE):
+        """Генерирует part-файл Dart с токенами в виде static const полей
+        
+        Для классов основного файла, чьи геттеры создают объекты при каждом
+        обращении (TextStyle, List<BoxShadow>), дополнительно генерируется
+        реализация `_Const<Класс>View`, которая возвращает const-поля;
+        `DesignTokens` отдает приложению именно ее.
+        """
+        output_file = Path(output_file)
+        part_of = Path(os.path.relpath(self.tokens_file, output_file.parent)).as_posix()
+        main_file = self.tokens_file.as_posix()
+        lines = [
+            "// GENERATED CODE - DO NOT MODIFY BY HAND",
+            "// Сгенерировано: python scripts/export_design_tokens.py dart",
+            *(f"// Источник: {path}" for path in self.source_files),
+            "",
+            f"part of '{part_of}';",
+            "",
+        ]
+        
+        for class_name, getters in self.token_classes.items():
+            fields = self._build_const_fields(getters)
+            if not fields:
+                print(f"⚠️ Пропущен класс {class_name}: содержит неконстантные токены")
+                continue
+            
+            info = self.class_info[class_name]
+            const_class = self.const_class_name(class_name)
+            lines.append(f"/// Константные токены {info['name']} без аллокаций при обращении")
+            lines.append(f"abstract final class {const_class} {{")
+            for dart_type, name, expr in fields:
+                lines.append(self._format_const_field(dart_type, name, expr))
+            lines.append("}")
+            lines.append("")
+            
+            if info["file"] == main_file and self._allocates(getters):
+                lines.extend(self._const_view_class(class_name, const_class, getters))
+        
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines))
+        
+        print(f"✅ Сгенерированы const-токены Dart: {output_file}")
+    
+    @staticmethod
+    def const_class_name(class_key: str) -> str:
+        """Имя сгенерированного класса: `_ColorTokens` -> `ConstColorTokens`,
+        `buttonTokens._ColorTokens` -> `ConstButtonTokensColorTokens`"""
+        return "Const" + "".join(
+            part.lstrip('_')[:1].upper() + part.lstrip('_')[1:] for part in class_key.split('.')
+        )
+    
+    @staticmethod
+    def _allocates(getters: Dict[str, Dict[str, str]]) -> bool:
+        """Есть ли геттеры, создающие новый объект при каждом обращении"""
+        return any(
+            getter["type"] in ALLOCATING_TYPES and not getter["expr"].startswith("const ")
+            for getter in getters.values()
+        )
+    
+    @staticmethod
+    def _const_view_class(class_name: str, const_class: str, getters: Dict[str, Dict[str, str]]) -> List[str]:
+        """Реализация класса токенов, геттеры которой возвращают const-поля"""
+        view_class = f"_{const_class}View"
+        lines = [
+            f"/// {class_name} на const-полях {const_class}",
+            f"final class {view_class} implements {class_name} {{",
+            f"  const {view_class}();",
+        ]
+        for name, getter in getters.items():
+            declaration = f"  {getter['type']} get {name} =>"
+            value = f"{const_class}.{name};"
+            lines.append("")
+            lines.append("  @override")
+            if len(declaration) + 1 + len(value) <= 80:
+                lines.append(f"{declaration} {value}")
+            else:
+                lines.append(declaration)
+                lines.append(f"      {value}")
+        lines.append("}")
+        lines.append("")
+        return lines
+    
+    def _build_const_fields(self, getters: Dict[str, Dict[str, str]]) -> List[Tuple[str, str, str]]:
+        """Строит список (тип, имя, выражение) в порядке геттеров
+        
+        Каждый токен получает свой литерал; ссылку на другой токен поле
+        сохраняет, только если на него ссылается сам геттер (`buttonRadius => md`).
+        Одинаковые const-значения Dart и так канонизирует в один экземпляр.
+        """
+        fields = []
+        for name, getter in getters.items():
+            expr = None
+            if getter["type"] in CONST_TYPES and not name.startswith('_'):
+                expr = self._to_const_expression(getter["expr"])
+            if expr is None:
+                # Класс с динамическими геттерами (например, от текущей темы) не генерируем
+                return []
+            fields.append((getter["type"], name, expr))
+        
+        return fields
+    
+    def _to_const_expression(self, expr: str) -> Optional[str]:
+        """Переводит выражение геттера в константное выражение Dart (None, если нельзя)"""
+        expr = re.sub(r'\bconst\s+', '', expr)
+        
+        def replace_with_values(match):
+            base, argb, alpha = match.group(1), match.group(2), match.group(3)
+            if argb:
+                value = int(argb, 16)
+                rgb = tuple(((value >> shift) & 0xFF) / 255 for shift in (16, 8, 0))
+            elif base in NAMED_COLORS:
+                rgb = NAMED_COLORS[base]
+            else:
+                return match.group(0)
+            red, green, blue = (f"{channel:.6g}" for channel in rgb)
+            return f"Color.from(alpha: {alpha}, red: {red}, green: {green}, blue: {blue})"
+        
+        expr = re.sub(
+            r'(Colors\.\w+|Color\(0x([0-9A-Fa-f]{8})\))\.withValues\(alpha: ([\d.]+)\)',
+            replace_with_values,
+            expr,
+        )
+        
+        if re.search(r'\.with\w+\(|\b_theme\b|\bcontext\b|Theme\.of', expr):
+            return None
+        return expr
+    
+    def _format_const_field(self, dart_type: str, name: str, expr: str) -> str:
+        """Форматирует static const поле в стиле dart format"""
+        prefix = f"  static const {dart_type} {name} = "
+        if len(prefix) + len(expr) + 1 <= 80:
+            return f"{prefix}{expr};"
+        return f"{prefix}{self._format_dart_expression(expr, 2)};"
+    
+    def _format_dart_expression(self, expr: str, indent: int) -> str:
+        """Переносит аргументы длинного вызова или списка по одному на строку"""
+        open_index = next((i for i, char in enumerate(expr) if char in '(['), None)
+        if open_index is None or DartTokenParser._find_closing(expr, open_index) != len(expr) - 1:
+            return expr
+        
+        items = self._split_top_level(expr[open_index + 1:-1])
+        if not items:
+            return expr
+        
+        inner_indent = indent + 2
+        lines = [expr[:open_index + 1]]
+        for item in items:
+            if inner_indent + len(item) + 1 > 80:
+                item = self._format_dart_expression(item, inner_indent)
+            lines.append(f"{' ' * inner_indent}{item},")
+        lines.append(f"{' ' * indent}{expr[-1]}")
+        return "\n".join(lines)
+    
+    @staticmethod
+    def _split_top_level(content: str) -> List[str]:
+        """Делит список аргументов по запятым верхнего уровня"""
+        items, depth, quote, current = [], 0, None, ""
+        for char in content:
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in '\'"':
+                quote = char
+            elif char in '([{':
+                depth += 1
+            elif char in ')]}':
+                depth -= 1
+            elif char == ',' and depth == 0:
+                items.append(current.strip())
+                current = ""
+                continue
+            current += char
+        if current.strip():
+            items.append(current.strip())
+        return items
+    
+    def _git_show(self, revision: str, path: str) -> Optional[str]:
+        """Возвращает содержимое файла в git-ревизии или None"""
+        result = subprocess.run(
+            ["git", "show", f"{revision}:./{path}"],
+            capture_output=True, text=True, encoding='utf-8',
+        )
+        return result.stdout if result.returncode == 0 else None
+    
+    def load_revision(self, revision: str) -> Dict[str, Any]:
+        """Читает и парсит файлы токенов из git-ревизии без checkout"""
+        main_file = self.tokens_file.as_posix()
+        content = self._git_show(revision, main_file)
+        
+        if content is None:
+            print(f"⚠️ Файл токенов отсутствует в ревизии {revision}: {main_file}")
+            return {}
+        
+        models = [(main_file, self.parser.parse_file(content, namespaced=False))]
+        
+        listing = subprocess.run(
+            ["git", "ls-tree", "-r", "--name-only", revision, "--",
+             *(root.as_posix() for root in self.roots)],
+            capture_output=True, text=True, encoding='utf-8',
+        )
+        for path in sorted(listing.stdout.splitlines()):
+            if path == main_file or not path.endswith('.dart') or path.endswith(GENERATED_SUFFIX):
+                continue
+            content = self._git_show(revision, path)
+            if content is not None and self.parser.is_token_file(content):
+                models.append((path, self.parser.parse_file(content, namespaced=True)))
+        
+        tokens, _, _, _ = self._merge_models(models, main_file)
+        return tokens
+    
+    @staticmethod
+    def _flatten_tokens(tokens: Dict[str, Any]) -> Dict[str, Any]:
+        """Разворачивает модель в плоский словарь `категория.имя -> значение`"""
+        return {
+            f"{category}.{name}": value
+            for category, values in tokens.items()
+            for name, value in values.items()
+        }
+    
+    @staticmethod
+    def _hash_token(value: Any) -> str:
+        """Возвращает стабильный хеш значения токена"""
+        encoded = json.dumps(value, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+    
+    def diff_tokens(self, old_tokens: Dict[str, Any], new_tokens: Dict[str, Any]) -> Dict[str, Any]:
+        """Сравнивает две модели токенов за один проход по хешам"""
+        old_flat = self._flatten_tokens(old_tokens)
+        new_flat = self._flatten_tokens(new_tokens)
+        old_hashes = {name: self._hash_token(value) for name, value in old_flat.items()}
+        
+        added, changed = {}, {}
+        for name, value in new_flat.items():
+            old_hash = old_hashes.get(name)
+            if old_hash is None:
+                added[name] = value
+            elif old_hash != self._hash_token(value):
+                changed[name] = {"old": old_flat[name], "new": value}
+        
+        removed = {name: value for name, value in old_flat.items() if name not in new_flat}
+        
+        return {
+            "added": added,
+            "removed": removed,
+            "changed": changed,
+            "summary": {
+                "added": len(added),
+                "removed": len(removed),
+                "changed": len(changed),
+            },
+        }
+    
+    def diff_revisions(self, rev_a: str, rev_b: str) -> Dict[str, Any]:
+        """Сравнивает токены двух git-ревизий"""
+        diff = self.diff_tokens(self.load_revision(rev_a), self.load_revision(rev_b))
+        return {"from": rev_a, "to": rev_b, **diff}
+    
+    @staticmethod
+    def format_diff(diff: Dict[str, Any]) -> str:
+        """Форматирует результат сравнения для просмотра в консоли"""
+        summary = diff["summary"]
+        lines = [
+            f"📊 Изменения токенов {diff['from']}..{diff['to']}: "
+            f"+{summary['added']} -{summary['removed']} ~{summary['changed']}"
+        ]
+        
+        def dump(value):
+            return json.dumps(value, ensure_ascii=False)
+        
+        if diff["added"]:
+            lines.append("\n➕ Добавлены:")
+            lines.extend(f"  + {name}: {dump(value)}" for name, value in diff["added"].items())
+        if diff["removed"]:
+            lines.append("\n➖ Удалены:")
+            lines.extend(f"  - {name}: {dump(value)}" for name, value in diff["removed"].items())
+        if diff["changed"]:
+            lines.append("\n✏️ Изменены:")
+            lines.extend(
+                f"  ~ {name}: {dump(change['old'])} → {dump(change['new'])}"
+                for name, change in diff["changed"].items()
+            )
+        if not any(summary.values()):
+            lines.append("✅ Токены не изменились")
+        
+        return "\n".join(lines)
+    
     def generate_readme(self):
         """Генерирует README для дизайн-токенов"""
         readme_content = """# NutryFlow Design Tokens
@@ -319,6 +1049,7 @@ class DesignTokensExporter:
 
 - `design-tokens.json` - Полные токены в JSON формате
 - `design-tokens.css` - CSS переменные для веб-разработки
+- `design-tokens.min.css` - Минифицированные CSS переменные для продакшн-сборки (те же переменные, что в `design-tokens.css`; базовые цвета светлой темы переключаются на темную через `prefers-color-scheme`)
 - `figma-tokens.json` - Токены для импорта в Figma
 - `sketch-tokens.json` - Токены для импорта в Sketch
 - `adobe-xd-tokens.json` - Токены для импорта в Adobe XD
@@ -341,7 +1072,7 @@ class DesignTokensExporter:
 3. Создайте компоненты с токенами
 
 ### Веб-разработка
-1. Подключите `design-tokens.css`
+1. Подключите `design-tokens.css` (или `design-tokens.min.css` в продакшн-сборке)
 2. Используйте CSS переменные в стилях
 
 ## Обновление токенов
@@ -352,7 +1083,36 @@ class DesignTokensExporter:
 python scripts/export_design_tokens.py
 ```
 
-Это автоматически обновит все файлы на основе изменений в `lib/shared/design/tokens/design_tokens.dart`.
+Это автоматически обновит все файлы на основе изменений в `lib/shared/design/tokens/design_tokens.dart`
+и остальных файлах с токенами в `lib/shared/design/` (например, `theme_tokens.dart`).
+Токены из дополнительных файлов получают пространство имен своего класса
+(`lightTheme.primary`, `darkTheme.primary`). Корни поиска задаются флагом `--root`,
+неизмененные файлы берутся из кэша `.dart_tool/design_tokens/` (отключается флагом `--no-cache`).
+
+Для генерации константных токенов Flutter (`static const` поля без аллокаций при обращении):
+
+```bash
+python scripts/export_design_tokens.py dart
+```
+
+Результат сохраняется в `lib/shared/design/tokens/design_tokens.g.dart` (part-файл `design_tokens.dart`):
+`DesignTokens.typography` и `DesignTokens.shadows` отдают готовые const-экземпляры
+вместо новых `TextStyle` и `List<BoxShadow>` при каждом обращении. После изменения
+токенов файл нужно сгенерировать заново.
+
+Для сравнения токенов между двумя git-ревизиями (например, в PR):
+
+```bash
+python scripts/export_design_tokens.py diff origin/main HEAD
+python scripts/export_design_tokens.py diff origin/main HEAD --format json --output tokens-diff.json
+```
+
+Для поиска неиспользуемых токенов и экспорта без них:
+
+```bash
+python scripts/analyze_token_usage.py           # отчет в docs/token-usage-report.json
+python scripts/analyze_token_usage.py --prune   # экспорт без неиспользуемых токенов
+```
 
 ## Структура токенов
 
@@ -399,6 +1159,7 @@ python scripts/export_design_tokens.py
         
         self.export_json()
         self.export_css()
+        self.export_css_optimized()
         self.export_figma()
         self.export_sketch()
         self.export_adobe_xd()
@@ -408,8 +1169,52 @@ python scripts/export_design_tokens.py
 
 def main():
     """Главная функция"""
-    exporter = DesignTokensExporter()
-    exporter.export_all()
+    parser = argparse.ArgumentParser(description='Export NutryFlow design tokens')
+    parser.add_argument('--root', action='append', dest='roots',
+                        help='Directory or file to search for token files (repeatable, default: lib/shared/design)')
+    parser.add_argument('--no-discovery', action='store_true',
+                        help='Parse only lib/shared/design/tokens/design_tokens.dart')
+    parser.add_argument('--no-cache', action='store_true', help='Re-parse every file, ignoring the parse cache')
+    parser.add_argument('--jobs', type=int, help='Number of parser processes (default: CPU count)')
+    subparsers = parser.add_subparsers(dest='command')
+    
+    subparsers.add_parser('export', help='Export tokens to all design tool formats (default)')
+    
+    subparsers.add_parser('css', help='Export only the minified, deduplicated CSS for production web builds')
+    
+    dart_parser = subparsers.add_parser('dart', help='Generate const-backed Dart tokens')
+    dart_parser.add_argument('--output', default=str(DART_CONST_FILE), help='Generated Dart file path')
+    
+    diff_parser = subparsers.add_parser('diff', help='Compare tokens between two git revisions')
+    diff_parser.add_argument('rev_a', help='Base revision')
+    diff_parser.add_argument('rev_b', nargs='?', default='HEAD', help='Target revision (default: HEAD)')
+    diff_parser.add_argument('--format', choices=['text', 'json'], default='text', help='Output format')
+    diff_parser.add_argument('--output', help='Write the diff to a file instead of stdout')
+    
+    args = parser.parse_args()
+    
+    roots = [] if args.no_discovery else args.roots
+    exporter = DesignTokensExporter(roots=roots, jobs=args.jobs, use_cache=not args.no_cache)
+    
+    if args.command == 'dart':
+        exporter.export_dart_const(Path(args.output))
+    elif args.command == 'css':
+        exporter.export_css_optimized()
+    elif args.command == 'diff':
+        diff = exporter.diff_revisions(args.rev_a, args.rev_b)
+        if args.format == 'json':
+            output = json.dumps(diff, indent=2, ensure_ascii=False)
+        else:
+            output = exporter.format_diff(diff)
+        
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(output + "\n")
+            print(f"✅ Сравнение сохранено: {args.output}")
+        else:
+            print(output)
+    else:
+        exporter.export_all()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -5,108 +5,151 @@ Burndown Chart Generator
 """
 
 import json
-import requests
+import os
 import argparse
 import sys
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-import pandas as pd
-import numpy as np
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from burndown_engine import BurndownEngine, sprint_window
+from charts import ChartRenderer, add_chart_arguments, pyplot, renderer_from_args
+from github_client import BACKENDS, DEFAULT_CACHE_DIR, DEFAULT_TIMEOUT, GITHUB_API_URL, GitHubClient
+from issue_records import IssueRecord, extract_story_points, normalize_issues, parse_datetime
+from issue_store import DEFAULT_STORE_PATH, IssueStore
+
+def draw_burndown_chart(data: Dict, path: Path, dpi: int):
+    """Нарисовать burndown chart (вызывается в процессе рендеринга ChartRenderer)"""
+    plt = pyplot()
+    import matplotlib.dates as mdates
+    
+    # Создаем график
+    fig, ax = plt.subplots(figsize=(12, 8))
+    
+    # Идеальная линия
+    ideal_dates = [point[0] for point in data['ideal']]
+    ideal_points = [point[1] for point in data['ideal']]
+    ax.plot(ideal_dates, ideal_points, 'b--', linewidth=2, label='Ideal Burndown', alpha=0.7)
+    
+    # Фактическая линия
+    actual_dates = [point[0] for point in data['actual']]
+    actual_points = [point[1] for point in data['actual']]
+    ax.plot(actual_dates, actual_points, 'r-', linewidth=3, label='Actual Burndown', marker='o')
+    
+    # Настройка графика
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Remaining Story Points')
+    ax.set_title(f"Burndown Chart - Sprint (Total: {data['total_points']} points)")
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    
+    # Форматирование оси X
+    zone = ZoneInfo(data['timezone'])
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d', tz=zone))
+    ax.xaxis.set_major_locator(mdates.DayLocator(interval=2, tz=zone))
+    plt.xticks(rotation=45)
+    
+    # Добавляем аннотации
+    current_points = actual_points[-1] if actual_points else data['total_points']
+    ax.annotate(f'Current: {current_points:.1f} points', 
+               xy=(actual_dates[-1], current_points),
+               xytext=(10, 10), textcoords='offset points',
+               bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.7),
+               arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
+    
+    plt.tight_layout()
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+def burndown_chart_spec(data: Dict) -> Dict:
+    """Тот же burndown chart в виде спецификации Vega-Lite (даты - ISO 8601)"""
+    series = ['Ideal Burndown', 'Actual Burndown']
+    values = [
+        {'date': day, 'remaining': remaining, 'series': name}
+        for name, line in zip(series, (data['ideal'], data['actual']))
+        for day, remaining in line
+    ]
+    return {
+        'title': f"Burndown Chart - Sprint (Total: {data['total_points']} points)",
+        'width': 720,
+        'height': 420,
+        'data': {'values': values},
+        'mark': {'type': 'line', 'point': True, 'tooltip': True},
+        'encoding': {
+            'x': {'field': 'date', 'type': 'temporal', 'title': 'Date', 'axis': {'format': '%m/%d'}},
+            'y': {'field': 'remaining', 'type': 'quantitative', 'title': 'Remaining Story Points'},
+            'color': {'field': 'series', 'type': 'nominal', 'title': None,
+                      'scale': {'domain': series, 'range': ['#1f77b4', '#d62728']}},
+            'strokeDash': {'field': 'series', 'type': 'nominal', 'legend': None,
+                           'scale': {'domain': series, 'range': [[6, 4], [1, 0]]}},
+        },
+    }
 
 class BurndownChartGenerator:
-    def __init__(self, github_token: str, repo: str):
+    def __init__(self, github_token: str, repo: str, timeout: float = DEFAULT_TIMEOUT, use_cache: bool = True,
+                 store_path: Optional[Path] = DEFAULT_STORE_PATH, backend: str = 'rest', api_url: Optional[str] = None,
+                 timezone: str = 'UTC', sprint_end: Optional[date] = None, sprint_label: str = 'sprint-active',
+                 charts: Optional[ChartRenderer] = None, simulations: int = 100_000,
+                 forecast_history_days: int = 84, seed: Optional[int] = None):
         self.github_token = github_token
         self.repo = repo
-        self.headers = {
-            'Authorization': f'token {github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-        self.base_url = f'https://api.github.com/repos/{repo}'
+        self.charts = charts or ChartRenderer()
+        self.timezone = timezone
+        self.sprint_end = sprint_end
+        self.sprint_label = sprint_label
+        self.simulations = simulations
+        self.forecast_history_days = forecast_history_days
+        self.seed = seed
+        self.client = GitHubClient(github_token, repo, timeout=timeout,
+                                   cache_dir=DEFAULT_CACHE_DIR if use_cache else None, backend=backend,
+                                   api_url=api_url)
+        self.store = IssueStore(store_path) if store_path else None
     
-    def get_sprint_issues(self, sprint_label: str = 'sprint-active') -> List[Dict]:
+    def get_sprint_issues(self, sprint_label: Optional[str] = None) -> List[IssueRecord]:
         """Получить все задачи текущего спринта"""
-        url = f'{self.base_url}/issues'
-        params = {
-            'state': 'all',
-            'labels': sprint_label,
-            'per_page': 100
-        }
-        
-        response = requests.get(url, headers=self.headers, params=params)
-        if response.status_code == 200:
-            return response.json()
+        sprint_label = sprint_label or self.sprint_label
+        if not self.store:
+            issues = self.client.get_issues(
+                sprint_label, needs_body=lambda issue: extract_story_points(issue) == 0
+            )
         else:
-            print(f"Error fetching issues: {response.status_code}")
-            return []
-    
-    def extract_story_points(self, issue: Dict) -> int:
-        """Извлечь story points из задачи"""
-        for label in issue.get('labels', []):
-            if 'story-points' in label['name'].lower():
-                try:
-                    return int(label['name'].split('-')[-1])
-                except ValueError:
-                    continue
-        
-        body = issue.get('body', '')
-        if 'Story Points:' in body:
-            try:
-                points_line = [line for line in body.split('\n') if 'Story Points:' in line][0]
-                return int(points_line.split(':')[1].strip())
-            except (ValueError, IndexError):
-                pass
-        
-        return 0
+            self.store.sync(self.client, extract_story_points)
+            issues = self.store.get_issues(self.repo, sprint_label)
+        
+        return normalize_issues(issues)
     
     def calculate_ideal_burndown(self, total_points: int, sprint_duration: int) -> List[Tuple[datetime, float]]:
         """Рассчитать идеальную линию burndown"""
         ideal_line = []
-        start_date = datetime.now() - timedelta(days=sprint_duration)
+        start_date, _ = sprint_window(sprint_duration, self.timezone, self.sprint_end)
+        zone = ZoneInfo(self.timezone)
         
         for day in range(sprint_duration + 1):
-            date = start_date + timedelta(days=day)
+            date = datetime.combine(start_date + timedelta(days=day), time(), tzinfo=zone)
             remaining_points = total_points - (total_points / sprint_duration) * day
             ideal_line.append((date, max(0, remaining_points)))
         
         return ideal_line
     
-    def calculate_actual_burndown(self, sprint_data: List[Dict], sprint_duration: int = 14) -> List[Tuple[datetime, float]]:
-        """Рассчитать фактическую линию burndown"""
-        total_points = sum(self.extract_story_points(issue) for issue in sprint_data)
-        start_date = datetime.now() - timedelta(days=sprint_duration)
-        
-        actual_line = []
-        completed_points_by_date = {}
-        
-        # Группируем завершенные задачи по дате
-        for issue in sprint_data:
-            if issue['state'] == 'closed' and issue.get('closed_at'):
-                closed_date = datetime.fromisoformat(issue['closed_at'].replace('Z', '+00:00'))
-                points = self.extract_story_points(issue)
-                
-                # Округляем до дня
-                day_key = closed_date.replace(hour=0, minute=0, second=0, microsecond=0)
-                completed_points_by_date[day_key] = completed_points_by_date.get(day_key, 0) + points
-        
-        # Строим фактическую линию
-        cumulative_completed = 0
-        for day in range(sprint_duration + 1):
-            current_date = start_date + timedelta(days=day)
-            
-            # Добавляем точки, завершенные в этот день
-            if current_date in completed_points_by_date:
-                cumulative_completed += completed_points_by_date[current_date]
-            
-            remaining_points = total_points - cumulative_completed
-            actual_line.append((current_date, max(0, remaining_points)))
+    def calculate_actual_burndown(self, sprint_data: List[IssueRecord], sprint_duration: int = 14) -> List[Tuple[datetime, float]]:
+        """Рассчитать фактическую линию burndown
+        
+        Учитывает закрытия, переоткрытия и добавленный в ходе спринта объем
+        (история событий есть при загрузке через GraphQL).
+        """
+        start_date, end_date = sprint_window(sprint_duration, self.timezone, self.sprint_end)
+        engine = BurndownEngine(sprint_data, self.sprint_label)
         
-        return actual_line
+        return [
+            (point.day, point.remaining)
+            for point in engine.sweep(start_date, end_date, self.timezone)
+        ]
     
-    def create_burndown_chart(self, sprint_data: List[Dict], sprint_duration: int = 14):
-        """Создать burndown chart"""
-        total_points = sum(self.extract_story_points(issue) for issue in sprint_data)
+    def create_burndown_chart(self, sprint_data: List[IssueRecord], sprint_duration: int = 14,
+                              render: bool = True):
+        """Создать burndown chart (при render=False - только текстовый отчет)"""
+        total_points = sum(issue.points for issue in sprint_data)
         
         if total_points == 0:
             print("No story points found in sprint data")
@@ -116,52 +159,71 @@ class BurndownChartGenerator:
         ideal_line = self.calculate_ideal_burndown(total_points, sprint_duration)
         actual_line = self.calculate_actual_burndown(sprint_data, sprint_duration)
         
-        # Создаем график
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        # Идеальная линия
-        ideal_dates = [point[0] for point in ideal_line]
-        ideal_points = [point[1] for point in ideal_line]
-        ax.plot(ideal_dates, ideal_points, 'b--', linewidth=2, label='Ideal Burndown', alpha=0.7)
-        
-        # Фактическая линия
-        actual_dates = [point[0] for point in actual_line]
-        actual_points = [point[1] for point in actual_line]
-        ax.plot(actual_dates, actual_points, 'r-', linewidth=3, label='Actual Burndown', marker='o')
-        
-        # Настройка графика
-        ax.set_xlabel('Date')
-        ax.set_ylabel('Remaining Story Points')
-        ax.set_title(f'Burndown Chart - Sprint (Total: {total_points} points)')
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-        
-        # Форматирование оси X
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-        ax.xaxis.set_major_locator(mdates.DayLocator(interval=2))
-        plt.xticks(rotation=45)
-        
-        # Добавляем аннотации
-        current_points = actual_points[-1] if actual_points else total_points
-        ax.annotate(f'Current: {current_points:.1f} points', 
-                   xy=(actual_dates[-1], current_points),
-                   xytext=(10, 10), textcoords='offset points',
-                   bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.7),
-                   arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
-        
-        plt.tight_layout()
-        plt.savefig('burndown_chart.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        if render:
+            self.render_burndown_chart(ideal_line, actual_line, total_points)
+        
+        current_points = actual_line[-1][1] if actual_line else total_points
+        forecast = self.forecast_completion(sprint_data, current_points, sprint_duration)
         
         # Создаем текстовый отчет
-        self.create_burndown_report(ideal_line, actual_line, total_points)
+        self.create_burndown_report(ideal_line, actual_line, total_points, forecast)
+    
+    def forecast_completion(self, sprint_data: List[IssueRecord], remaining: float, sprint_duration: int = 14):
+        """Прогноз завершения методом Монте-Карло по дневной пропускной способности
+        
+        История - задачи, закрытые за последние `forecast_history_days` полных дней
+        (из хранилища задач, то есть и в прошлых спринтах); без хранилища -
+        прошедшие дни текущего спринта.
+        """
+        from sprint_forecast import daily_throughput, forecast_completion
+        
+        today = datetime.now(ZoneInfo(self.timezone)).date()
+        start_date, end_date = sprint_window(sprint_duration, self.timezone, self.sprint_end)
+        history_end = today - timedelta(days=1)
+        
+        if self.store:
+            history_start = history_end - timedelta(days=self.forecast_history_days - 1)
+            # Запас в сутки: границы дней команды не совпадают с UTC
+            since = f"{history_start - timedelta(days=1)}T00:00:00Z"
+            closed = [(parse_datetime(closed_at), points)
+                      for closed_at, points in self.store.closed_points(self.repo, since)]
+        else:
+            history_start = start_date
+            closed = [(issue.closed_at, issue.points) for issue in sprint_data if issue.is_closed and issue.closed_at]
+        
+        throughput = daily_throughput(closed, history_start, history_end, self.timezone)
+        return forecast_completion(remaining, throughput, today, end_date, self.simulations, seed=self.seed)
+    
+    def render_burndown_chart(self, ideal_line: List[Tuple[datetime, float]],
+                              actual_line: List[Tuple[datetime, float]], total_points: int) -> Path:
+        """Нарисовать burndown chart (burndown_chart.png)"""
+        data = {
+            'ideal': ideal_line,
+            'actual': actual_line,
+            'total_points': total_points,
+            'timezone': self.timezone,
+        }
+        return self.charts.add('Burndown chart', draw_burndown_chart, data, 'burndown_chart',
+                               spec=burndown_chart_spec)
     
     def create_burndown_report(self, ideal_line: List[Tuple[datetime, float]], 
                               actual_line: List[Tuple[datetime, float]], 
-                              total_points: int):
-        """Создать текстовый отчет по burndown"""
+                              total_points: int, forecast=None):
+        """Создать текстовый отчет по burndown
+        
+        Фактическая линия обрывается на сегодняшнем дне, поэтому остаток
+        сравнивается с идеальной линией в тот же день, а не в конце спринта.
+        """
         current_points = actual_line[-1][1] if actual_line else total_points
-        ideal_current = ideal_line[-1][1] if ideal_line else 0
+        ideal_by_day = {day.date(): points for day, points in ideal_line}
+        if not ideal_line:
+            ideal_current = 0
+        elif actual_line and actual_line[-1][0].date() in ideal_by_day:
+            ideal_current = ideal_by_day[actual_line[-1][0].date()]
+        elif actual_line and actual_line[-1][0] > ideal_line[-1][0]:
+            ideal_current = ideal_line[-1][1]
+        else:
+            ideal_current = ideal_line[0][1]
         
         variance = current_points - ideal_current
         
@@ -186,13 +248,27 @@ class BurndownChartGenerator:
             report += "- ✅ **On Schedule**: Exactly on track\n"
         
         # Прогноз завершения
-        if actual_line:
-            remaining_days = len([p for p in actual_line if p[1] > 0])
+        if forecast:
             report += f"\n### Completion Forecast\n"
-            report += f"- **Estimated Days Remaining**: {remaining_days}\n"
+            report += (f"- **Throughput History**: {forecast.history_days} days, "
+                       f"{forecast.mean_throughput:.1f} points/day on average\n")
+            
+            if not forecast.mean_throughput and forecast.remaining > 0:
+                report += "- **Forecast**: Not enough throughput history for a forecast\n"
+            else:
+                for percentile, days in forecast.percentiles.items():
+                    completion = forecast.completion_date(percentile)
+                    if completion is None:
+                        report += f"- **P{percentile} Completion**: not within a year at the current throughput\n"
+                    else:
+                        report += f"- **P{percentile} Completion**: {completion.strftime('%Y-%m-%d')} ({days} days)\n"
+                report += (f"- **Probability of Finishing by {forecast.deadline.strftime('%Y-%m-%d')}**: "
+                           f"{forecast.on_time_probability:.0%} ({forecast.simulations:,} simulations)\n")
             
-            if variance > 0:
+            if forecast.on_time_probability < 0.5:
                 report += f"- **Risk Level**: High - Consider scope reduction or additional resources\n"
+            elif forecast.on_time_probability < 0.85:
+                report += f"- **Risk Level**: Medium - Monitor progress and unblock issues daily\n"
             elif variance < -5:
                 report += f"- **Opportunity**: Consider adding more stories to the sprint\n"
             else:
@@ -225,25 +301,48 @@ class BurndownChartGenerator:
         with open('burndown_report.md', 'w', encoding='utf-8') as f:
             f.write(report)
         
-        print("Burndown chart saved: burndown_chart.png")
         print("Burndown report saved: burndown_report.md")
 
 def main():
     parser = argparse.ArgumentParser(description='Generate Burndown Chart')
     parser.add_argument('--github-token', required=True, help='GitHub token')
     parser.add_argument('--repo', required=True, help='Repository name (owner/repo)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='GitHub API request timeout in seconds')
+    parser.add_argument('--no-cache', action='store_true', help='Do not use the on-disk GitHub response cache')
+    parser.add_argument('--store', default=str(DEFAULT_STORE_PATH), help='SQLite issue store path')
+    parser.add_argument('--no-store', action='store_true', help='Fetch sprint issues directly instead of syncing the store')
+    parser.add_argument('--backend', choices=BACKENDS, default='rest',
+                        help='GitHub API used to fetch issues (graphql also fetches close/reopen/label history)')
+    parser.add_argument('--api-url', default=os.environ.get('GITHUB_API_URL', GITHUB_API_URL),
+                        help='GitHub API base URL (GitHub Enterprise or a local github_fixture_server.py)')
     parser.add_argument('--sprint-duration', type=int, default=14, help='Sprint duration in days')
+    parser.add_argument('--sprint-end', type=date.fromisoformat, help='Last sprint day, YYYY-MM-DD (default: today)')
+    parser.add_argument('--timezone', default='UTC', help='Team time zone for day boundaries, e.g. Europe/Moscow')
+    parser.add_argument('--no-charts', action='store_true', help='Write the text report only (matplotlib is not loaded)')
+    parser.add_argument('--simulations', type=int, default=100_000,
+                        help='Monte Carlo simulations for the completion forecast')
+    parser.add_argument('--forecast-history', type=int, default=84,
+                        help='Days of closed-issue throughput history used by the forecast')
+    parser.add_argument('--seed', type=int, help='Random seed for a reproducible forecast')
+    add_chart_arguments(parser)
     
     args = parser.parse_args()
     
-    generator = BurndownChartGenerator(args.github_token, args.repo)
+    generator = BurndownChartGenerator(args.github_token, args.repo, timeout=args.timeout,
+                                      use_cache=not args.no_cache,
+                                      store_path=None if args.no_store else args.store,
+                                      backend=args.backend, api_url=args.api_url, timezone=args.timezone,
+                                      sprint_end=args.sprint_end, charts=renderer_from_args(args),
+                                      simulations=args.simulations, forecast_history_days=args.forecast_history,
+                                      seed=args.seed)
     sprint_data = generator.get_sprint_issues()
+    generator.client.print_cache_stats()
     
     if not sprint_data:
         print("No sprint data found. Please ensure issues are labeled with 'sprint-active'")
         sys.exit(1)
     
-    generator.create_burndown_chart(sprint_data, args.sprint_duration)
+    generator.create_burndown_chart(sprint_data, args.sprint_duration, render=not args.no_charts)
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
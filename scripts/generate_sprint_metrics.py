@@ -5,180 +5,224 @@ Sprint Metrics Generator
 """
 
 import json
-import requests
+import os
 import argparse
 import sys
 from datetime import datetime, timedelta
-from typing import Dict, List
-import matplotlib.pyplot as plt
+from pathlib import Path
+from typing import Dict, List, Optional
 import pandas as pd
 
+from charts import ChartRenderer, add_chart_arguments, pyplot, renderer_from_args
+from github_client import BACKENDS, DEFAULT_CACHE_DIR, DEFAULT_TIMEOUT, GITHUB_API_URL, GitHubClient
+from issue_records import IssueRecord, extract_story_points, normalize_issues
+from issue_store import DEFAULT_STORE_PATH, IssueStore
+from quantile_sketch import TDigest, distribution_summary, flow_sketches
+from sprint_frame import SprintFrame, partition_by_label
+from sprint_history import DEFAULT_HISTORY_PATH, SprintHistory, sprint_name, sprint_name_from_label, sprint_name_from_labels
+
+def draw_metrics_chart(data: Dict, path: Path, dpi: int):
+    """Нарисовать визуализацию метрик (вызывается в процессе рендеринга ChartRenderer)"""
+    plt = pyplot()
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
+    
+    # 1. Распределение по статусам
+    status_dist = data['status']
+    if status_dist:
+        ax1.pie(status_dist.values(), labels=status_dist.keys(), autopct='%1.1f%%')
+        ax1.set_title('Issue Status Distribution')
+    
+    # 2. Распределение по приоритетам
+    priority_dist = data['priority']
+    if priority_dist:
+        ax2.bar(priority_dist.keys(), priority_dist.values())
+        ax2.set_title('Issue Priority Distribution')
+        ax2.set_ylabel('Number of Issues')
+    
+    # 3. Распределение по эпикам
+    epic_dist = data['epic']
+    if epic_dist:
+        ax3.barh(list(epic_dist.keys()), list(epic_dist.values()))
+        ax3.set_title('Issue Epic Distribution')
+        ax3.set_xlabel('Number of Issues')
+    
+    # 4. Story Points по статусам
+    points_by_status = data['points_by_status']
+    if points_by_status:
+        ax4.bar(points_by_status.keys(), points_by_status.values())
+        ax4.set_title('Story Points by Status')
+        ax4.set_ylabel('Story Points')
+    
+    plt.tight_layout()
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+def metrics_chart_spec(data: Dict) -> Dict:
+    """Та же визуализация метрик в виде спецификации Vega-Lite"""
+    def values(distribution: Dict[str, int], field: str) -> List[Dict]:
+        return [{field: key, 'value': count} for key, count in distribution.items()]
+    
+    def bar(name: str, title: str, axis_title: str, horizontal: bool = False) -> Dict:
+        category = {'field': name, 'type': 'nominal', 'sort': None, 'title': None}
+        amount = {'field': 'value', 'type': 'quantitative', 'title': axis_title}
+        return {
+            'title': title,
+            'data': {'name': name},
+            'mark': 'bar',
+            'encoding': {'x': amount, 'y': category} if horizontal else {'x': category, 'y': amount},
+        }
+    
+    return {
+        'title': 'Sprint Metrics',
+        'datasets': {
+            'status': values(data['status'], 'status'),
+            'priority': values(data['priority'], 'priority'),
+            'epic': values(data['epic'], 'epic'),
+            'points_by_status': values(data['points_by_status'], 'points_by_status'),
+        },
+        'vconcat': [
+            {'hconcat': [
+                {
+                    'title': 'Issue Status Distribution',
+                    'data': {'name': 'status'},
+                    'mark': {'type': 'arc', 'tooltip': True},
+                    'encoding': {
+                        'theta': {'field': 'value', 'type': 'quantitative'},
+                        'color': {'field': 'status', 'type': 'nominal'},
+                    },
+                },
+                bar('priority', 'Issue Priority Distribution', 'Number of Issues'),
+            ]},
+            {'hconcat': [
+                bar('epic', 'Issue Epic Distribution', 'Number of Issues', horizontal=True),
+                bar('points_by_status', 'Story Points by Status', 'Story Points'),
+            ]},
+        ],
+    }
+
 class SprintMetricsGenerator:
-    def __init__(self, github_token: str, repo: str):
+    def __init__(self, github_token: str, repo: str, timeout: float = DEFAULT_TIMEOUT, use_cache: bool = True,
+                 store_path: Optional[Path] = DEFAULT_STORE_PATH, backend: str = 'rest', api_url: Optional[str] = None,
+                 history_path: Optional[Path] = DEFAULT_HISTORY_PATH, sprint_name: Optional[str] = None,
+                 charts: Optional[ChartRenderer] = None):
         self.github_token = github_token
         self.repo = repo
-        self.headers = {
-            'Authorization': f'token {github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-        self.base_url = f'https://api.github.com/repos/{repo}'
+        self.charts = charts or ChartRenderer()
+        self.client = GitHubClient(github_token, repo, timeout=timeout,
+                                   cache_dir=DEFAULT_CACHE_DIR if use_cache else None, backend=backend,
+                                   api_url=api_url)
+        self.store = IssueStore(store_path) if store_path else None
+        self.history = SprintHistory(history_path) if history_path else None
+        # Без явного имени спринт определяется по меткам `sprint-N` его задач
+        self.sprint_name = sprint_name
     
-    def get_sprint_issues(self, sprint_label: str = 'sprint-active') -> List[Dict]:
+    def get_sprint_issues(self, sprint_label: str = 'sprint-active') -> List[IssueRecord]:
         """Получить все задачи текущего спринта"""
-        url = f'{self.base_url}/issues'
-        params = {
-            'state': 'all',
-            'labels': sprint_label,
-            'per_page': 100
-        }
-        
-        response = requests.get(url, headers=self.headers, params=params)
-        if response.status_code == 200:
-            return response.json()
+        if not self.store:
+            issues = self.client.get_issues(
+                sprint_label, needs_body=lambda issue: extract_story_points(issue) == 0
+            )
         else:
-            print(f"Error fetching issues: {response.status_code}")
-            return []
-    
-    def extract_story_points(self, issue: Dict) -> int:
-        """Извлечь story points из задачи"""
-        for label in issue.get('labels', []):
-            if 'story-points' in label['name'].lower():
-                try:
-                    return int(label['name'].split('-')[-1])
-                except ValueError:
-                    continue
+            self.store.sync(self.client, extract_story_points)
+            issues = self.store.get_issues(self.repo, sprint_label)
         
-        body = issue.get('body', '')
-        if 'Story Points:' in body:
-            try:
-                points_line = [line for line in body.split('\n') if 'Story Points:' in line][0]
-                return int(points_line.split(':')[1].strip())
-            except (ValueError, IndexError):
-                pass
+        return normalize_issues(issues)
+    
+    def get_all_sprint_issues(self, prefix: str = 'sprint-') -> List[IssueRecord]:
+        """Получить задачи всех спринтов (меток `sprint-*`) за один проход"""
+        if not self.store:
+            # API не фильтрует метки по префиксу: забираем все задачи одной пагинацией
+            issues = [
+                issue for issue in self.client.get_issues(
+                    needs_body=lambda issue: extract_story_points(issue) == 0
+                )
+                if any(label['name'].startswith(prefix) for label in issue.get('labels', []))
+            ]
+        else:
+            self.store.sync(self.client, extract_story_points)
+            issues = self.store.get_issues_with_label_prefix(self.repo, prefix)
         
-        return 0
+        return normalize_issues(issues)
     
-    def calculate_velocity(self, sprint_data: List[Dict]) -> int:
+    def calculate_velocity(self, frame: SprintFrame) -> int:
         """Рассчитать velocity команды"""
-        completed_points = 0
-        for issue in sprint_data:
-            if issue['state'] == 'closed':
-                points = self.extract_story_points(issue)
-                completed_points += points
-        return completed_points
+        return int(frame.velocity())
     
-    def calculate_defect_rate(self, sprint_data: List[Dict]) -> float:
+    def calculate_defect_rate(self, frame: SprintFrame) -> float:
         """Рассчитать defect rate"""
-        total_issues = len(sprint_data)
-        defect_issues = len([issue for issue in sprint_data if 'bug' in [label['name'] for label in issue.get('labels', [])]])
-        return (defect_issues / total_issues * 100) if total_issues > 0 else 0
+        return frame.defect_rate()
     
-    def calculate_cycle_time(self, sprint_data: List[Dict]) -> float:
+    def calculate_cycle_time(self, frame: SprintFrame) -> float:
         """Рассчитать средний cycle time"""
-        cycle_times = []
-        for issue in sprint_data:
-            if issue['state'] == 'closed' and issue.get('closed_at'):
-                created_at = datetime.fromisoformat(issue['created_at'].replace('Z', '+00:00'))
-                closed_at = datetime.fromisoformat(issue['closed_at'].replace('Z', '+00:00'))
-                cycle_time = (closed_at - created_at).days
-                cycle_times.append(cycle_time)
-        
-        return sum(cycle_times) / len(cycle_times) if cycle_times else 0
+        return frame.cycle_time()
+    
+    def calculate_flow_times(self, sprint_data: List[IssueRecord]) -> Dict[str, TDigest]:
+        """Рассчитать распределения cycle time и lead time (часы, t-digest)"""
+        return flow_sketches(sprint_data)
     
-    def calculate_sprint_goal_achievement(self, sprint_data: List[Dict]) -> float:
+    def calculate_sprint_goal_achievement(self, frame: SprintFrame) -> float:
         """Рассчитать достижение целей спринта"""
-        total_points = sum(self.extract_story_points(issue) for issue in sprint_data)
-        completed_points = sum(
-            self.extract_story_points(issue) for issue in sprint_data 
-            if issue['state'] == 'closed'
-        )
-        return (completed_points / total_points * 100) if total_points > 0 else 0
+        return frame.goal_achievement()
     
-    def generate_status_distribution(self, sprint_data: List[Dict]) -> Dict[str, int]:
+    def generate_status_distribution(self, frame: SprintFrame) -> Dict[str, int]:
         """Генерировать распределение по статусам"""
-        status_counts = {}
-        for issue in sprint_data:
-            status = issue['state']
-            status_counts[status] = status_counts.get(status, 0) + 1
-        return status_counts
+        return frame.status_distribution()
     
-    def generate_priority_distribution(self, sprint_data: List[Dict]) -> Dict[str, int]:
+    def generate_priority_distribution(self, frame: SprintFrame) -> Dict[str, int]:
         """Генерировать распределение по приоритетам"""
-        priority_counts = {}
-        for issue in sprint_data:
-            for label in issue.get('labels', []):
-                if 'priority' in label['name'].lower():
-                    priority = label['name'].split('-')[-1]
-                    priority_counts[priority] = priority_counts.get(priority, 0) + 1
-                    break
-        return priority_counts
+        return frame.priority_distribution()
     
-    def generate_epic_distribution(self, sprint_data: List[Dict]) -> Dict[str, int]:
+    def generate_epic_distribution(self, frame: SprintFrame) -> Dict[str, int]:
         """Генерировать распределение по эпикам"""
-        epic_counts = {}
-        for issue in sprint_data:
-            for label in issue.get('labels', []):
-                if 'epic' in label['name'].lower():
-                    epic = label['name'].split('-')[-1]
-                    epic_counts[epic] = epic_counts.get(epic, 0) + 1
-                    break
-        return epic_counts
+        return frame.epic_distribution()
     
-    def create_metrics_visualization(self, sprint_data: List[Dict]):
+    def create_metrics_visualization(self, frame: SprintFrame) -> Path:
         """Создать визуализацию метрик"""
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
-        
-        # 1. Распределение по статусам
-        status_dist = self.generate_status_distribution(sprint_data)
-        if status_dist:
-            ax1.pie(status_dist.values(), labels=status_dist.keys(), autopct='%1.1f%%')
-            ax1.set_title('Issue Status Distribution')
-        
-        # 2. Распределение по приоритетам
-        priority_dist = self.generate_priority_distribution(sprint_data)
-        if priority_dist:
-            ax2.bar(priority_dist.keys(), priority_dist.values())
-            ax2.set_title('Issue Priority Distribution')
-            ax2.set_ylabel('Number of Issues')
-        
-        # 3. Распределение по эпикам
-        epic_dist = self.generate_epic_distribution(sprint_data)
-        if epic_dist:
-            ax3.barh(list(epic_dist.keys()), list(epic_dist.values()))
-            ax3.set_title('Issue Epic Distribution')
-            ax3.set_xlabel('Number of Issues')
-        
-        # 4. Story Points по статусам
-        points_by_status = {}
-        for issue in sprint_data:
-            status = issue['state']
-            points = self.extract_story_points(issue)
-            points_by_status[status] = points_by_status.get(status, 0) + points
-        
-        if points_by_status:
-            ax4.bar(points_by_status.keys(), points_by_status.values())
-            ax4.set_title('Story Points by Status')
-            ax4.set_ylabel('Story Points')
-        
-        plt.tight_layout()
-        plt.savefig('sprint_metrics.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        data = {
+            'status': self.generate_status_distribution(frame),
+            'priority': self.generate_priority_distribution(frame),
+            'epic': self.generate_epic_distribution(frame),
+            'points_by_status': frame.points_by_status(),
+        }
+        return self.charts.add('Visualization', draw_metrics_chart, data, 'sprint_metrics', spec=metrics_chart_spec)
     
-    def generate_metrics_report(self) -> str:
-        """Генерировать полный отчет по метрикам"""
-        sprint_data = self.get_sprint_issues()
+    def generate_metrics_report(self, render: bool = True,
+                                sprint_data: Optional[List[IssueRecord]] = None) -> str:
+        """Генерировать полный отчет по метрикам (при render=False - без графика)"""
+        if sprint_data is None:
+            sprint_data = self.get_sprint_issues()
+        frame = SprintFrame(sprint_data)
+        current_sprint = self.sprint_name or sprint_name_from_labels(record.labels for record in sprint_data)
         
-        velocity = self.calculate_velocity(sprint_data)
-        defect_rate = self.calculate_defect_rate(sprint_data)
-        cycle_time = self.calculate_cycle_time(sprint_data)
-        goal_achievement = self.calculate_sprint_goal_achievement(sprint_data)
+        velocity = self.calculate_velocity(frame)
+        defect_rate = self.calculate_defect_rate(frame)
+        cycle_time = self.calculate_cycle_time(frame)
+        flow_times = self.calculate_flow_times(sprint_data)
+        goal_achievement = self.calculate_sprint_goal_achievement(frame)
         
-        status_dist = self.generate_status_distribution(sprint_data)
-        priority_dist = self.generate_priority_distribution(sprint_data)
-        epic_dist = self.generate_epic_distribution(sprint_data)
+        status_dist = self.generate_status_distribution(frame)
+        priority_dist = self.generate_priority_distribution(frame)
+        epic_dist = self.generate_epic_distribution(frame)
         
         # Создаем визуализацию
-        self.create_metrics_visualization(sprint_data)
+        if render:
+            self.create_metrics_visualization(frame)
+        
+        # Сохраняем снимок метрик спринта для трендов
+        if self.history and not current_sprint:
+            print("Warning: sprint issues have no sprint-N label; pass --sprint to record the history snapshot",
+                  file=sys.stderr)
+        if self.history and current_sprint:
+            self.history.record(self.repo, current_sprint, {
+                'velocity': velocity,
+                'total_points': frame.total_points(),
+                'goal_achievement': goal_achievement,
+                'defect_rate': defect_rate,
+                'cycle_time': cycle_time,
+                'issues': len(frame),
+                'completed_issues': status_dist.get('closed', 0),
+            })
+            self.history.record_sketches(self.repo, current_sprint, flow_times)
         
         report = f"""# Sprint Metrics Report - {datetime.now().strftime('%Y-%m-%d')}
 
@@ -187,11 +231,12 @@ class SprintMetricsGenerator:
 ### Velocity & Progress
 - **Team Velocity**: {velocity} story points
 - **Sprint Goal Achievement**: {goal_achievement:.1f}%
-- **Average Cycle Time**: {cycle_time:.1f} days
+- **Cycle Time**: {distribution_summary(flow_times['cycle_time'])}
+- **Lead Time**: {distribution_summary(flow_times['lead_time'])}
 
 ### Quality Metrics
 - **Defect Rate**: {defect_rate:.1f}%
-- **Total Issues**: {len(sprint_data)}
+- **Total Issues**: {len(frame)}
 - **Completed Issues**: {status_dist.get('closed', 0)}
 
 ## 📋 Issue Distribution
@@ -200,7 +245,7 @@ class SprintMetricsGenerator:
 """
         
         for status, count in status_dist.items():
-            percentage = (count / len(sprint_data)) * 100 if sprint_data else 0
+            percentage = (count / len(frame)) * 100 if len(frame) else 0
             report += f"- **{status.title()}**: {count} issues ({percentage:.1f}%)\n"
         
         if priority_dist:
@@ -214,11 +259,11 @@ class SprintMetricsGenerator:
                 report += f"- **{epic.title()}**: {count} issues\n"
         
         # Блокеры
-        blockers = [issue for issue in sprint_data if 'blocker' in [label['name'] for label in issue.get('labels', [])]]
-        if blockers:
+        blockers = frame.blockers()
+        if not blockers.empty:
             report += "\n## 🚧 Blockers\n"
-            for blocker in blockers:
-                report += f"- {blocker['title']} (#{blocker['number']})\n"
+            for blocker in blockers.itertuples():
+                report += f"- {blocker.title} (#{blocker.number})\n"
         
         # Рекомендации
         report += "\n## 💡 Recommendations\n"
@@ -236,28 +281,136 @@ class SprintMetricsGenerator:
             report += "- 📈 Low velocity detected. Consider team capacity and story sizing.\n"
         
         report += "\n## 📈 Trends\n"
-        report += "- Velocity trend: [TO BE TRACKED OVER TIME]\n"
-        report += "- Quality trend: [TO BE TRACKED OVER TIME]\n"
+        if self.history:
+            report += self.history.trend_report(self.repo, current_sprint)
+            report += "### Cycle Time and Lead Time by Quarter and Year\n\n"
+            report += self.history.distribution_report(self.repo)
+        else:
+            report += "- Velocity trend: [TO BE TRACKED OVER TIME]\n"
+            report += "- Quality trend: [TO BE TRACKED OVER TIME]\n"
         report += "- Team happiness: [TO BE TRACKED OVER TIME]\n"
         
         return report
+    
+    def generate_comparison_report(self, prefix: str = 'sprint-') -> str:
+        """Генерировать сравнительный отчет по всем спринтам"""
+        records, sprints = partition_by_label(self.get_all_sprint_issues(prefix), prefix)
+        frame = SprintFrame(records, sprints)
+        
+        # Все метрики считаются сразу для всех спринтов группировкой по колонке sprint
+        metrics = pd.DataFrame({
+            'velocity': frame.velocity(by='sprint'),
+            'total_points': frame.total_points(by='sprint'),
+            'goal_achievement': frame.goal_achievement(by='sprint'),
+            'defect_rate': frame.defect_rate(by='sprint'),
+            'cycle_time': frame.cycle_time(by='sprint'),
+            'issues': frame.issues.groupby('sprint', observed=True).size(),
+            'completed_issues': frame.issues['is_closed'].groupby(frame.issues['sprint'], observed=True).sum(),
+        }).fillna(0)
+        status_table = frame.distribution_table('state')
+        priority_table = frame.distribution_table('priority')
+        epic_table = frame.distribution_table('epic')
+        
+        # Распределения cycle/lead time по спринтам - дайджестами, один проход по задачам спринта
+        records_by_sprint: Dict[str, List[IssueRecord]] = {}
+        for record, sprint in zip(records, sprints):
+            records_by_sprint.setdefault(sprint, []).append(record)
+        flow_times = {sprint: self.calculate_flow_times(records_by_sprint[sprint]) for sprint in metrics.index}
+        
+        if self.history:
+            for sprint, row in metrics.iterrows():
+                # В истории спринты называются `sprint-N` независимо от префикса меток
+                name = sprint_name_from_label(str(sprint), prefix)
+                if not name:
+                    continue
+                self.history.record(self.repo, name, row.to_dict())
+                ended_at = max((record.closed_at for record in records_by_sprint[sprint] if record.closed_at),
+                               default=None)
+                self.history.record_sketches(self.repo, name, flow_times[sprint], ended_at)
+        
+        report = f"""# Sprint Comparison Report - {datetime.now().strftime('%Y-%m-%d')}
+
+## 📊 Key Performance Indicators
+
+| Sprint | Velocity | Total Points | Goal | Defect Rate | Cycle Time | Issues | Completed |
+|--------|----------|--------------|------|-------------|------------|--------|-----------|
+"""
+        
+        for sprint, row in metrics.iterrows():
+            report += (f"| {sprint} | {row['velocity']:.0f} | {row['total_points']:.0f} | "
+                       f"{row['goal_achievement']:.1f}% | {row['defect_rate']:.1f}% | {row['cycle_time']:.1f} days | "
+                       f"{row['issues']:.0f} | {row['completed_issues']:.0f} |\n")
+        
+        if not metrics.empty:
+            report += "\n### Averages\n"
+            report += f"- **Velocity**: {metrics['velocity'].mean():.1f} story points\n"
+            report += f"- **Sprint Goal Achievement**: {metrics['goal_achievement'].mean():.1f}%\n"
+            report += f"- **Defect Rate**: {metrics['defect_rate'].mean():.1f}%\n"
+            report += f"- **Cycle Time**: {metrics['cycle_time'].mean():.1f} days\n"
+        
+        if flow_times:
+            report += "\n### Cycle Time and Lead Time\n\n"
+            report += "| Sprint | Cycle Time | Lead Time |\n"
+            report += "|--------|------------|-----------|\n"
+            for sprint, sketches in flow_times.items():
+                report += (f"| {sprint} | {distribution_summary(sketches['cycle_time'])} | "
+                           f"{distribution_summary(sketches['lead_time'])} |\n")
+        
+        report += "\n## 📋 Issue Distribution\n"
+        for title, table in (('Status', status_table), ('Priority', priority_table), ('Epic', epic_table)):
+            if table.empty:
+                continue
+            columns = [str(column) for column in table.columns]
+            report += f"\n### {title} Distribution\n\n"
+            report += "| Sprint | " + " | ".join(column.title() for column in columns) + " |\n"
+            report += "|--------|" + "|".join("-" * (len(column) + 2) for column in columns) + "|\n"
+            for sprint, counts in table.iterrows():
+                report += f"| {sprint} | " + " | ".join(str(int(count)) for count in counts) + " |\n"
+        
+        return report
 
 def main():
     parser = argparse.ArgumentParser(description='Generate Sprint Metrics')
     parser.add_argument('--github-token', required=True, help='GitHub token')
     parser.add_argument('--repo', required=True, help='Repository name (owner/repo)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='GitHub API request timeout in seconds')
+    parser.add_argument('--no-cache', action='store_true', help='Do not use the on-disk GitHub response cache')
+    parser.add_argument('--store', default=str(DEFAULT_STORE_PATH), help='SQLite issue store path')
+    parser.add_argument('--no-store', action='store_true', help='Fetch sprint issues directly instead of syncing the store')
+    parser.add_argument('--backend', choices=BACKENDS, default='rest',
+                        help='GitHub API used to fetch issues (graphql also fetches close/reopen/label history)')
+    parser.add_argument('--api-url', default=os.environ.get('GITHUB_API_URL', GITHUB_API_URL),
+                        help='GitHub API base URL (GitHub Enterprise or a local github_fixture_server.py)')
     parser.add_argument('--output', default='sprint_metrics_report.md', help='Output file path')
+    parser.add_argument('--sprint', type=sprint_name,
+                        help='Sprint number for the history snapshot, e.g. 12 or sprint-12 '
+                             '(default: the sprint-N label of the sprint issues)')
+    parser.add_argument('--history', default=str(DEFAULT_HISTORY_PATH), help='Sprint history database path')
+    parser.add_argument('--no-history', action='store_true', help='Do not record or report sprint trends')
+    parser.add_argument('--all-sprints', action='store_true',
+                        help='Compare every sprint-* labelled sprint in one report instead of sprint-active')
+    parser.add_argument('--sprint-prefix', default='sprint-', help='Label prefix of sprints for --all-sprints')
+    parser.add_argument('--no-charts', action='store_true', help='Write the text report only (matplotlib is not loaded)')
+    add_chart_arguments(parser)
     
     args = parser.parse_args()
     
-    generator = SprintMetricsGenerator(args.github_token, args.repo)
-    report = generator.generate_metrics_report()
+    generator = SprintMetricsGenerator(args.github_token, args.repo, timeout=args.timeout,
+                                      use_cache=not args.no_cache,
+                                      store_path=None if args.no_store else args.store,
+                                      backend=args.backend, api_url=args.api_url,
+                                      history_path=None if args.no_history else args.history,
+                                      sprint_name=args.sprint, charts=renderer_from_args(args))
+    if args.all_sprints:
+        report = generator.generate_comparison_report(args.sprint_prefix)
+    else:
+        report = generator.generate_metrics_report(render=not args.no_charts)
+    generator.client.print_cache_stats()
     
     with open(args.output, 'w', encoding='utf-8') as f:
         f.write(report)
     
     print(f"Metrics report generated: {args.output}")
-    print("Visualization saved: sprint_metrics.png")
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
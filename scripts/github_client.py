@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+GitHub API Client
+Общий клиент GitHub REST API для скриптов аналитики спринта NutryFlow
+
+Один пул соединений `requests.Session` с keep-alive на все запросы скрипта,
+таймауты и повтор с экспоненциальной задержкой при ответах 5xx и
+срабатывании secondary rate limit. Неидемпотентные запросы (POST webhook)
+повторяются, только если соединение не было установлено или сервер явно
+попросил повторить (429, Retry-After), чтобы отчет не ушел дважды. GET-ответы кэшируются на диске вместе с
+ETag/Last-Modified: повторный запрос условный, и ответ 304 (не расходующий
+лимит запросов) отдается из кэша.
+
+Бэкенд `graphql` получает задачи через GitHub GraphQL API v4 только с нужными
+полями и историей закрытий/переоткрытий/меток за один запрос на 100 задач.
+История длиннее 100 событий догружается по курсору `timelineItems.pageInfo`.
+"""
+
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import NewConnectionError
+
+GITHUB_API_URL = 'https://api.github.com'
+
+PER_PAGE = 100
+MAX_PAGE_WORKERS = 8
+
+DEFAULT_TIMEOUT = 30.0
+MAX_RETRIES = 4
+BACKOFF_FACTOR = 1.0
+# Дольше ждать сброса лимита в cron-задаче не имеет смысла
+MAX_RATE_LIMIT_WAIT = 120.0
+
+RETRY_STATUSES = {500, 502, 503, 504}
+# Методы, повтор которых не меняет результат; остальные повторяются только если запрос не дошел
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+BACKENDS = ('rest', 'graphql')
+GRAPHQL_PAGE_SIZE = 100
+
+TIMELINE_ARGUMENTS = (
+    'first: %d, itemTypes: [CLOSED_EVENT, REOPENED_EVENT, LABELED_EVENT, UNLABELED_EVENT]' % GRAPHQL_PAGE_SIZE
+)
+TIMELINE_FIELDS = """
+          pageInfo { hasNextPage endCursor }
+          nodes {
+            __typename
+            ... on ClosedEvent { createdAt }
+            ... on ReopenedEvent { createdAt }
+            ... on LabeledEvent { createdAt label { name } }
+            ... on UnlabeledEvent { createdAt label { name } }
+          }"""
+
+ISSUES_QUERY = """
+query($owner: String!, $name: String!, $cursor: String, $states: [IssueState!], $labels: [String!], $since: DateTime) {
+  repository(owner: $owner, name: $name) {
+    issues(first: %d, after: $cursor, states: $states, filterBy: {labels: $labels, since: $since},
+           orderBy: {field: UPDATED_AT, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        databaseId number title state createdAt closedAt updatedAt
+        labels(first: 50) { nodes { name } }
+        timelineItems(%s) {%s
+        }
+      }
+    }
+  }
+}
+""" % (GRAPHQL_PAGE_SIZE, TIMELINE_ARGUMENTS, TIMELINE_FIELDS)
+
+TIMELINE_EVENTS = {
+    'ClosedEvent': 'closed',
+    'ReopenedEvent': 'reopened',
+    'LabeledEvent': 'labeled',
+    'UnlabeledEvent': 'unlabeled',
+}
+
+DEFAULT_CACHE_DIR = Path('.cache/github')
+# Заголовки, сохраняемые вместе с телом ответа (Link нужен для пагинации)
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Link', 'Content-Type')
+
+
+def _page_number(url: str) -> int:
+    """Номер страницы из ссылки заголовка Link"""
+    return int(parse_qs(urlparse(url).query).get('page', ['1'])[0])
+
+
+class GitHubClient:
+    def __init__(self, github_token: str, repo: str, timeout: float = DEFAULT_TIMEOUT,
+                 max_retries: int = MAX_RETRIES, max_workers: int = MAX_PAGE_WORKERS,
+                 cache_dir: Optional[Path] = DEFAULT_CACHE_DIR, backend: str = 'rest',
+                 api_url: Optional[str] = None, session: Optional[requests.Session] = None,
+                 request_limit: Optional[threading.Semaphore] = None):
+        self.repo = repo
+        self.backend = backend
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_workers = max_workers
+        # Другой адрес API: GitHub Enterprise или локальная подмена (github_fixture_server.py)
+        self.api_url = (api_url or GITHUB_API_URL).rstrip('/')
+        self.base_url = f'{self.api_url}/repos/{repo}'
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_stats = {'hits': 0, 'misses': 0, 'stored': 0}
+        self._stats_lock = threading.Lock()
+        # Общий для нескольких клиентов лимит одновременных запросов (портфель репозиториев)
+        self.request_limit = request_limit
+        self.session = session or self.create_session(github_token, max(max_workers, 10))
+
+    @staticmethod
+    def create_session(github_token: str, pool_size: int) -> requests.Session:
+        """Сессия с пулом keep-alive соединений к каждому хосту; ее можно разделить между клиентами"""
+        session = requests.Session()
+        session.headers.update({
+            'Authorization': f'token {github_token}',
+            'Accept': 'application/vnd.github.v3+json'
+        })
+        # Пул не меньше числа потоков загрузки страниц, иначе соединения не переиспользуются
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    @staticmethod
+    def _not_sent(error: requests.RequestException) -> bool:
+        """Запрос точно не дошел до сервера: соединение не удалось установить"""
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+
+    def _retry_delay(self, response: Optional[requests.Response], attempt: int,
+                     idempotent: bool = True) -> Optional[float]:
+        """Задержка перед повтором или None, если ответ повторять не нужно
+
+        Для неидемпотентного запроса ответ 5xx не гарантирует, что сервер его
+        не обработал, поэтому повторяются только явные 429 и Retry-After.
+        """
+        backoff = BACKOFF_FACTOR * (2 ** attempt) + random.uniform(0, BACKOFF_FACTOR)
+
+        if response is None:
+            return backoff
+
+        if not idempotent:
+            if 'Retry-After' in response.headers:
+                return float(response.headers['Retry-After'])
+            return backoff if response.status_code == 429 else None
+
+        if response.status_code in RETRY_STATUSES:
+            return backoff
+
+        if response.status_code not in (403, 429):
+            return None
+
+        if 'Retry-After' in response.headers:
+            return float(response.headers['Retry-After'])
+
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            wait = float(response.headers.get('X-RateLimit-Reset', 0)) - time.time()
+            return max(wait, 1.0) if wait <= MAX_RATE_LIMIT_WAIT else None
+
+        if response.status_code == 429 or 'secondary rate limit' in response.text.lower():
+            return backoff
+
+        return None
+
+    def request(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs) -> requests.Response:
+        """Выполнить запрос с таймаутом и повтором при временных ошибках
+
+        `idempotent` по умолчанию определяется методом; POST, который только
+        читает данные (запрос GraphQL), можно пометить безопасным для повтора.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.request_limit or nullcontext():
+                    response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries or not (idempotent or self._not_sent(e)):
+                    raise
+                response = None
+                error = str(e)
+            else:
+                error = response.status_code
+
+            delay = self._retry_delay(response, attempt, idempotent)
+            if delay is None or attempt == self.max_retries:
+                return response
+
+            print(f"Retrying {method} {url} in {delay:.1f}s ({error})", file=sys.stderr)
+            time.sleep(delay)
+
+        return response
+
+    def _cache_path(self, url: str, params: Optional[Dict]) -> Path:
+        """Файл кэша для URL с параметрами (токен в ключ не входит - кэш локальный)"""
+        full_url = requests.Request('GET', url, params=params).prepare().url
+        return self.cache_dir / f"{hashlib.sha256(full_url.encode()).hexdigest()}.json"
+
+    def _count(self, stat: str):
+        with self._stats_lock:
+            self.cache_stats[stat] += 1
+
+    def get(self, url: str, params: Optional[Dict] = None) -> requests.Response:
+        """GET с условным запросом к кэшу: при 304 возвращается сохраненный ответ"""
+        if not self.cache_dir:
+            return self.request('GET', url, params=params)
+
+        cache_file = self._cache_path(url, params)
+        cached = None
+        headers = {}
+        if cache_file.exists():
+            try:
+                cached = json.loads(cache_file.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                cached = None
+        if cached:
+            if cached['headers'].get('ETag'):
+                headers['If-None-Match'] = cached['headers']['ETag']
+            if cached['headers'].get('Last-Modified'):
+                headers['If-Modified-Since'] = cached['headers']['Last-Modified']
+
+        response = self.request('GET', url, params=params, headers=headers)
+
+        if response.status_code == 304 and cached:
+            self._count('hits')
+            restored = requests.Response()
+            restored.status_code = 200
+            restored.url = response.url
+            restored.headers = CaseInsensitiveDict(cached['headers'])
+            restored._content = cached['body'].encode('utf-8')
+            restored.encoding = 'utf-8'
+            return restored
+
+        self._count('misses')
+        if response.status_code == 200 and ('ETag' in response.headers or 'Last-Modified' in response.headers):
+            entry = {
+                'url': response.url,
+                'headers': {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers},
+                'body': response.text,
+            }
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Пишем через временный файл: страницы сохраняются из нескольких потоков
+            tmp_file = cache_file.with_suffix(f'.{threading.get_ident()}.tmp')
+            tmp_file.write_text(json.dumps(entry), encoding='utf-8')
+            os.replace(tmp_file, cache_file)
+            self._count('stored')
+
+        return response
+
+    def print_cache_stats(self):
+        """Вывести статистику HTTP-кэша в stderr (stdout скриптов разбирается workflow)"""
+        stats = self.cache_stats
+        total = stats['hits'] + stats['misses']
+        if not self.cache_dir or not total:
+            return
+        print(f"GitHub cache: {stats['hits']} hits (304), {stats['misses']} misses, "
+              f"{stats['stored']} stored, hit rate {stats['hits'] / total * 100:.0f}%", file=sys.stderr)
+
+    def post_webhook(self, webhook_url: str, payload: Dict) -> requests.Response:
+        """Отправить JSON во внешний webhook (без токена GitHub в заголовках)"""
+        return self.request('POST', webhook_url, json=payload, headers={'Authorization': None})
+
+    def get_paginated(self, url: str, params: Dict) -> List[Dict]:
+        """Получить все страницы списка
+
+        Первая страница запрашивается отдельно: из ее заголовка `Link: rel="last"`
+        становится известно число страниц, остальные загружаются параллельно
+        ограниченным пулом и склеиваются по порядку. Если GitHub не вернул
+        `rel="last"`, идем по `rel="next"` последовательно.
+        """
+        params = {**params, 'per_page': PER_PAGE}
+
+        response = self.get(url, params)
+        if response.status_code != 200:
+            print(f"Error fetching {url}: {response.status_code}")
+            return []
+
+        pages = [response.json()]
+
+        if 'last' in response.links:
+            last_page = _page_number(response.links['last']['url'])
+
+            def fetch_page(page: int):
+                return self.get(url, {**params, 'page': page})
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for page, page_response in zip(range(2, last_page + 1),
+                                               executor.map(fetch_page, range(2, last_page + 1))):
+                    if page_response.status_code != 200:
+                        print(f"Error fetching {url} (page {page}): {page_response.status_code}")
+                        return []
+                    pages.append(page_response.json())
+        else:
+            while 'next' in response.links:
+                response = self.get(response.links['next']['url'])
+                if response.status_code != 200:
+                    print(f"Error fetching {url}: {response.status_code}")
+                    return []
+                pages.append(response.json())
+
+        # Задача, созданная во время загрузки, сдвигает страницы - убираем повторы
+        items = []
+        seen = set()
+        for page in pages:
+            for item in page:
+                item_id = item.get('id')
+                if item_id is not None:
+                    if item_id in seen:
+                        continue
+                    seen.add(item_id)
+                items.append(item)
+
+        return items
+
+    def graphql(self, query: str, variables: Optional[Dict] = None) -> Optional[Dict]:
+        """Выполнить запрос GraphQL; при ошибке вывести ее и вернуть None
+
+        Запросы (query) только читают данные и повторяются как GET, мутации - нет.
+        """
+        response = self.request('POST', f'{self.api_url}/graphql',
+                                idempotent=not query.lstrip().startswith('mutation'),
+                                json={'query': query, 'variables': variables or {}})
+        if response.status_code != 200:
+            print(f"Error running GraphQL query: {response.status_code}")
+            return None
+
+        result = response.json()
+        if result.get('errors'):
+            print(f"GraphQL errors: {'; '.join(error.get('message', '') for error in result['errors'])}")
+            return None
+        return result['data']
+
+    @staticmethod
+    def _timeline_from_graphql(nodes: List[Dict]) -> List[Dict]:
+        """События `timelineItems` в формате REST API timeline"""
+        timeline = []
+        for event in nodes:
+            if event.get('__typename') not in TIMELINE_EVENTS:
+                continue
+            item = {'event': TIMELINE_EVENTS[event['__typename']], 'created_at': event['createdAt']}
+            if event.get('label'):
+                item['label'] = {'name': event['label']['name']}
+            timeline.append(item)
+        return timeline
+
+    @classmethod
+    def _issue_from_graphql(cls, node: Dict) -> Dict:
+        """Перевести узел GraphQL в формат ответа REST API (+ история событий в `timeline`)"""
+        return {
+            'id': node['databaseId'],
+            'number': node['number'],
+            'title': node['title'],
+            'state': node['state'].lower(),
+            'labels': [{'name': label['name']} for label in node['labels']['nodes']],
+            'created_at': node['createdAt'],
+            'closed_at': node['closedAt'],
+            'updated_at': node['updatedAt'],
+            'timeline': cls._timeline_from_graphql(node['timelineItems']['nodes']),
+        }
+
+    def _fetch_timelines(self, pending: Dict[int, Tuple[Dict, str]]):
+        """Догрузить историю задач, у которых она не поместилась в первую страницу
+
+        `pending` - {номер задачи: (задача, курсор)}; за запрос берется следующая
+        страница сразу для GRAPHQL_PAGE_SIZE задач через алиасы.
+        """
+        owner, name = self.repo.split('/', 1)
+
+        while pending:
+            batch = list(pending.items())[:GRAPHQL_PAGE_SIZE]
+            fields = ' '.join(
+                f'i{number}: issue(number: {number}) {{ timelineItems({TIMELINE_ARGUMENTS}, '
+                f'after: {json.dumps(cursor)}) {{{TIMELINE_FIELDS} }} }}'
+                for number, (_, cursor) in batch
+            )
+            data = self.graphql(
+                f'query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {fields} }} }}',
+                {'owner': owner, 'name': name},
+            )
+            if data is None:
+                print(f"Warning: timeline history is incomplete for {len(pending)} issues", file=sys.stderr)
+                return
+
+            for number, (issue, _) in batch:
+                node = data['repository'].get(f'i{number}')
+                if not node:
+                    del pending[number]
+                    continue
+                connection = node['timelineItems']
+                issue['timeline'].extend(self._timeline_from_graphql(connection['nodes']))
+                if connection['pageInfo']['hasNextPage']:
+                    pending[number] = (issue, connection['pageInfo']['endCursor'])
+                else:
+                    del pending[number]
+
+    def _fetch_bodies(self, issues: List[Dict]):
+        """Догрузить описания задач пачками по GRAPHQL_PAGE_SIZE алиасов в запросе"""
+        owner, name = self.repo.split('/', 1)
+
+        for start in range(0, len(issues), GRAPHQL_PAGE_SIZE):
+            batch = issues[start:start + GRAPHQL_PAGE_SIZE]
+            fields = ' '.join(f'i{issue["number"]}: issue(number: {issue["number"]}) {{ body }}' for issue in batch)
+            data = self.graphql(
+                f'query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {fields} }} }}',
+                {'owner': owner, 'name': name},
+            )
+            if data is None:
+                return
+            for issue in batch:
+                node = data['repository'].get(f'i{issue["number"]}')
+                issue['body'] = node['body'] if node else None
+
+    def get_issues_graphql(self, labels: Optional[str] = None, state: str = 'all', since: Optional[str] = None,
+                           needs_body: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+        """Задачи через GraphQL с курсорной пагинацией
+
+        Описание (`body`) запрашивается отдельно и только для задач, для которых
+        `needs_body` вернул True, например когда story points нет в метках.
+        Pull requests, в отличие от REST /issues, в выборку не попадают.
+        """
+        owner, name = self.repo.split('/', 1)
+        variables = {
+            'owner': owner,
+            'name': name,
+            'states': None if state == 'all' else [state.upper()],
+            'labels': [labels] if labels else None,
+            'since': since,
+            'cursor': None,
+        }
+
+        issues = []
+        # Задачи, история которых не поместилась в первую страницу timelineItems
+        long_timelines: Dict[int, Tuple[Dict, str]] = {}
+        while True:
+            data = self.graphql(ISSUES_QUERY, variables)
+            if data is None:
+                return []
+
+            connection = data['repository']['issues']
+            for node in connection['nodes']:
+                issue = self._issue_from_graphql(node)
+                issues.append(issue)
+                timeline_page = node['timelineItems']['pageInfo']
+                if timeline_page['hasNextPage']:
+                    long_timelines[issue['number']] = (issue, timeline_page['endCursor'])
+            if not connection['pageInfo']['hasNextPage']:
+                break
+            variables['cursor'] = connection['pageInfo']['endCursor']
+
+        if long_timelines:
+            self._fetch_timelines(long_timelines)
+
+        if needs_body:
+            self._fetch_bodies([issue for issue in issues if needs_body(issue)])
+
+        return issues
+
+    def get_issues(self, labels: Optional[str] = None, state: str = 'all', since: Optional[str] = None,
+                   needs_body: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+        """Все задачи репозитория с указанными метками, обновленные после `since`
+
+        REST возвращает задачи вместе с PR и полными описаниями; GraphQL -
+        только задачи, с историей событий и описаниями по требованию `needs_body`.
+        """
+        if self.backend == 'graphql':
+            return self.get_issues_graphql(labels, state, since, needs_body)
+
+        params = {'state': state}
+        if labels:
+            params['labels'] = labels
+        if since:
+            params.update({'since': since, 'sort': 'updated', 'direction': 'asc'})
+        return self.get_paginated(f'{self.base_url}/issues', params)
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+GitHub Fixture Server
+Локальная подмена GitHub API для офлайн-тестов и бенчмарков скриптов аналитики NutryFlow
+
+- serve: HTTP-сервер с эндпоинтами, которые используют скрипты:
+  /repos/{owner}/{repo}/issues (фильтры state/labels/since, пагинация с Link,
+  ETag/Last-Modified и ответ 304, заголовки X-RateLimit-*), /graphql (запрос
+  задач и описаний из github_client.py), /rate_limit и прием webhook (любой
+  другой POST; полученные сообщения отдаются по GET /webhooks). Задачи берутся
+  из записанных JSON-фикстур (--fixtures) или генерируются синтетически в
+  любом объеме (--issues) отдельно для каждого репозитория
+- record: записывает задачи реального репозитория в JSON-фикстуру
+
+Скрипты направляются на сервер параметром --api-url:
+
+    python scripts/github_fixture_server.py serve --issues 5000 &
+    python scripts/generate_sprint_metrics.py --github-token test --repo nutryflow/app \\
+        --api-url http://127.0.0.1:8765
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_ISSUES = 500
+
+DEFAULT_PER_PAGE = 30
+MAX_PER_PAGE = 100
+GRAPHQL_PAGE_SIZE = 100
+
+RATE_LIMIT = 5000
+RATE_LIMIT_WINDOW = 3600
+
+SPRINT_DAYS = 14
+STORY_POINTS = [1, 2, 3, 5, 8, 13]
+PRIORITIES = ['high', 'medium', 'low']
+EPICS = ['auth', 'nutrition', 'dashboard', 'profile', 'analytics']
+
+ISSUES_PATH = re.compile(r'^/repos/(?P<repo>[^/]+/[^/]+)/issues$')
+TIMELINE_TYPES = {
+    'closed': 'ClosedEvent',
+    'reopened': 'ReopenedEvent',
+    'labeled': 'LabeledEvent',
+    'unlabeled': 'UnlabeledEvent',
+}
+GRAPHQL_BODY_ALIAS = re.compile(r'i(\d+): issue\(number: (\d+)\)')
+GRAPHQL_TIMELINE_ALIAS = re.compile(r'i(\d+): issue\(number: (\d+)\) \{ timelineItems\([^)]*after: "(\d+)"\)')
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def synthetic_issues(count: int, seed: int = 0, sprints: int = 6,
+                     now: Optional[datetime] = None) -> List[Dict]:
+    """Сгенерировать задачи в формате GitHub REST API
+
+    Задачи распределены по `sprints` двухнедельным спринтам (метки `sprint-N`),
+    последний спринт идет сейчас и дополнительно помечен `sprint-active`.
+    Story points в метках или (у части задач) только в описании.
+    """
+    rng = random.Random(seed)
+    now = (now or datetime.now(timezone.utc)).replace(microsecond=0)
+    first_sprint = now - timedelta(days=SPRINT_DAYS * sprints - 1)
+
+    issues = []
+    for number in range(1, count + 1):
+        sprint = min(sprints, 1 + (number - 1) * sprints // max(count, 1))
+        sprint_start = first_sprint + timedelta(days=SPRINT_DAYS * (sprint - 1))
+        created_at = sprint_start + timedelta(hours=rng.uniform(0, 24 * SPRINT_DAYS * 0.6))
+        created_at = min(created_at, now - timedelta(hours=1))
+
+        closed_at = None
+        if rng.random() < (0.85 if sprint < sprints else 0.5):
+            closed_at = created_at + timedelta(hours=rng.expovariate(1 / 60))
+            if closed_at >= now:
+                closed_at = None
+
+        points = rng.choice(STORY_POINTS)
+        labels = [f'sprint-{sprint}', f'priority-{rng.choice(PRIORITIES)}', f'epic-{rng.choice(EPICS)}']
+        if sprint == sprints:
+            labels.append('sprint-active')
+        body = f"Synthetic issue {number}"
+        if rng.random() < 0.8:
+            labels.append(f'story-points-{points}')
+        else:
+            body += f"\n\nStory Points: {points}"
+        if rng.random() < 0.15:
+            labels.append('bug')
+        if rng.random() < 0.03:
+            labels.append('blocker')
+
+        updated_at = closed_at or created_at
+        issues.append({
+            'id': 1_000_000 + number,
+            'number': number,
+            'title': f"Synthetic issue {number}",
+            'body': body,
+            'state': 'closed' if closed_at else 'open',
+            'labels': [{'name': label} for label in labels],
+            'created_at': _timestamp(created_at),
+            'closed_at': _timestamp(closed_at) if closed_at else None,
+            'updated_at': _timestamp(updated_at),
+        })
+
+    return issues
+
+
+class FixtureData:
+    """Задачи по репозиториям: из фикстуры или синтетические (генерируются при первом обращении)"""
+
+    def __init__(self, fixtures: Optional[Path] = None, issues: int = DEFAULT_ISSUES, seed: int = 0):
+        self.issues = issues
+        self.seed = seed
+        self.shared: Optional[List[Dict]] = None
+        self.repos: Dict[str, List[Dict]] = {}
+        self._lock = threading.Lock()
+
+        if fixtures:
+            data = json.loads(Path(fixtures).read_text(encoding='utf-8'))
+            # Список задач отдается для любого репозитория, словарь - по имени репозитория
+            if isinstance(data, list):
+                self.shared = data
+            else:
+                self.repos = data
+
+    def get(self, repo: str) -> List[Dict]:
+        if self.shared is not None:
+            return self.shared
+        with self._lock:
+            if repo not in self.repos:
+                self.repos[repo] = synthetic_issues(self.issues, self.seed + zlib.crc32(repo.encode()))
+            return self.repos[repo]
+
+
+class RateLimiter:
+    """Счетчик лимита запросов как у GitHub: окно с фиксированным временем сброса"""
+
+    def __init__(self, limit: int = RATE_LIMIT, window: int = RATE_LIMIT_WINDOW):
+        self.limit = limit
+        self.window = window
+        self.used = 0
+        self.reset = int(time.time()) + window
+        self._lock = threading.Lock()
+
+    def take(self, cost: int = 1) -> bool:
+        with self._lock:
+            if time.time() >= self.reset:
+                self.used = 0
+                self.reset = int(time.time()) + self.window
+            if self.used + cost > self.limit:
+                return False
+            self.used += cost
+            return True
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            'X-RateLimit-Limit': str(self.limit),
+            'X-RateLimit-Remaining': str(max(self.limit - self.used, 0)),
+            'X-RateLimit-Used': str(self.used),
+            'X-RateLimit-Reset': str(self.reset),
+            'X-RateLimit-Resource': 'core',
+        }
+
+
+def filter_issues(issues: List[Dict], state: str = 'open', labels: Optional[List[str]] = None,
+                  since: Optional[str] = None) -> List[Dict]:
+    selected = []
+    for issue in issues:
+        if state != 'all' and issue['state'] != state:
+            continue
+        if since and issue['updated_at'] < since:
+            continue
+        if labels:
+            names = {label['name'] for label in issue.get('labels', [])}
+            if not all(label in names for label in labels):
+                continue
+        selected.append(issue)
+    return selected
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    server_version = 'GitHubFixtureServer/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    data: FixtureData
+    rate_limiter: RateLimiter
+    latency: float = 0.0
+    webhooks: List[Dict] = []
+    webhook_log: Optional[Path] = None
+    webhook_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes = b'', headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        for name, value in {**self.rate_limiter.headers(), **(headers or {})}.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body and status != 304:
+            self.wfile.write(body)
+
+    def _send_json(self, status: int, payload, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode('utf-8')
+        self._send(status, body, {'Content-Type': 'application/json; charset=utf-8', **(headers or {})})
+
+    def _check_rate_limit(self) -> bool:
+        """Списать запрос из лимита; при исчерпании ответить 403 как GitHub"""
+        if self.rate_limiter.take():
+            return True
+        self._send_json(403, {
+            'message': 'API rate limit exceeded (fixture server)',
+            'documentation_url': 'https://docs.github.com/rest/overview/resources-in-the-rest-api#rate-limiting',
+        })
+        return False
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        url = urlparse(self.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        if url.path == '/rate_limit':
+            limiter = self.rate_limiter
+            core = {'limit': limiter.limit, 'remaining': max(limiter.limit - limiter.used, 0),
+                    'used': limiter.used, 'reset': limiter.reset}
+            self._send_json(200, {'resources': {'core': core}, 'rate': core})
+            return
+
+        if url.path == '/webhooks':
+            with self.webhook_lock:
+                self._send_json(200, list(self.webhooks))
+            return
+
+        match = ISSUES_PATH.match(url.path)
+        if not match:
+            self._send_json(404, {'message': 'Not Found'})
+            return
+
+        self.list_issues(match['repo'], url.path, query)
+
+    def list_issues(self, repo: str, path: str, query: Dict[str, str]):
+        issues = filter_issues(
+            self.data.get(repo),
+            state=query.get('state', 'open'),
+            labels=[label for label in query.get('labels', '').split(',') if label],
+            since=query.get('since'),
+        )
+        sort_key = 'updated_at' if query.get('sort') == 'updated' else 'created_at'
+        issues = sorted(issues, key=lambda issue: (issue[sort_key], issue['number']),
+                        reverse=query.get('direction', 'desc') == 'desc')
+
+        per_page = min(int(query.get('per_page', DEFAULT_PER_PAGE)), MAX_PER_PAGE)
+        page = max(int(query.get('page', 1)), 1)
+        last_page = max((len(issues) + per_page - 1) // per_page, 1)
+        items = issues[(page - 1) * per_page:page * per_page]
+
+        body = json.dumps(items).encode('utf-8')
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        last_modified = max((issue['updated_at'] for issue in items), default='1970-01-01T00:00:00Z')
+        headers = {
+            'ETag': etag,
+            'Last-Modified': format_datetime(
+                datetime.strptime(last_modified, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc), usegmt=True
+            ),
+        }
+
+        links = []
+        base = f"http://{self.headers.get('Host', self.server.address)}{path}"
+        for rel, number in (('prev', page - 1), ('next', page + 1), ('last', last_page), ('first', 1)):
+            if (rel in ('prev', 'first') and page > 1) or (rel in ('next', 'last') and page < last_page):
+                links.append(f'<{base}?{urlencode({**query, "page": number})}>; rel="{rel}"')
+        if links:
+            headers['Link'] = ', '.join(links)
+
+        # Условный запрос с совпавшим ETag не расходует лимит, как в GitHub
+        if self.headers.get('If-None-Match') == etag:
+            self._send(304, headers=headers)
+            return
+
+        if not self._check_rate_limit():
+            return
+        self._send(200, body, {'Content-Type': 'application/json; charset=utf-8', **headers})
+
+    def do_POST(self):
+        time.sleep(self.latency)
+        length = int(self.headers.get('Content-Length', 0))
+        raw = self.rfile.read(length)
+        path = urlparse(self.path).path
+
+        if path == '/graphql':
+            if self._check_rate_limit():
+                self.graphql(json.loads(raw or b'{}'))
+            return
+
+        # Любой другой POST - входящий webhook (Slack/Teams/Discord)
+        try:
+            payload = json.loads(raw) if raw else None
+        except ValueError:
+            payload = raw.decode('utf-8', errors='replace')
+        message = {
+            'path': path,
+            'received_at': _timestamp(datetime.now(timezone.utc)),
+            'content_type': self.headers.get('Content-Type'),
+            'payload': payload,
+        }
+        with self.webhook_lock:
+            self.webhooks.append(message)
+            if self.webhook_log:
+                with open(self.webhook_log, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(message, ensure_ascii=False) + '\n')
+        self._send(200, b'ok', {'Content-Type': 'text/plain'})
+
+    def graphql(self, request: Dict):
+        """Ответы на запросы github_client.py: список задач с историей и описания по номерам"""
+        query = request.get('query', '')
+        variables = request.get('variables') or {}
+        issues = self.data.get(f"{variables.get('owner')}/{variables.get('name')}")
+
+        if 'issues(first' in query:
+            states = variables.get('states')
+            selected = filter_issues(
+                issues,
+                state=states[0].lower() if states and len(states) == 1 else 'all',
+                labels=variables.get('labels'),
+                since=variables.get('since'),
+            )
+            selected.sort(key=lambda issue: (issue['updated_at'], issue['number']))
+            start = int(variables.get('cursor') or 0)
+            page = selected[start:start + GRAPHQL_PAGE_SIZE]
+            connection = {
+                'pageInfo': {'hasNextPage': start + GRAPHQL_PAGE_SIZE < len(selected),
+                             'endCursor': str(start + GRAPHQL_PAGE_SIZE)},
+                'nodes': [self._graphql_node(issue) for issue in page],
+            }
+            self._send_json(200, {'data': {'repository': {'issues': connection}}})
+            return
+
+        by_number = {issue['number']: issue for issue in issues}
+        repository = {}
+        if 'timelineItems' in query:
+            for alias, number, cursor in GRAPHQL_TIMELINE_ALIAS.findall(query):
+                issue = by_number.get(int(number))
+                repository[f'i{alias}'] = (
+                    {'timelineItems': self._graphql_timeline(issue, int(cursor))} if issue else None
+                )
+            self._send_json(200, {'data': {'repository': repository}})
+            return
+
+        for alias, number in GRAPHQL_BODY_ALIAS.findall(query):
+            issue = by_number.get(int(number))
+            repository[f'i{alias}'] = {'body': issue.get('body')} if issue else None
+        self._send_json(200, {'data': {'repository': repository}})
+
+    @staticmethod
+    def _graphql_timeline(issue: Dict, start: int = 0) -> Dict:
+        """Страница `timelineItems` задачи начиная с события `start` (курсор - смещение)
+
+        История берется из записанной фикстуры (`timeline`), иначе строится из
+        дат: все метки добавлены при создании, затем задача закрыта.
+        """
+        if 'timeline' in issue:
+            timeline = [
+                {'__typename': TIMELINE_TYPES[event['event']], 'createdAt': event['created_at'],
+                 **({'label': event['label']} if 'label' in event else {})}
+                for event in issue['timeline'] if event['event'] in TIMELINE_TYPES
+            ]
+        else:
+            timeline = [
+                {'__typename': 'LabeledEvent', 'createdAt': issue['created_at'], 'label': {'name': label['name']}}
+                for label in issue.get('labels', [])
+            ]
+            if issue.get('closed_at'):
+                timeline.append({'__typename': 'ClosedEvent', 'createdAt': issue['closed_at']})
+
+        return {
+            'pageInfo': {'hasNextPage': start + GRAPHQL_PAGE_SIZE < len(timeline),
+                         'endCursor': str(start + GRAPHQL_PAGE_SIZE)},
+            'nodes': timeline[start:start + GRAPHQL_PAGE_SIZE],
+        }
+
+    @classmethod
+    def _graphql_node(cls, issue: Dict) -> Dict:
+        """Задача в формате GraphQL с первой страницей истории событий"""
+        return {
+            'databaseId': issue['id'],
+            'number': issue['number'],
+            'title': issue['title'],
+            'state': issue['state'].upper(),
+            'createdAt': issue['created_at'],
+            'closedAt': issue.get('closed_at'),
+            'updatedAt': issue['updated_at'],
+            'labels': {'nodes': [{'name': label['name']} for label in issue.get('labels', [])]},
+            'timelineItems': cls._graphql_timeline(issue),
+        }
+
+
+def serve(host: str, port: int, data: FixtureData, rate_limit: int, latency: float,
+          webhook_log: Optional[Path], verbose: bool = False):
+    handler = type('Handler', (FixtureHandler,), {
+        'data': data,
+        'rate_limiter': RateLimiter(rate_limit),
+        'latency': latency,
+        'webhooks': [],
+        'webhook_log': webhook_log,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    server.address = f'{host}:{server.server_address[1]}'
+
+    print(f"🚀 GitHub fixture server: http://{server.address} (rate limit {rate_limit}/h, latency {latency * 1000:.0f}ms)",
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def record(github_token: str, repos: List[str], output: Path, labels: Optional[str] = None):
+    """Записать задачи репозиториев в фикстуру {repo: [issues]}"""
+    from github_client import GitHubClient
+
+    fixtures = {}
+    for repo in repos:
+        client = GitHubClient(github_token, repo, cache_dir=None)
+        fixtures[repo] = client.get_issues(labels)
+        print(f"📥 {repo}: {len(fixtures[repo])} issues")
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(fixtures, indent=2, ensure_ascii=False), encoding='utf-8')
+    print(f"✅ Фикстура сохранена: {output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local GitHub API stand-in for offline tests and benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Serve issues, GraphQL, rate-limit headers and webhooks')
+    serve_parser.add_argument('--host', default=DEFAULT_HOST, help='Bind address')
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port (0 picks a free one)')
+    serve_parser.add_argument('--fixtures', help='Recorded JSON fixtures (a list of issues or {repo: [issues]})')
+    serve_parser.add_argument('--issues', type=int, default=DEFAULT_ISSUES,
+                              help='Synthetic issues per repository when no fixtures are given')
+    serve_parser.add_argument('--seed', type=int, default=0, help='Random seed for synthetic issues')
+    serve_parser.add_argument('--rate-limit', type=int, default=RATE_LIMIT, help='Requests per hour before 403')
+    serve_parser.add_argument('--latency', type=float, default=0.0, help='Added latency per request in ms')
+    serve_parser.add_argument('--webhook-log', help='Append received webhook payloads to this JSONL file')
+    serve_parser.add_argument('--verbose', action='store_true', help='Log every request')
+
+    record_parser = subparsers.add_parser('record', help='Record issues of real repositories into a fixture')
+    record_parser.add_argument('--github-token', required=True, help='GitHub token')
+    record_parser.add_argument('--repo', required=True, nargs='+', help='Repository names (owner/repo)')
+    record_parser.add_argument('--labels', help='Only record issues with these labels')
+    record_parser.add_argument('--output', required=True, help='Output JSON fixture')
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        data = FixtureData(args.fixtures, args.issues, args.seed)
+        serve(args.host, args.port, data, args.rate_limit, args.latency / 1000,
+              Path(args.webhook_log) if args.webhook_log else None, args.verbose)
+
+    elif args.command == 'record':
+        record(args.github_token, args.repo, Path(args.output), args.labels)
+
+
+if __name__ == '__main__':
+    main()
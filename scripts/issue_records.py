@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Issue Records
+Нормализация задач GitHub для скриптов аналитики спринта NutryFlow
+
+Каждая задача из ответа API один раз разбирается в компактную запись:
+story points, состояние, даты, множество меток и производные признаки.
+Все метрики считаются по записям, не обращаясь повторно к меткам и описанию.
+"""
+
+import sys
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional
+
+
+def extract_story_points(issue: Dict) -> int:
+    """Извлечь story points из задачи"""
+    # Проверяем labels на наличие story points
+    for label in issue.get('labels', []):
+        if 'story-points' in label['name'].lower():
+            try:
+                return int(label['name'].split('-')[-1])
+            except ValueError:
+                continue
+
+    # Проверяем body на наличие story points
+    body = issue.get('body') or ''
+    if 'Story Points:' in body:
+        try:
+            points_line = [line for line in body.split('\n') if 'Story Points:' in line][0]
+            return int(points_line.split(':')[1].strip())
+        except (ValueError, IndexError):
+            pass
+
+    return 0
+
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Дата GitHub (`2024-01-01T10:00:00Z`) в datetime с часовым поясом"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')) if value else None
+
+
+def _label_value(labels: List[str], marker: str) -> Optional[str]:
+    """Значение первой метки вида `priority-high` / `epic-auth`"""
+    for name in labels:
+        if marker in name.lower():
+            return name.split('-')[-1]
+    return None
+
+
+class IssueRecord:
+    __slots__ = (
+        'number', 'title', 'state', 'is_closed', 'points', 'created_at', 'closed_at',
+        'labels', 'priority', 'epic', 'is_bug', 'is_blocker', 'timeline',
+    )
+
+    def __init__(self, issue: Dict):
+        label_names = [sys.intern(label['name']) for label in issue.get('labels', [])]
+
+        self.number: int = issue['number']
+        self.title: str = issue['title']
+        self.state: str = sys.intern(issue['state'])
+        self.is_closed: bool = self.state == 'closed'
+        # Хранилище задач уже посчитало story points при синхронизации
+        self.points: int = issue['story_points'] if 'story_points' in issue else extract_story_points(issue)
+        self.created_at: datetime = parse_datetime(issue['created_at'])
+        self.closed_at: Optional[datetime] = parse_datetime(issue.get('closed_at'))
+        self.labels: FrozenSet[str] = frozenset(label_names)
+        self.priority: Optional[str] = _label_value(label_names, 'priority')
+        self.epic: Optional[str] = _label_value(label_names, 'epic')
+        self.is_bug: bool = 'bug' in self.labels
+        self.is_blocker: bool = 'blocker' in self.labels
+        self.timeline: Optional[List[Dict]] = issue.get('timeline')
+
+    def __repr__(self) -> str:
+        return f"IssueRecord(#{self.number}, {self.state}, {self.points} points)"
+
+
+def normalize_issues(issues: List[Dict]) -> List[IssueRecord]:
+    """Разобрать ответ API в записи"""
+    return [IssueRecord(issue) for issue in issues]
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Issue Store
+Локальное хранилище задач GitHub в SQLite для скриптов аналитики спринта NutryFlow
+
+Каждый запуск запрашивает у GitHub только задачи, обновленные после последней
+синхронизации (параметр `since`), и обновляет их в базе. Выборка задач спринта
+по меткам выполняется локально, поэтому стоимость запуска не зависит от
+размера бэклога. При загрузке через GraphQL сохраняется и история
+закрытий/переоткрытий/меток каждой задачи.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from github_client import GitHubClient
+
+DEFAULT_STORE_PATH = Path('.cache/issues.sqlite3')
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    repo TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    number INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT,
+    state TEXT NOT NULL,
+    is_pull_request INTEGER NOT NULL DEFAULT 0,
+    story_points INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    closed_at TEXT,
+    updated_at TEXT NOT NULL,
+    has_timeline INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (repo, id)
+);
+CREATE TABLE IF NOT EXISTS issue_labels (
+    repo TEXT NOT NULL,
+    issue_id INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    PRIMARY KEY (repo, issue_id, label)
+);
+CREATE TABLE IF NOT EXISTS issue_events (
+    repo TEXT NOT NULL,
+    issue_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    label TEXT,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (repo, issue_id, position)
+);
+CREATE INDEX IF NOT EXISTS issue_labels_by_label ON issue_labels (repo, label);
+CREATE INDEX IF NOT EXISTS issues_by_updated ON issues (repo, updated_at);
+"""
+
+
+class IssueStore:
+    def __init__(self, db_path: Path = DEFAULT_STORE_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self):
+        """Создать таблицы; при смене версии схемы база пересоздается с нуля"""
+        version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            self.connection.executescript(
+                'DROP TABLE IF EXISTS issues; DROP TABLE IF EXISTS issue_labels; DROP TABLE IF EXISTS issue_events;'
+            )
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self.connection.commit()
+
+    def watermark(self, repo: str) -> Optional[str]:
+        """Время последнего обновления среди сохраненных задач (по часам GitHub)"""
+        row = self.connection.execute('SELECT MAX(updated_at) FROM issues WHERE repo = ?', (repo,)).fetchone()
+        return row[0]
+
+    def upsert(self, repo: str, issues: List[Dict], extract_story_points: Callable[[Dict], int]):
+        """Добавить или обновить задачи вместе с метками и историей событий"""
+        with self.connection:
+            for issue in issues:
+                self.connection.execute(
+                    """INSERT OR REPLACE INTO issues
+                       (repo, id, number, title, body, state, is_pull_request, story_points,
+                        created_at, closed_at, updated_at, has_timeline)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (
+                        repo, issue['id'], issue['number'], issue['title'], issue.get('body'),
+                        issue['state'], int('pull_request' in issue), extract_story_points(issue),
+                        issue['created_at'], issue.get('closed_at'), issue['updated_at'],
+                        int('timeline' in issue),
+                    ),
+                )
+                self.connection.execute(
+                    'DELETE FROM issue_events WHERE repo = ? AND issue_id = ?', (repo, issue['id'])
+                )
+                self.connection.executemany(
+                    """INSERT INTO issue_events (repo, issue_id, position, event, label, created_at)
+                       VALUES (?, ?, ?, ?, ?, ?)""",
+                    [
+                        (repo, issue['id'], position, event['event'],
+                         event.get('label', {}).get('name'), event['created_at'])
+                        for position, event in enumerate(issue.get('timeline', []))
+                    ],
+                )
+                self.connection.execute(
+                    'DELETE FROM issue_labels WHERE repo = ? AND issue_id = ?', (repo, issue['id'])
+                )
+                self.connection.executemany(
+                    'INSERT OR IGNORE INTO issue_labels (repo, issue_id, label) VALUES (?, ?, ?)',
+                    [(repo, issue['id'], label['name']) for label in issue.get('labels', [])],
+                )
+
+    def sync(self, client: GitHubClient, extract_story_points: Callable[[Dict], int]) -> int:
+        """Загрузить задачи, обновленные после последней синхронизации"""
+        since = self.watermark(client.repo)
+        issues = client.get_issues(since=since, needs_body=lambda issue: extract_story_points(issue) == 0)
+        self.upsert(client.repo, issues, extract_story_points)
+
+        mode = f"since {since}" if since else "full sync"
+        print(f"Issue store: {len(issues)} updated issues ({mode})", file=sys.stderr)
+        return len(issues)
+
+    def get_issues(self, repo: str, label: str) -> List[Dict]:
+        """Задачи с меткой в формате ответа GitHub REST API"""
+        return self._load_issues(repo, 'label = ?', label)
+
+    def get_issues_with_label_prefix(self, repo: str, prefix: str) -> List[Dict]:
+        """Задачи хотя бы с одной меткой, начинающейся с `prefix` (например, `sprint-`)"""
+        return self._load_issues(repo, 'substr(label, 1, ?) = ?', len(prefix), prefix)
+
+    def closed_points(self, repo: str, since: str) -> List[Tuple[str, int]]:
+        """Время закрытия и story points задач, закрытых начиная с `since` (ISO 8601, UTC)"""
+        rows = self.connection.execute(
+            """SELECT closed_at, story_points FROM issues
+               WHERE repo = ? AND state = 'closed' AND is_pull_request = 0 AND closed_at >= ?""",
+            (repo, since),
+        ).fetchall()
+        return [(row['closed_at'], row['story_points']) for row in rows]
+
+    def _load_issues(self, repo: str, label_condition: str, *params) -> List[Dict]:
+        matching = f'SELECT issue_id FROM issue_labels WHERE repo = ? AND {label_condition}'
+        rows = self.connection.execute(
+            f"""SELECT * FROM issues WHERE repo = ? AND id IN ({matching})
+               ORDER BY number DESC""",
+            (repo, repo, *params),
+        ).fetchall()
+
+        labels: Dict[int, List[Dict]] = {}
+        for row in self.connection.execute(
+            f"""SELECT issue_id, label FROM issue_labels
+               WHERE repo = ? AND issue_id IN ({matching})""",
+            (repo, repo, *params),
+        ):
+            labels.setdefault(row['issue_id'], []).append({'name': row['label']})
+
+        timelines: Dict[int, List[Dict]] = {}
+        for row in self.connection.execute(
+            f"""SELECT issue_id, event, label, created_at FROM issue_events
+               WHERE repo = ? AND issue_id IN ({matching})
+               ORDER BY issue_id, position""",
+            (repo, repo, *params),
+        ):
+            event = {'event': row['event'], 'created_at': row['created_at']}
+            if row['label'] is not None:
+                event['label'] = {'name': row['label']}
+            timelines.setdefault(row['issue_id'], []).append(event)
+
+        issues = []
+        for row in rows:
+            issue = {
+                'id': row['id'],
+                'number': row['number'],
+                'title': row['title'],
+                'body': row['body'],
+                'state': row['state'],
+                'labels': labels.get(row['id'], []),
+                'created_at': row['created_at'],
+                'closed_at': row['closed_at'],
+                'updated_at': row['updated_at'],
+                'story_points': row['story_points'],
+            }
+            if row['is_pull_request']:
+                issue['pull_request'] = {}
+            if row['has_timeline']:
+                issue['timeline'] = timelines.get(row['id'], [])
+            issues.append(issue)
+
+        return issues
+
+    def close(self):
+        self.connection.close()
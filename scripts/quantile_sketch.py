@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Quantile Sketch
+Потоковые распределения cycle time и lead time задач NutryFlow
+
+Вместо среднего по списку всех закрытых задач каждое значение сразу
+добавляется в t-digest (merging digest Даннинга): отсортированный набор
+центроидов (среднее, вес), мелких на краях распределения и крупных в
+середине. Число центроидов ограничено параметром `compression`, поэтому
+память не растет с историей, а хвостовые процентили (P85, P95) остаются
+точными. Дайджесты сливаются без потери точности: снимки отдельных
+спринтов объединяются в кварталы и годы без повторного обхода задач.
+
+Время считается в часах:
+- lead time - от создания задачи до закрытия;
+- cycle time - от добавления в спринт (первая метка `sprint-*` в истории
+  событий GraphQL) до закрытия; без истории совпадает с lead time.
+"""
+
+import json
+import math
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from issue_records import IssueRecord, parse_datetime
+
+DEFAULT_COMPRESSION = 100
+# Буфер новых значений перед сжатием, в единицах compression
+BUFFER_FACTOR = 5
+FLOW_METRICS = ('cycle_time', 'lead_time')
+FLOW_PERCENTILES = (50, 85, 95)
+
+
+class TDigest:
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.centroids: List[Tuple[float, float]] = []
+        self.buffer: List[Tuple[float, float]] = []
+        self.count = 0.0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __len__(self) -> int:
+        return int(self.count)
+
+    def add(self, value: float, weight: float = 1.0):
+        self.buffer.append((value, weight))
+        self.count += weight
+        self.total += value * weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self.buffer) >= BUFFER_FACTOR * self.compression:
+            self._compress()
+
+    def update(self, values: Iterable[float]) -> 'TDigest':
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        """Добавить центроиды другого дайджеста (результат - как по объединенным данным)"""
+        other._compress()
+        self.buffer.extend(other.centroids)
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(self.buffer) >= BUFFER_FACTOR * self.compression:
+            self._compress()
+        return self
+
+    def _scale(self, q: float) -> float:
+        """Функция масштаба k1: центроиды у краев распределения мельче"""
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _compress(self):
+        if not self.buffer:
+            return
+
+        points = sorted(self.centroids + self.buffer)
+        self.buffer = []
+        merged = []
+        mean, weight = points[0]
+        cumulative = 0.0
+        k_left = self._scale(0.0)
+        for next_mean, next_weight in points[1:]:
+            if self._scale((cumulative + weight + next_weight) / self.count) - k_left <= 1:
+                weight += next_weight
+                mean += (next_mean - mean) * next_weight / weight
+            else:
+                merged.append((mean, weight))
+                cumulative += weight
+                k_left = self._scale(cumulative / self.count)
+                mean, weight = next_mean, next_weight
+        merged.append((mean, weight))
+        self.centroids = merged
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Значение `q`-квантиля (0..1); линейная интерполяция между центрами центроидов"""
+        self._compress()
+        if not self.centroids:
+            return None
+
+        target = q * self.count
+        cumulative = previous_center = 0.0
+        previous_mean = self.min
+        for mean, weight in self.centroids:
+            center = cumulative + weight / 2
+            if target < center:
+                return previous_mean + (mean - previous_mean) * (target - previous_center) / (center - previous_center)
+            previous_center, previous_mean = center, mean
+            cumulative += weight
+
+        if self.count == previous_center:
+            return self.max
+        return previous_mean + (self.max - previous_mean) * (target - previous_center) / (self.count - previous_center)
+
+    def percentiles(self, percentiles: Iterable[int] = FLOW_PERCENTILES) -> Dict[int, Optional[float]]:
+        return {percentile: self.quantile(percentile / 100) for percentile in percentiles}
+
+    def to_json(self) -> str:
+        self._compress()
+        return json.dumps({
+            'compression': self.compression,
+            'count': self.count,
+            'total': self.total,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'centroids': self.centroids,
+        }, separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, payload: str) -> 'TDigest':
+        data = json.loads(payload)
+        digest = cls(data['compression'])
+        digest.centroids = [tuple(centroid) for centroid in data['centroids']]
+        digest.count = data['count']
+        digest.total = data['total']
+        if digest.count:
+            digest.min, digest.max = data['min'], data['max']
+        return digest
+
+
+def work_started_at(record: IssueRecord, prefix: str = 'sprint-') -> datetime:
+    """Начало работы: первое добавление в спринт по истории событий, иначе создание задачи"""
+    for event in record.timeline or ():
+        if event['event'] == 'labeled' and event.get('label', {}).get('name', '').startswith(prefix):
+            return max(parse_datetime(event['created_at']), record.created_at)
+    return record.created_at
+
+
+def flow_sketches(records: Iterable[IssueRecord], prefix: str = 'sprint-',
+                  compression: float = DEFAULT_COMPRESSION) -> Dict[str, TDigest]:
+    """Дайджесты cycle time и lead time закрытых задач (часы), одним проходом"""
+    sketches = {metric: TDigest(compression) for metric in FLOW_METRICS}
+    for record in records:
+        if not (record.is_closed and record.closed_at):
+            continue
+        sketches['lead_time'].add((record.closed_at - record.created_at).total_seconds() / 3600)
+        cycle = record.closed_at - work_started_at(record, prefix)
+        sketches['cycle_time'].add(max(cycle.total_seconds() / 3600, 0.0))
+    return sketches
+
+
+def format_hours(hours: Optional[float]) -> str:
+    """Длительность: до двух суток - в часах, дольше - в днях"""
+    if hours is None:
+        return 'n/a'
+    return f"{hours:.1f} h" if hours < 48 else f"{hours / 24:.1f} days"
+
+
+def distribution_summary(sketch: TDigest) -> str:
+    """`P50 … · P85 … · P95 …` с числом задач и средним для строки отчета"""
+    if not len(sketch):
+        return 'no closed issues'
+    values = ' · '.join(
+        f"P{percentile} {format_hours(value)}" for percentile, value in sketch.percentiles().items()
+    )
+    return f"{values} (mean {format_hours(sketch.mean)}, {len(sketch)} issues)"
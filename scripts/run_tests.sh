@@ -146,6 +146,66 @@ run_performance_tests() {
     fi
 }
 
+# Golden тесты экспорта дизайн-токенов
+run_token_golden_tests() {
+    print_header "Проверка экспорта дизайн-токенов"
+    
+    if python3 scripts/benchmark_design_tokens.py golden; then
+        print_success "Экспорт токенов совпадает с эталонами!"
+    else
+        print_error "Экспорт токенов отличается от эталонов в test/goldens/design_tokens"
+        return 1
+    fi
+}
+
+# Сквозной прогон скриптов Scrum-аналитики на локальной подмене GitHub API
+run_scrum_script_tests() {
+    print_header "Проверка скриптов Scrum-аналитики"
+    
+    local port=8765
+    local api_url="http://127.0.0.1:$port"
+    local work_dir
+    work_dir=$(mktemp -d)
+    
+    python3 scripts/github_fixture_server.py serve --port $port --issues 300 \
+        --webhook-log "$work_dir/webhooks.jsonl" 2>/dev/null &
+    local server_pid=$!
+    sleep 1
+    
+    local exit_code=0
+    (
+        cd "$work_dir"
+        scripts_dir="$OLDPWD/scripts"
+        python3 "$scripts_dir/scrum_automation.py" --github-token test --repo nutryflow/app --api-url "$api_url" \
+            --action daily-report --webhook-url "$api_url/hooks/daily" > /dev/null &&
+        python3 "$scripts_dir/generate_sprint_metrics.py" --github-token test --repo nutryflow/app --api-url "$api_url" &&
+        python3 "$scripts_dir/generate_sprint_metrics.py" --github-token test --repo nutryflow/app --api-url "$api_url" \
+            --all-sprints --output sprint_comparison.md &&
+        python3 "$scripts_dir/generate_burndown_chart.py" --github-token test --repo nutryflow/app --api-url "$api_url" \
+            --backend graphql --no-store &&
+        python3 "$scripts_dir/generate_burndown_chart.py" --github-token test --repo nutryflow/app --api-url "$api_url" \
+            --no-charts &&
+        python3 "$scripts_dir/sprint_report.py" --github-token test --repo nutryflow/app --api-url "$api_url" \
+            --daily-output daily_scrum_report.md > /dev/null &&
+        test -s daily_scrum_report.md && test -s burndown_chart.png &&
+        test -s sprint_metrics_report.md && test -s sprint_comparison.md && test -s burndown_report.md &&
+        test -s webhooks.jsonl
+    ) || exit_code=1
+    
+    kill $server_pid 2>/dev/null || true
+    rm -rf "$work_dir"
+    
+    print_info "Проверка времени старта скриптов..."
+    python3 scripts/benchmark_startup.py --check || exit_code=1
+    
+    if [ $exit_code -eq 0 ]; then
+        print_success "Скрипты Scrum-аналитики работают!"
+    else
+        print_error "Скрипты Scrum-аналитики завершились с ошибкой"
+    fi
+    return $exit_code
+}
+
 # Анализ покрытия кода
 analyze_coverage() {
     print_header "Анализ покрытия кода"
@@ -204,6 +264,8 @@ main() {
     
     run_unit_tests || exit_code=1
     run_widget_tests || exit_code=1
+    run_token_golden_tests || exit_code=1
+    run_scrum_script_tests || exit_code=1
     run_integration_tests
     run_performance_tests
     
@@ -246,6 +308,12 @@ case "${1:-}" in
         check_dependencies
         run_performance_tests
         ;;
+    "tokens")
+        run_token_golden_tests
+        ;;
+    "scrum")
+        run_scrum_script_tests
+        ;;
     "coverage")
         analyze_coverage
         ;;
@@ -263,6 +331,8 @@ case "${1:-}" in
         echo "  widget      - Запуск только widget тестов"
         echo "  integration - Запуск integration тестов"
         echo "  performance - Запуск performance тестов"
+        echo "  tokens      - Golden тесты экспорта дизайн-токенов"
+        echo "  scrum       - Сквозной прогон скриптов Scrum-аналитики на подмене GitHub API"
         echo "  coverage    - Анализ покрытия кода"
         echo "  analyze     - Анализ качества кода"
         echo "  clean       - Очистка проекта"
@@ -5,122 +5,94 @@ Scrum Master Automation Script
 """
 
 import json
-import requests
 import os
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Optional
 import argparse
 import sys
 
+from burndown_engine import BurndownEngine, sprint_window
+from github_client import BACKENDS, DEFAULT_CACHE_DIR, DEFAULT_TIMEOUT, GITHUB_API_URL, GitHubClient
+from issue_records import IssueRecord, extract_story_points, normalize_issues
+from issue_store import DEFAULT_STORE_PATH, IssueStore
+from quantile_sketch import TDigest, distribution_summary, flow_sketches
+from sprint_history import DEFAULT_HISTORY_PATH, ROLLING_WINDOW, SprintHistory
+
 class ScrumAutomation:
-    def __init__(self, github_token: str, repo: str):
+    def __init__(self, github_token: str, repo: str, timeout: float = DEFAULT_TIMEOUT, use_cache: bool = True,
+                 store_path: Optional[Path] = DEFAULT_STORE_PATH, backend: str = 'rest', api_url: Optional[str] = None,
+                 history_path: Optional[Path] = DEFAULT_HISTORY_PATH):
         self.github_token = github_token
         self.repo = repo
-        self.headers = {
-            'Authorization': f'token {github_token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
-        self.base_url = f'https://api.github.com/repos/{repo}'
+        self.client = GitHubClient(github_token, repo, timeout=timeout,
+                                   cache_dir=DEFAULT_CACHE_DIR if use_cache else None, backend=backend,
+                                   api_url=api_url)
+        self.store = IssueStore(store_path) if store_path else None
+        self.history = SprintHistory(history_path) if history_path else None
     
-    def get_sprint_issues(self, sprint_label: str = 'sprint-active') -> List[Dict]:
+    def get_sprint_issues(self, sprint_label: str = 'sprint-active') -> List[IssueRecord]:
         """Получить все задачи текущего спринта"""
-        url = f'{self.base_url}/issues'
-        params = {
-            'state': 'all',
-            'labels': sprint_label,
-            'per_page': 100
-        }
-        
-        response = requests.get(url, headers=self.headers, params=params)
-        if response.status_code == 200:
-            return response.json()
+        if not self.store:
+            issues = self.client.get_issues(
+                sprint_label, needs_body=lambda issue: extract_story_points(issue) == 0
+            )
         else:
-            print(f"Error fetching issues: {response.status_code}")
-            return []
+            self.store.sync(self.client, extract_story_points)
+            issues = self.store.get_issues(self.repo, sprint_label)
+        
+        return normalize_issues(issues)
     
-    def calculate_velocity(self, sprint_data: List[Dict]) -> int:
+    def calculate_velocity(self, sprint_data: List[IssueRecord]) -> int:
         """Рассчитать velocity команды"""
-        completed_points = 0
-        for issue in sprint_data:
-            if issue['state'] == 'closed':
-                # Извлекаем story points из labels или body
-                points = self.extract_story_points(issue)
-                completed_points += points
-        
-        return completed_points
+        return sum(issue.points for issue in sprint_data if issue.is_closed)
     
-    def extract_story_points(self, issue: Dict) -> int:
-        """Извлечь story points из задачи"""
-        # Проверяем labels на наличие story points
-        for label in issue.get('labels', []):
-            if 'story-points' in label['name'].lower():
-                try:
-                    return int(label['name'].split('-')[-1])
-                except ValueError:
-                    continue
-        
-        # Проверяем body на наличие story points
-        body = issue.get('body', '')
-        if 'Story Points:' in body:
-            try:
-                points_line = [line for line in body.split('\n') if 'Story Points:' in line][0]
-                return int(points_line.split(':')[1].strip())
-            except (ValueError, IndexError):
-                pass
+    def generate_burndown_data(self, sprint_data: List[IssueRecord], sprint_duration: int = 14,
+                               timezone: str = 'UTC') -> Dict:
+        """Генерировать данные для burndown chart (идеальная и фактическая линии)"""
+        total_points = sum(issue.points for issue in sprint_data)
+        start_date, end_date = sprint_window(sprint_duration, timezone)
+        actual = BurndownEngine(sprint_data).sweep(start_date, end_date, timezone)
         
-        return 0
-    
-    def generate_burndown_data(self, sprint_data: List[Dict], sprint_duration: int = 14) -> Dict:
-        """Генерировать данные для burndown chart"""
-        total_points = sum(self.extract_story_points(issue) for issue in sprint_data)
         remaining_points = []
         dates = []
-        
-        # Имитируем идеальную линию
-        for day in range(sprint_duration):
+        for day in range(sprint_duration + 1):
             ideal_remaining = total_points - (total_points / sprint_duration) * day
             remaining_points.append(max(0, ideal_remaining))
-            dates.append((datetime.now() - timedelta(days=sprint_duration-day)).strftime('%Y-%m-%d'))
+            dates.append((start_date + timedelta(days=day)).strftime('%Y-%m-%d'))
         
         return {
             'dates': dates,
             'remaining_points': remaining_points,
+            'actual_remaining_points': [point.remaining for point in actual],
+            'scope_points': [point.scope for point in actual],
             'total_points': total_points
         }
     
-    def calculate_defect_rate(self, sprint_data: List[Dict]) -> float:
+    def calculate_defect_rate(self, sprint_data: List[IssueRecord]) -> float:
         """Рассчитать defect rate"""
         total_issues = len(sprint_data)
-        defect_issues = len([issue for issue in sprint_data if 'bug' in [label['name'] for label in issue.get('labels', [])]])
+        defect_issues = sum(issue.is_bug for issue in sprint_data)
         
         return (defect_issues / total_issues * 100) if total_issues > 0 else 0
     
-    def calculate_cycle_time(self, sprint_data: List[Dict]) -> float:
-        """Рассчитать средний cycle time"""
-        cycle_times = []
-        
-        for issue in sprint_data:
-            if issue['state'] == 'closed' and issue.get('closed_at'):
-                created_at = datetime.fromisoformat(issue['created_at'].replace('Z', '+00:00'))
-                closed_at = datetime.fromisoformat(issue['closed_at'].replace('Z', '+00:00'))
-                cycle_time = (closed_at - created_at).days
-                cycle_times.append(cycle_time)
-        
-        return sum(cycle_times) / len(cycle_times) if cycle_times else 0
+    def calculate_flow_times(self, sprint_data: List[IssueRecord]) -> Dict[str, TDigest]:
+        """Рассчитать распределения cycle time и lead time (часы, t-digest)"""
+        return flow_sketches(sprint_data)
     
-    def generate_daily_report(self) -> str:
-        """Генерировать ежедневный отчет"""
-        sprint_data = self.get_sprint_issues()
+    def generate_daily_report(self, sprint_data: Optional[List[IssueRecord]] = None) -> str:
+        """Генерировать ежедневный отчет (по уже загруженным задачам, если они переданы)"""
+        if sprint_data is None:
+            sprint_data = self.get_sprint_issues()
         
         velocity = self.calculate_velocity(sprint_data)
         defect_rate = self.calculate_defect_rate(sprint_data)
-        cycle_time = self.calculate_cycle_time(sprint_data)
+        flow_times = self.calculate_flow_times(sprint_data)
         
         # Статистика по статусам
         status_counts = {}
         for issue in sprint_data:
-            status = issue['state']
-            status_counts[status] = status_counts.get(status, 0) + 1
+            status_counts[issue.state] = status_counts.get(issue.state, 0) + 1
         
         report = f"""
 # Daily Scrum Report - {datetime.now().strftime('%Y-%m-%d')}
@@ -128,7 +100,8 @@ class ScrumAutomation:
 ## 📊 Sprint Metrics
 - **Velocity**: {velocity} story points
 - **Defect Rate**: {defect_rate:.1f}%
-- **Average Cycle Time**: {cycle_time:.1f} days
+- **Cycle Time**: {distribution_summary(flow_times['cycle_time'])}
+- **Lead Time**: {distribution_summary(flow_times['lead_time'])}
 
 ## 📋 Issue Status
 """
@@ -137,11 +110,11 @@ class ScrumAutomation:
             report += f"- **{status.title()}**: {count} issues\n"
         
         # Блокеры
-        blockers = [issue for issue in sprint_data if 'blocker' in [label['name'] for label in issue.get('labels', [])]]
+        blockers = [issue for issue in sprint_data if issue.is_blocker]
         if blockers:
             report += "\n## 🚧 Blockers\n"
             for blocker in blockers:
-                report += f"- {blocker['title']} (#{blocker['number']})\n"
+                report += f"- {blocker.title} (#{blocker.number})\n"
         
         return report
     
@@ -156,7 +129,7 @@ class ScrumAutomation:
         }
         
         try:
-            response = requests.post(webhook_url, json=payload)
+            response = self.client.post_webhook(webhook_url, payload)
             if response.status_code == 200:
                 print("Notification sent successfully")
             else:
@@ -166,6 +139,20 @@ class ScrumAutomation:
     
     def create_sprint_planning_template(self, sprint_number: int, start_date: str, end_date: str, goal: str) -> str:
         """Создать шаблон для Sprint Planning"""
+        # Емкость спринта - скользящее среднее velocity из истории спринтов
+        # Планируемый спринт мог уже попасть в историю ежедневным снимком - его не учитываем
+        planned = f"sprint-{sprint_number}"
+        average_velocity = self.history.rolling(self.repo, 'velocity', exclude=planned) if self.history else None
+        if average_velocity is not None:
+            sprints = len([
+                sprint for sprint in self.history.sprints(self.repo, ROLLING_WINDOW + 1) if sprint['sprint'] != planned
+            ][-ROLLING_WINDOW:])
+            team_velocity = f"{average_velocity:.0f} story points (average of last {sprints} sprints)"
+            planned_points = f"{average_velocity:.0f} (based on team velocity)"
+        else:
+            team_velocity = "[TO BE CALCULATED]"
+            planned_points = "[TO BE DEFINED]"
+        
         template = f"""# Sprint {sprint_number} Planning
 
 ## Sprint Information
@@ -174,7 +161,7 @@ class ScrumAutomation:
 - **Sprint Goal**: {goal}
 
 ## Capacity Planning
-- **Team Velocity**: [TO BE CALCULATED]
+- **Team Velocity**: {team_velocity}
 - **Available Hours**: [TO BE DEFINED]
 - **Holidays/Time Off**: [TO BE DEFINED]
 
@@ -198,7 +185,7 @@ class ScrumAutomation:
 - [ ] Meets UX/UI requirements
 
 ## Sprint Metrics Tracking
-- **Planned Points**: [TO BE DEFINED]
+- **Planned Points**: {planned_points}
 - **Actual Points**: [TO BE TRACKED]
 - **Goal Achievement**: [TO BE TRACKED]
 """
@@ -247,15 +234,29 @@ def main():
                        help='Action to perform')
     parser.add_argument('--github-token', required=True, help='GitHub token')
     parser.add_argument('--repo', required=True, help='Repository name (owner/repo)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='GitHub API request timeout in seconds')
+    parser.add_argument('--no-cache', action='store_true', help='Do not use the on-disk GitHub response cache')
+    parser.add_argument('--store', default=str(DEFAULT_STORE_PATH), help='SQLite issue store path')
+    parser.add_argument('--no-store', action='store_true', help='Fetch sprint issues directly instead of syncing the store')
+    parser.add_argument('--backend', choices=BACKENDS, default='rest',
+                        help='GitHub API used to fetch issues (graphql also fetches close/reopen/label history)')
+    parser.add_argument('--api-url', default=os.environ.get('GITHUB_API_URL', GITHUB_API_URL),
+                        help='GitHub API base URL (GitHub Enterprise or a local github_fixture_server.py)')
     parser.add_argument('--webhook-url', help='Webhook URL for notifications')
     parser.add_argument('--sprint-number', type=int, help='Sprint number for templates')
     parser.add_argument('--start-date', help='Sprint start date')
     parser.add_argument('--end-date', help='Sprint end date')
     parser.add_argument('--goal', help='Sprint goal')
+    parser.add_argument('--timezone', default='UTC', help='Team time zone for burndown day boundaries')
+    parser.add_argument('--history', default=str(DEFAULT_HISTORY_PATH),
+                        help='Sprint history database used to pre-fill planning capacity')
     
     args = parser.parse_args()
     
-    scrum = ScrumAutomation(args.github_token, args.repo)
+    scrum = ScrumAutomation(args.github_token, args.repo, timeout=args.timeout,
+                               use_cache=not args.no_cache,
+                               store_path=None if args.no_store else args.store,
+                               backend=args.backend, api_url=args.api_url, history_path=args.history)
     
     if args.action == 'daily-report':
         report = scrum.generate_daily_report()
@@ -273,7 +274,7 @@ def main():
     
     elif args.action == 'burndown':
         sprint_data = scrum.get_sprint_issues()
-        burndown_data = scrum.generate_burndown_data(sprint_data)
+        burndown_data = scrum.generate_burndown_data(sprint_data, timezone=args.timezone)
         print(json.dumps(burndown_data, indent=2))
     
     elif args.action == 'planning-template':
@@ -293,6 +294,8 @@ def main():
         
         template = scrum.create_retrospective_template(args.sprint_number)
         print(template)
+    
+    scrum.client.print_cache_stats()
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Sprint Forecast
+Вероятностный прогноз завершения спринта NutryFlow методом Монте-Карло
+
+Из истории берется пропускная способность команды - story points, закрытые
+за каждый календарный день (дни без закрытий и выходные входят нулями).
+Каждая симуляция вытягивает дни из этой выборки с возвращением, пока
+накопленные points не покроют оставшийся объем; номер такого дня - срок
+завершения в этой симуляции. Все симуляции считаются одной матрицей NumPy
+(симуляции x дни) блоками по четыре недели: следующий блок нужен только тем
+симуляциям, что еще не закончились, поэтому 100 000 прогонов занимают
+десятки миллисекунд.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+DEFAULT_SIMULATIONS = 100_000
+DEFAULT_HISTORY_DAYS = 84
+DEFAULT_MAX_DAYS = 365
+# Дней в блоке симуляции: матрица 100 000 x 28 int32 занимает ~11 МБ
+SIMULATION_BLOCK_DAYS = 28
+FORECAST_PERCENTILES = (50, 85, 95)
+
+
+class Forecast(NamedTuple):
+    today: date
+    deadline: date
+    remaining: float
+    simulations: int
+    history_days: int
+    mean_throughput: float
+    # Процентиль -> дней до завершения (None - не успевает за max_days)
+    percentiles: Dict[int, Optional[int]]
+    on_time_probability: float
+
+    def completion_date(self, percentile: int) -> Optional[date]:
+        days = self.percentiles[percentile]
+        return self.today + timedelta(days=days) if days is not None else None
+
+
+def daily_throughput(closed: Iterable[Tuple[datetime, int]], start: date, end: date,
+                     timezone: str = 'UTC') -> np.ndarray:
+    """Points, закрытые в каждый день с `start` по `end` включительно (в часовом поясе команды)"""
+    days = (end - start).days + 1
+    if days <= 0:
+        return np.zeros(0, dtype=np.int64)
+
+    zone = ZoneInfo(timezone)
+    offsets, points = [], []
+    for closed_at, issue_points in closed:
+        offset = (closed_at.astimezone(zone).date() - start).days
+        if 0 <= offset < days:
+            offsets.append(offset)
+            points.append(issue_points)
+
+    return np.bincount(np.asarray(offsets, dtype=np.int64), weights=np.asarray(points, dtype=np.float64),
+                       minlength=days).astype(np.int64)
+
+
+def simulate_completion_days(remaining: float, throughput: np.ndarray, simulations: int = DEFAULT_SIMULATIONS,
+                             max_days: int = DEFAULT_MAX_DAYS, seed: Optional[int] = None) -> np.ndarray:
+    """Дней до завершения в каждой симуляции (`inf`, если объем не закрыт за `max_days`)"""
+    days = np.full(simulations, np.inf)
+    if remaining <= 0:
+        days[:] = 0
+        return days
+    if throughput.size == 0 or not throughput.any():
+        return days
+
+    rng = np.random.default_rng(seed)
+    throughput = throughput.astype(np.int32)
+    done = np.zeros(simulations, dtype=np.int32)
+    active = np.arange(simulations)
+    elapsed = 0
+
+    while active.size and elapsed < max_days:
+        width = min(SIMULATION_BLOCK_DAYS, max_days - elapsed)
+        burned = done[active, None] + np.cumsum(rng.choice(throughput, size=(active.size, width)), axis=1)
+        finished = burned >= remaining
+        any_finished = finished.any(axis=1)
+
+        days[active[any_finished]] = elapsed + finished[any_finished].argmax(axis=1) + 1
+        done[active] = burned[:, -1]
+        active = active[~any_finished]
+        elapsed += width
+
+    return days
+
+
+def forecast_completion(remaining: float, throughput: np.ndarray, today: date, deadline: date,
+                        simulations: int = DEFAULT_SIMULATIONS, max_days: int = DEFAULT_MAX_DAYS,
+                        seed: Optional[int] = None) -> Forecast:
+    """Процентили срока завершения (день 1 - завтра) и вероятность закончить к `deadline`"""
+    days = simulate_completion_days(remaining, throughput, simulations, max_days, seed)
+    quantiles = np.quantile(days, [p / 100 for p in FORECAST_PERCENTILES], method='higher')
+
+    return Forecast(
+        today=today,
+        deadline=deadline,
+        remaining=remaining,
+        simulations=simulations,
+        history_days=int(throughput.size),
+        mean_throughput=float(throughput.mean()) if throughput.size else 0.0,
+        percentiles={
+            percentile: int(value) if np.isfinite(value) else None
+            for percentile, value in zip(FORECAST_PERCENTILES, quantiles)
+        },
+        on_time_probability=float(np.mean(days <= (deadline - today).days)),
+    )
+
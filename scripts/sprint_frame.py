@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Sprint Frame
+Колоночный движок метрик спринта NutryFlow на pandas
+
+Записи задач собираются в один DataFrame с типизированными колонками
+(метки, нужные метрикам, уже разложены в флаги is_bug/is_blocker, эпик и
+приоритет). Метрики считаются векторно; параметр `by` группирует их по любой колонке, поэтому тот же API
+работает и для одного спринта, и для истории за годы.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from issue_records import IssueRecord
+
+Metric = Union[float, pd.Series]
+
+
+def sprint_sort_key(name: str) -> Tuple:
+    """Естественный порядок спринтов: sprint-2 раньше sprint-10"""
+    return tuple(int(part) if part.isdigit() else part for part in re.split(r'(\d+)', name))
+
+
+def partition_by_label(records: List[IssueRecord], prefix: str = 'sprint-',
+                       exclude: Tuple[str, ...] = ('sprint-active',)) -> Tuple[List[IssueRecord], List[str]]:
+    """Разложить задачи по спринтам по меткам вида `sprint-12`
+
+    Задача, перенесенная между спринтами, несет несколько меток и попадает в
+    каждый из них. Возвращает записи и имена спринтов для `SprintFrame`.
+    """
+    partitioned, sprints = [], []
+    for record in records:
+        for label in record.labels:
+            if label.startswith(prefix) and label not in exclude:
+                partitioned.append(record)
+                sprints.append(label)
+    return partitioned, sprints
+
+
+class SprintFrame:
+    def __init__(self, records: List[IssueRecord], groups: Optional[List[str]] = None, group_column: str = 'sprint'):
+        """`groups` - имя группы (спринт, репозиторий) для каждой записи, колонка `group_column`"""
+        self.issues = pd.DataFrame({
+            'number': pd.Series([record.number for record in records], dtype='int64'),
+            'title': pd.Series([record.title for record in records], dtype='object'),
+            'state': pd.Series([record.state for record in records], dtype='category'),
+            'points': pd.Series([record.points for record in records], dtype='int64'),
+            'created_at': pd.to_datetime([record.created_at for record in records], utc=True),
+            'closed_at': pd.to_datetime([record.closed_at for record in records], utc=True),
+            'priority': pd.Series([record.priority for record in records], dtype='category'),
+            'epic': pd.Series([record.epic for record in records], dtype='category'),
+            'is_bug': pd.Series([record.is_bug for record in records], dtype='bool'),
+            'is_blocker': pd.Series([record.is_blocker for record in records], dtype='bool'),
+        })
+        self.issues['is_closed'] = self.issues['state'] == 'closed'
+        if groups is not None:
+            order = sorted(set(groups), key=sprint_sort_key)
+            self.issues[group_column] = pd.Categorical(groups, categories=order, ordered=True)
+
+    def __len__(self) -> int:
+        return len(self.issues)
+
+    def _sum(self, values: pd.Series, by: Optional[str]) -> Metric:
+        return values.groupby(self.issues[by], observed=True).sum() if by else values.sum()
+
+    def velocity(self, by: Optional[str] = None) -> Metric:
+        """Story points закрытых задач"""
+        return self._sum(self.issues['points'].where(self.issues['is_closed'], 0), by)
+
+    def total_points(self, by: Optional[str] = None) -> Metric:
+        return self._sum(self.issues['points'], by)
+
+    def goal_achievement(self, by: Optional[str] = None) -> Metric:
+        """Доля закрытых story points, %"""
+        total = self.total_points(by)
+        if by:
+            return (self.velocity(by) / total.where(total > 0) * 100).fillna(0)
+        return float(self.velocity() / total * 100) if total > 0 else 0
+
+    def defect_rate(self, by: Optional[str] = None) -> Metric:
+        """Доля задач с меткой bug, %"""
+        if by:
+            return self.issues['is_bug'].groupby(self.issues[by], observed=True).mean() * 100
+        return float(self.issues['is_bug'].mean() * 100) if len(self) else 0
+
+    def cycle_time(self, by: Optional[str] = None) -> Metric:
+        """Среднее время от создания до закрытия, дней (с точностью до секунды)"""
+        closed = self.issues[self.issues['is_closed'] & self.issues['closed_at'].notna()]
+        days = (closed['closed_at'] - closed['created_at']).dt.total_seconds() / 86400
+        if by:
+            return days.groupby(closed[by], observed=True).mean()
+        return float(days.mean()) if len(days) else 0
+
+    def _distribution(self, column: str) -> Dict[str, int]:
+        """Число задач по значениям колонки в порядке первого появления"""
+        counts = self.issues.groupby(column, sort=False, observed=True).size()
+        return {str(key): int(count) for key, count in counts.items()}
+
+    def status_distribution(self) -> Dict[str, int]:
+        return self._distribution('state')
+
+    def priority_distribution(self) -> Dict[str, int]:
+        return self._distribution('priority')
+
+    def epic_distribution(self) -> Dict[str, int]:
+        return self._distribution('epic')
+
+    def points_by_status(self) -> Dict[str, int]:
+        points = self.issues.groupby('state', sort=False, observed=True)['points'].sum()
+        return {str(key): int(value) for key, value in points.items()}
+
+    def distribution_table(self, column: str, by: str = 'sprint') -> pd.DataFrame:
+        """Число задач по значениям колонки для каждой группы (строки — группы)"""
+        table = pd.crosstab(self.issues[by], self.issues[column])
+        return table.loc[:, (table != 0).any()]
+
+    def blockers(self) -> pd.DataFrame:
+        return self.issues.loc[self.issues['is_blocker'], ['number', 'title']]
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Sprint History
+История метрик по спринтам NutryFlow в локальном SQLite
+
+Каждый запуск генератора метрик сохраняет компактный снимок метрик текущего
+спринта (последний снимок спринта перезаписывает предыдущий). Спринты
+называются так же, как их метки, - `sprint-N`: и ежедневный снимок текущего
+спринта, и сравнение всех спринтов пишут в одну строку на спринт. Тренды и
+скользящие средние считаются по одной строке на спринт, без повторной
+загрузки прошлых спринтов из GitHub. Распределения cycle time и lead time
+хранятся t-digest'ами по спринтам и сливаются в кварталы и годы.
+"""
+
+import re
+import sqlite3
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from quantile_sketch import FLOW_METRICS, TDigest, format_hours
+
+DEFAULT_HISTORY_PATH = Path('.sprint-history/history.sqlite3')
+ROLLING_WINDOW = 3
+# Версия 2: все спринты называются `sprint-N` (раньше текущий спринт - ISO-неделей)
+SCHEMA_VERSION = 2
+SPRINT_NAME = re.compile(r'(?:sprint-)?(\d+)')
+
+METRICS = (
+    'velocity', 'total_points', 'goal_achievement', 'defect_rate',
+    'cycle_time', 'issues', 'completed_issues',
+)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS sprint_metrics (
+    repo TEXT NOT NULL,
+    sprint TEXT NOT NULL,
+    first_recorded_at TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    {', '.join(f'{metric} REAL NOT NULL' for metric in METRICS)},
+    PRIMARY KEY (repo, sprint)
+);
+CREATE TABLE IF NOT EXISTS sprint_sketches (
+    repo TEXT NOT NULL,
+    sprint TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    ended_at TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    sketch TEXT NOT NULL,
+    PRIMARY KEY (repo, sprint, metric)
+);
+"""
+
+PERIODS = ('quarter', 'year')
+
+
+def period_key(timestamp: str, period: str) -> str:
+    """Квартал (`2024-Q1`) или год (`2024`) для даты ISO 8601"""
+    if period == 'year':
+        return timestamp[:4]
+    return f"{timestamp[:4]}-Q{(int(timestamp[5:7]) - 1) // 3 + 1}"
+
+
+def sprint_name(value: str) -> str:
+    """Имя спринта в истории - `sprint-N`; принимает `N` или `sprint-N` (тип аргумента --sprint)"""
+    match = SPRINT_NAME.fullmatch(value.strip())
+    if not match:
+        raise ValueError(f"sprint must be a number or sprint-N, got {value!r}")
+    return f"sprint-{int(match.group(1))}"
+
+
+def sprint_name_from_label(label: str, prefix: str = 'sprint-') -> Optional[str]:
+    """Имя спринта по метке `<prefix>N` или None, если номера в метке нет"""
+    number = label[len(prefix):] if label.startswith(prefix) else ''
+    return f"sprint-{int(number)}" if number.isdigit() else None
+
+
+def sprint_name_from_labels(labels: Iterable[Iterable[str]], prefix: str = 'sprint-') -> Optional[str]:
+    """Имя текущего спринта по меткам его задач: самая частая метка `sprint-N`
+
+    Задачи, перенесенные из прошлых спринтов, несут и старые метки, поэтому
+    берется метка большинства задач, а при равенстве - спринт с большим номером.
+    """
+    counts: Counter = Counter()
+    for issue_labels in labels:
+        for label in issue_labels:
+            name = sprint_name_from_label(label, prefix)
+            if name:
+                counts[name] += 1
+    if not counts:
+        return None
+    return max(counts, key=lambda name: (counts[name], int(name[len('sprint-'):])))
+
+
+class SprintHistory:
+    def __init__(self, db_path: Path = DEFAULT_HISTORY_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Удалить снимки, названные не по схеме `sprint-N` (ISO-недели версии 1)
+
+        Такие строки - промежуточные снимки середины спринта; в трендах они
+        считались отдельными спринтами и занижали среднюю velocity.
+        """
+        version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        with self.connection:
+            for table in ('sprint_metrics', 'sprint_sketches'):
+                legacy = [
+                    (row['sprint'],) for row in self.connection.execute(f'SELECT DISTINCT sprint FROM {table}')
+                    if not re.fullmatch(r'sprint-\d+', row['sprint'])
+                ]
+                self.connection.executemany(f'DELETE FROM {table} WHERE sprint = ?', legacy)
+            self.connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def record(self, repo: str, sprint: str, metrics: Dict[str, float]):
+        """Сохранить снимок метрик спринта"""
+        now = datetime.now().isoformat(timespec='seconds')
+        values = [float(metrics.get(metric, 0)) for metric in METRICS]
+        with self.connection:
+            self.connection.execute(
+                f"""INSERT INTO sprint_metrics (repo, sprint, first_recorded_at, recorded_at, {', '.join(METRICS)})
+                    VALUES (?, ?, ?, ?, {', '.join('?' for _ in METRICS)})
+                    ON CONFLICT (repo, sprint) DO UPDATE SET
+                    recorded_at = excluded.recorded_at,
+                    {', '.join(f'{metric} = excluded.{metric}' for metric in METRICS)}""",
+                (repo, sprint, now, now, *values),
+            )
+
+    def record_sketches(self, repo: str, sprint: str, sketches: Dict[str, TDigest],
+                        ended_at: Optional[datetime] = None):
+        """Сохранить дайджесты cycle/lead time спринта; `ended_at` относит спринт к кварталу"""
+        now = datetime.now().isoformat(timespec='seconds')
+        ended = ended_at.isoformat(timespec='seconds') if ended_at else now
+        with self.connection:
+            self.connection.executemany(
+                """INSERT OR REPLACE INTO sprint_sketches (repo, sprint, metric, ended_at, recorded_at, sketch)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                [(repo, sprint, metric, ended, now, sketch.to_json()) for metric, sketch in sketches.items()],
+            )
+
+    def merged_sketches(self, repo: str, metric: str, period: str = 'quarter') -> Dict[str, TDigest]:
+        """Дайджесты метрики, слитые по кварталам или годам (в памяти - по дайджесту на период)"""
+        merged: Dict[str, TDigest] = {}
+        for row in self.connection.execute(
+            'SELECT ended_at, sketch FROM sprint_sketches WHERE repo = ? AND metric = ? ORDER BY ended_at',
+            (repo, metric),
+        ):
+            sketch = TDigest.from_json(row['sketch'])
+            key = period_key(row['ended_at'], period)
+            if key in merged:
+                merged[key].merge(sketch)
+            else:
+                merged[key] = sketch
+        return merged
+
+    def distribution_report(self, repo: str, periods: Tuple[str, ...] = PERIODS) -> str:
+        """Раздел отчета с P50/P85/P95 cycle time и lead time по кварталам и годам"""
+        views = {metric: {} for metric in FLOW_METRICS}
+        for period in periods:
+            for metric in FLOW_METRICS:
+                views[metric].update(self.merged_sketches(repo, metric, period))
+        if not views['cycle_time']:
+            return "- Not enough sprint history yet: distributions appear after the first recorded sprint\n"
+
+        lines = ["| Period | Issues | Cycle P50 | Cycle P85 | Cycle P95 | Lead P50 | Lead P85 | Lead P95 |\n",
+                 "|--------|--------|-----------|-----------|-----------|----------|----------|----------|\n"]
+        for key, cycle in views['cycle_time'].items():
+            lead = views['lead_time'].get(key, TDigest())
+            values = [*cycle.percentiles().values(), *lead.percentiles().values()]
+            lines.append(f"| {key} | {len(cycle)} | " + " | ".join(format_hours(value) for value in values) + " |\n")
+        lines.append("\n")
+
+        return ''.join(lines)
+
+    def sprints(self, repo: str, limit: Optional[int] = None) -> List[Dict]:
+        """Последние снимки спринтов в порядке номеров (sprint-2 раньше sprint-10)"""
+        rows = self.connection.execute(
+            """SELECT * FROM sprint_metrics WHERE repo = ?
+               ORDER BY CAST(substr(sprint, length('sprint-') + 1) AS INTEGER) DESC LIMIT ?""",
+            (repo, limit if limit else -1),
+        ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def rolling(self, repo: str, metric: str, window: int = ROLLING_WINDOW,
+                exclude: Optional[str] = None) -> Optional[float]:
+        """Скользящее среднее метрики по последним `window` спринтам"""
+        values = [
+            sprint[metric] for sprint in self.sprints(repo, window + (1 if exclude else 0))
+            if sprint['sprint'] != exclude
+        ][-window:]
+        return sum(values) / len(values) if values else None
+
+    def trend_report(self, repo: str, current: str, window: int = ROLLING_WINDOW) -> str:
+        """Раздел отчета с трендами velocity, defect rate и cycle time"""
+        sprints = self.sprints(repo, 10)
+        if len(sprints) < 2:
+            return "- Not enough sprint history yet: trends appear after the second recorded sprint\n"
+
+        lines = []
+        for metric, title, unit, higher_is_better in (
+            ('velocity', 'Velocity', ' points', True),
+            ('defect_rate', 'Defect rate', '%', False),
+            ('cycle_time', 'Cycle time', ' days', False),
+        ):
+            latest = sprints[-1][metric]
+            average = self.rolling(repo, metric, window, exclude=current)
+            if average is None:
+                continue
+            delta = latest - average
+            improving = (delta > 0) == higher_is_better
+            arrow = '➡️' if abs(delta) < 1e-9 else ('📈' if improving else '📉')
+            lines.append(f"- {arrow} **{title}**: {latest:.1f}{unit} "
+                         f"(rolling {window}-sprint average {average:.1f}{unit}, {delta:+.1f})\n")
+
+        lines.append("\n| Sprint | Velocity | Goal | Defect Rate | Cycle Time |\n")
+        lines.append("|--------|----------|------|-------------|------------|\n")
+        for sprint in sprints:
+            lines.append(f"| {sprint['sprint']} | {sprint['velocity']:.0f} | {sprint['goal_achievement']:.0f}% | "
+                         f"{sprint['defect_rate']:.1f}% | {sprint['cycle_time']:.1f} |\n")
+        lines.append("\n")
+
+        return ''.join(lines)
+
+    def close(self):
+        self.connection.close()
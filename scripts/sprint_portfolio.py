@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Sprint Portfolio
+Метрики спринта по нескольким репозиториям NutryFlow (приложение, бэкенд Supabase,
+пакеты дизайн-системы) в одном отчете
+
+Репозитории загружаются одновременно: asyncio запускает загрузку каждого
+репозитория в отдельном потоке, все клиенты делят одну сессию с пулом
+keep-alive соединений к хосту API и общий семафор, ограничивающий число
+одновременных запросов. Поэтому время запуска близко ко времени самого
+медленного репозитория, а не к сумме. Метрики считаются одним проходом
+SprintFrame с группировкой по репозиторию.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from github_client import BACKENDS, DEFAULT_CACHE_DIR, DEFAULT_TIMEOUT, GITHUB_API_URL, GitHubClient
+from issue_records import IssueRecord, extract_story_points, normalize_issues
+from issue_store import DEFAULT_STORE_PATH, IssueStore
+from sprint_frame import SprintFrame
+
+DEFAULT_CONCURRENCY = 16
+
+
+class SprintPortfolio:
+    def __init__(self, github_token: str, repos: List[str], timeout: float = DEFAULT_TIMEOUT,
+                 use_cache: bool = True, store_path: Optional[Path] = DEFAULT_STORE_PATH, backend: str = 'rest',
+                 api_url: Optional[str] = None, concurrency: int = DEFAULT_CONCURRENCY,
+                 sprint_label: str = 'sprint-active'):
+        self.repos = repos
+        self.sprint_label = sprint_label
+        self.concurrency = concurrency
+        self.store = IssueStore(store_path) if store_path else None
+        self.fetch_times: Dict[str, float] = {}
+
+        session = GitHubClient.create_session(github_token, concurrency)
+        request_limit = threading.BoundedSemaphore(concurrency)
+        self.clients = {
+            repo: GitHubClient(github_token, repo, timeout=timeout,
+                               cache_dir=DEFAULT_CACHE_DIR if use_cache else None, backend=backend,
+                               api_url=api_url, session=session, request_limit=request_limit)
+            for repo in repos
+        }
+
+    async def fetch_repo(self, repo: str) -> List[IssueRecord]:
+        """Загрузить задачи спринта одного репозитория (HTTP - в потоке, SQLite - в цикле событий)"""
+        client = self.clients[repo]
+        needs_body = lambda issue: extract_story_points(issue) == 0
+        started = time.perf_counter()
+
+        if not self.store:
+            issues = await asyncio.to_thread(client.get_issues, self.sprint_label, needs_body=needs_body)
+        else:
+            since = self.store.watermark(repo)
+            updated = await asyncio.to_thread(client.get_issues, since=since, needs_body=needs_body)
+            self.store.upsert(repo, updated, extract_story_points)
+            issues = self.store.get_issues(repo, self.sprint_label)
+
+        self.fetch_times[repo] = time.perf_counter() - started
+        print(f"📥 {repo}: {len(issues)} sprint issues in {self.fetch_times[repo]:.2f}s", file=sys.stderr)
+        return normalize_issues(issues)
+
+    async def fetch_all(self) -> Dict[str, List[IssueRecord]]:
+        results = await asyncio.gather(*(self.fetch_repo(repo) for repo in self.repos))
+        return dict(zip(self.repos, results))
+
+    def build_frame(self, records_by_repo: Dict[str, List[IssueRecord]]) -> SprintFrame:
+        records, repos = [], []
+        for repo, records_of_repo in records_by_repo.items():
+            records.extend(records_of_repo)
+            repos.extend([repo] * len(records_of_repo))
+        return SprintFrame(records, repos, group_column='repo')
+
+    @staticmethod
+    def calculate_metrics(frame: SprintFrame) -> Tuple[pd.DataFrame, Dict[str, float]]:
+        """Метрики SprintMetricsGenerator по каждому репозиторию и по портфелю в целом"""
+        by_repo = pd.DataFrame({
+            'velocity': frame.velocity(by='repo'),
+            'total_points': frame.total_points(by='repo'),
+            'goal_achievement': frame.goal_achievement(by='repo'),
+            'defect_rate': frame.defect_rate(by='repo'),
+            'cycle_time': frame.cycle_time(by='repo'),
+            'issues': frame.issues.groupby('repo', observed=True).size(),
+            'completed_issues': frame.issues['is_closed'].groupby(frame.issues['repo'], observed=True).sum(),
+        }).fillna(0)
+
+        total = {
+            'velocity': frame.velocity(),
+            'total_points': frame.total_points(),
+            'goal_achievement': frame.goal_achievement(),
+            'defect_rate': frame.defect_rate(),
+            'cycle_time': frame.cycle_time(),
+            'issues': len(frame),
+            'completed_issues': int(frame.issues['is_closed'].sum()),
+        }
+        return by_repo, total
+
+    def generate_portfolio_report(self) -> str:
+        """Генерировать сводный отчет по портфелю"""
+        started = time.perf_counter()
+        records_by_repo = asyncio.run(self.fetch_all())
+        wall_time = time.perf_counter() - started
+
+        frame = self.build_frame(records_by_repo)
+        by_repo, total = self.calculate_metrics(frame)
+
+        print(f"Portfolio fetch: {wall_time:.2f}s wall, slowest repo {max(self.fetch_times.values(), default=0):.2f}s, "
+              f"sum {sum(self.fetch_times.values()):.2f}s", file=sys.stderr)
+
+        report = f"""# Sprint Portfolio Report - {datetime.now().strftime('%Y-%m-%d')}
+
+## 📊 Portfolio Summary
+- **Repositories**: {len(self.repos)}
+- **Team Velocity**: {total['velocity']:.0f} story points
+- **Sprint Goal Achievement**: {total['goal_achievement']:.1f}%
+- **Average Cycle Time**: {total['cycle_time']:.1f} days
+- **Defect Rate**: {total['defect_rate']:.1f}%
+- **Total Issues**: {total['issues']}
+- **Completed Issues**: {total['completed_issues']}
+
+## 📦 Repositories
+
+| Repository | Velocity | Total Points | Goal | Defect Rate | Cycle Time | Issues | Completed |
+|------------|----------|--------------|------|-------------|------------|--------|-----------|
+"""
+
+        for repo in self.repos:
+            if repo not in by_repo.index:
+                report += f"| {repo} | 0 | 0 | 0.0% | 0.0% | 0.0 days | 0 | 0 |\n"
+                continue
+            row = by_repo.loc[repo]
+            report += (f"| {repo} | {row['velocity']:.0f} | {row['total_points']:.0f} | "
+                       f"{row['goal_achievement']:.1f}% | {row['defect_rate']:.1f}% | {row['cycle_time']:.1f} days | "
+                       f"{row['issues']:.0f} | {row['completed_issues']:.0f} |\n")
+
+        if len(frame):
+            status_table = frame.distribution_table('state', by='repo')
+            columns = [str(column) for column in status_table.columns]
+            report += "\n### Status Distribution\n\n"
+            report += "| Repository | " + " | ".join(column.title() for column in columns) + " |\n"
+            report += "|------------|" + "|".join("-" * (len(column) + 2) for column in columns) + "|\n"
+            for repo, counts in status_table.iterrows():
+                report += f"| {repo} | " + " | ".join(str(int(count)) for count in counts) + " |\n"
+
+        blockers = frame.issues.loc[frame.issues['is_blocker'], ['repo', 'number', 'title']]
+        if not blockers.empty:
+            report += "\n## 🚧 Blockers\n"
+            for blocker in blockers.itertuples():
+                report += f"- {blocker.title} ({blocker.repo}#{blocker.number})\n"
+
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate sprint metrics across several repositories')
+    parser.add_argument('--github-token', required=True, help='GitHub token')
+    parser.add_argument('--repos', required=True, nargs='+', help='Repository names (owner/repo)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Maximum concurrent GitHub API requests across all repositories')
+    parser.add_argument('--sprint-label', default='sprint-active', help='Label of the sprint to report on')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='GitHub API request timeout in seconds')
+    parser.add_argument('--no-cache', action='store_true', help='Do not use the on-disk GitHub response cache')
+    parser.add_argument('--store', default=str(DEFAULT_STORE_PATH), help='SQLite issue store path')
+    parser.add_argument('--no-store', action='store_true', help='Fetch sprint issues directly instead of syncing the store')
+    parser.add_argument('--backend', choices=BACKENDS, default='rest',
+                        help='GitHub API used to fetch issues (graphql also fetches close/reopen/label history)')
+    parser.add_argument('--api-url', default=os.environ.get('GITHUB_API_URL', GITHUB_API_URL),
+                        help='GitHub API base URL (GitHub Enterprise or a local github_fixture_server.py)')
+    parser.add_argument('--output', default='sprint_portfolio_report.md', help='Output file path')
+
+    args = parser.parse_args()
+
+    portfolio = SprintPortfolio(args.github_token, args.repos, timeout=args.timeout,
+                                use_cache=not args.no_cache,
+                                store_path=None if args.no_store else args.store,
+                                backend=args.backend, api_url=args.api_url,
+                                concurrency=args.concurrency, sprint_label=args.sprint_label)
+    report = portfolio.generate_portfolio_report()
+    for client in portfolio.clients.values():
+        client.print_cache_stats()
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(report)
+
+    print(f"Portfolio report generated: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
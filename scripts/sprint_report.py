@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Sprint Report
+Все ежедневные артефакты спринта NutryFlow за один запуск
+
+Задачи спринта загружаются и нормализуются один раз, после чего из общего
+набора записей строятся ежедневный отчет (как `scrum_automation.py --action
+daily-report`), отчет по метрикам с графиком (`generate_sprint_metrics.py`) и
+burndown chart с отчетом (`generate_burndown_chart.py`). Запланированный
+workflow делает один проход по API и один старт интерпретатора вместо трех.
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+from charts import ChartRenderer, add_chart_arguments, renderer_from_args
+from generate_burndown_chart import BurndownChartGenerator
+from generate_sprint_metrics import SprintMetricsGenerator
+from github_client import BACKENDS, DEFAULT_TIMEOUT, GITHUB_API_URL
+from issue_store import DEFAULT_STORE_PATH
+from scrum_automation import ScrumAutomation
+from sprint_history import DEFAULT_HISTORY_PATH, sprint_name
+
+
+class SprintReport:
+    def __init__(self, github_token: str, repo: str, timeout: float = DEFAULT_TIMEOUT, use_cache: bool = True,
+                 store_path: Optional[Path] = DEFAULT_STORE_PATH, backend: str = 'rest', api_url: Optional[str] = None,
+                 history_path: Optional[Path] = DEFAULT_HISTORY_PATH, sprint_name: Optional[str] = None,
+                 timezone: str = 'UTC', sprint_end: Optional[date] = None, sprint_label: str = 'sprint-active',
+                 charts: Optional[ChartRenderer] = None, simulations: int = 100_000,
+                 forecast_history_days: int = 84, seed: Optional[int] = None):
+        self.sprint_label = sprint_label
+        # Графики обоих генераторов копятся и строятся вместе в пуле процессов
+        self.charts = charts or ChartRenderer(batch=True)
+        # Загружает задачи только генератор метрик; остальным данные передаются готовыми
+        self.metrics = SprintMetricsGenerator(github_token, repo, timeout=timeout, use_cache=use_cache,
+                                              store_path=store_path, backend=backend, api_url=api_url,
+                                              history_path=history_path, sprint_name=sprint_name,
+                                              charts=self.charts)
+        self.scrum = ScrumAutomation(github_token, repo, timeout=timeout, use_cache=False, store_path=None,
+                                     api_url=api_url, history_path=None)
+        self.burndown = BurndownChartGenerator(github_token, repo, timeout=timeout, use_cache=False,
+                                               store_path=None, api_url=api_url, timezone=timezone,
+                                               sprint_end=sprint_end, sprint_label=sprint_label,
+                                               charts=self.charts, simulations=simulations,
+                                               forecast_history_days=forecast_history_days, seed=seed)
+        # Прогноз burndown берет историю пропускной способности из уже синхронизированного хранилища
+        self.burndown.store = self.metrics.store
+
+    def run(self, sprint_duration: int = 14, render: bool = True, webhook_url: Optional[str] = None,
+            daily_output: str = 'daily_scrum_report.md',
+            metrics_output: str = 'sprint_metrics_report.md') -> bool:
+        """Построить все артефакты; False, если задач спринта нет"""
+        sprint_data = self.metrics.get_sprint_issues(self.sprint_label)
+        self.metrics.client.print_cache_stats()
+
+        if not sprint_data:
+            print(f"No sprint data found. Please ensure issues are labeled with '{self.sprint_label}'")
+            return False
+
+        daily_report = self.scrum.generate_daily_report(sprint_data)
+        with open(daily_output, 'w', encoding='utf-8') as f:
+            f.write(daily_report)
+        print(daily_report)
+        print(f"Daily report saved: {daily_output}")
+
+        if webhook_url and webhook_url.strip():
+            self.scrum.send_notification(webhook_url, daily_report)
+        else:
+            print("No webhook URL provided. Skipping notification.")
+
+        metrics_report = self.metrics.generate_metrics_report(render=render, sprint_data=sprint_data)
+        with open(metrics_output, 'w', encoding='utf-8') as f:
+            f.write(metrics_report)
+        print(f"Metrics report generated: {metrics_output}")
+
+        self.burndown.create_burndown_chart(sprint_data, sprint_duration, render=render)
+        self.charts.render()
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the daily report, sprint metrics and burndown in one run')
+    parser.add_argument('--github-token', required=True, help='GitHub token')
+    parser.add_argument('--repo', required=True, help='Repository name (owner/repo)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='GitHub API request timeout in seconds')
+    parser.add_argument('--no-cache', action='store_true', help='Do not use the on-disk GitHub response cache')
+    parser.add_argument('--store', default=str(DEFAULT_STORE_PATH), help='SQLite issue store path')
+    parser.add_argument('--no-store', action='store_true', help='Fetch sprint issues directly instead of syncing the store')
+    parser.add_argument('--backend', choices=BACKENDS, default='rest',
+                        help='GitHub API used to fetch issues (graphql also fetches close/reopen/label history)')
+    parser.add_argument('--api-url', default=os.environ.get('GITHUB_API_URL', GITHUB_API_URL),
+                        help='GitHub API base URL (GitHub Enterprise or a local github_fixture_server.py)')
+    parser.add_argument('--webhook-url', help='Webhook URL for the daily report notification')
+    parser.add_argument('--sprint', type=sprint_name,
+                        help='Sprint number for the history snapshot, e.g. 12 or sprint-12 '
+                             '(default: the sprint-N label of the sprint issues)')
+    parser.add_argument('--history', default=str(DEFAULT_HISTORY_PATH), help='Sprint history database path')
+    parser.add_argument('--no-history', action='store_true', help='Do not record or report sprint trends')
+    parser.add_argument('--sprint-duration', type=int, default=14, help='Sprint duration in days')
+    parser.add_argument('--sprint-end', type=date.fromisoformat, help='Last sprint day, YYYY-MM-DD (default: today)')
+    parser.add_argument('--timezone', default='UTC', help='Team time zone for day boundaries, e.g. Europe/Moscow')
+    parser.add_argument('--no-charts', action='store_true', help='Write the text reports only (matplotlib is not loaded)')
+    parser.add_argument('--simulations', type=int, default=100_000,
+                        help='Monte Carlo simulations for the completion forecast')
+    parser.add_argument('--forecast-history', type=int, default=84,
+                        help='Days of closed-issue throughput history used by the forecast')
+    parser.add_argument('--seed', type=int, help='Random seed for a reproducible forecast')
+    add_chart_arguments(parser)
+    parser.add_argument('--daily-output', default='daily_scrum_report.md', help='Daily report output path')
+    parser.add_argument('--metrics-output', default='sprint_metrics_report.md', help='Metrics report output path')
+
+    args = parser.parse_args()
+
+    report = SprintReport(args.github_token, args.repo, timeout=args.timeout,
+                          use_cache=not args.no_cache,
+                          store_path=None if args.no_store else args.store,
+                          backend=args.backend, api_url=args.api_url,
+                          history_path=None if args.no_history else args.history,
+                          sprint_name=args.sprint, timezone=args.timezone, sprint_end=args.sprint_end,
+                          charts=renderer_from_args(args, batch=True), simulations=args.simulations,
+                          forecast_history_days=args.forecast_history, seed=args.seed)
+
+    if not report.run(args.sprint_duration, render=not args.no_charts, webhook_url=args.webhook_url,
+                      daily_output=args.daily_output, metrics_output=args.metrics_output):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()